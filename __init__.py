@@ -2,6 +2,8 @@
 Rule Engine Library - Simple wrapper around the main codebase
 """
 
+from pathlib import Path
+
 # Import everything from the main integrated file
 from .rule_engine_integrated import PLBRuleEngine
 
@@ -20,6 +22,21 @@ class RuleEngine:
         """
         self.rules_dir = rules_dir
         self.engine = PLBRuleEngine()
+        # Summary and its printed form, reused until a rule file changes
+        self._summary_signature = None
+        self._summary_cache = None
+        self._summary_text_cache = None
+    
+    def _rules_signature(self):
+        """Stat-only fingerprint of the rule files; changes when any file is added, removed or edited"""
+        rules_path = Path(self.rules_dir)
+        if not rules_path.exists():
+            return ()
+        signature = []
+        for path in rules_path.glob("**/*.json"):
+            stat = path.stat()
+            signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(signature))
     
     def process_csv(self, input_csv_path: str, output_file: str = None, output_format: str = "json"):
         """
@@ -34,29 +51,37 @@ class RuleEngine:
     
     def get_contract_summary(self):
         """Get rule summary (contracts are loaded from rules directory)"""
+        signature = self._rules_signature()
+        if self._summary_cache is not None and signature == self._summary_signature:
+            return self._summary_cache
+        
         rules = self.engine.get_available_rules()
         
-        return {
+        self._summary_signature = signature
+        self._summary_cache = {
             'total_rules': len(rules),
             'rules': rules
         }
+        self._summary_text_cache = None
+        return self._summary_cache
     
     def print_rule_summary(self):
         """Print rule summary"""
         summary = self.get_contract_summary()
-        print("\n" + "="*60)
-        print("RULE ENGINE SUMMARY")
-        print("="*60)
-        print(f"Total Rules: {summary.get('total_rules', 0)}")
-        
-        if 'rules' in summary and summary['rules']:
-            print("\nAvailable Rules:")
-            for rule in summary['rules']:
-                print(f"  - {rule.get('source_name', 'Unknown')}: {rule.get('rule_count', 0)} rules")
-                print(f"    File: {rule.get('file_name', 'Unknown')}")
-                print(f"    Airline: {rule.get('airline', 'Unknown')}")
-                print(f"    Period: {rule.get('year', 'Unknown')}-{rule.get('month', 'Unknown')}")
-        print("="*60)
+        if self._summary_text_cache is None:
+            lines = ["\n" + "="*60, "RULE ENGINE SUMMARY", "="*60]
+            lines.append(f"Total Rules: {summary.get('total_rules', 0)}")
+            
+            if 'rules' in summary and summary['rules']:
+                lines.append("\nAvailable Rules:")
+                for rule in summary['rules']:
+                    lines.append(f"  - {rule.get('source_name', 'Unknown')}: {rule.get('rule_count', 0)} rules")
+                    lines.append(f"    File: {rule.get('file_name', 'Unknown')}")
+                    lines.append(f"    Airline: {rule.get('airline', 'Unknown')}")
+                    lines.append(f"    Period: {rule.get('year', 'Unknown')}-{rule.get('month', 'Unknown')}")
+            lines.append("="*60)
+            self._summary_text_cache = "\n".join(lines)
+        print(self._summary_text_cache)
 
 __version__ = "1.7.0"
 __author__ = "Dnyandev Sawarkar"
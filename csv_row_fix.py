@@ -3,26 +3,33 @@ import os
 input_path = r"input/show.csv"
 output_path = r"output/show_fixed.csv"
 
+# 1 MiB I/O buffers; rows are streamed so memory stays at one logical row
+BUFFER_SIZE = 1 << 20
+
 os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-with open(input_path, "r", encoding="utf-8", newline="") as f_in, \
-     open(output_path, "w", encoding="utf-8", newline="") as f_out:
+with open(input_path, "r", encoding="utf-8", newline="", buffering=BUFFER_SIZE) as f_in, \
+     open(output_path, "w", encoding="utf-8", newline="", buffering=BUFFER_SIZE) as f_out:
     
-    fixed_lines = []
+    # Pieces of the current logical row, joined once when the row is complete
+    pending = []
 
     for line in f_in:
         # Strip only the trailing newline for safe concatenation
         stripped = line.rstrip("\n")
 
-        if stripped.startswith('"') and fixed_lines:
+        if stripped.startswith('"') and pending:
             # Attach this line to the previous one
             # (you can add a space in between if needed)
-            fixed_lines[-1] = fixed_lines[-1].rstrip("\n") + stripped + "\n"
+            pending.append(stripped)
         else:
-            # Keep the line as is
-            fixed_lines.append(stripped + "\n")
+            # Previous row is complete; write it and start a new one
+            if pending:
+                f_out.write("".join(pending) + "\n")
+            pending = [stripped]
 
-    # Write all fixed lines
-    f_out.writelines(fixed_lines)
+    # Write the last row
+    if pending:
+        f_out.write("".join(pending) + "\n")
 
-print(f"Fixed file written to: {output_path}")
\ No newline at end of file
+print(f"Fixed file written to: {output_path}")
@@ -3,18 +3,29 @@ import os
 import time
 from rule_engine_integrated import PLBRuleEngine
 
+# Arrow-backed transfer between the JVM and pandas on both driver and executors
+spark.conf.set("spark.sql.execution.arrow.pyspark.enabled", "true")
+
 df = spark.table("megatron.silver.silver_view").limit(2000)
 display(df.limit(5))
 
 from pyspark.sql.functions import lit
+from pyspark.sql.types import StructType, StructField, StringType
 
 df = df.withColumn("batch_id", lit(1))
 display(df.limit(5))
 
+def to_string_frame(result_df, columns):
+    """Align a processed frame to the output columns as nullable strings"""
+    result_df = result_df.reindex(columns=columns)
+    return result_df.astype(object).where(result_df.notna(), None).map(
+        lambda value: None if value is None else str(value)
+    )
+
 def main():
-    output_file = "processed_output.csv"
+    output_path = "processed_output"
 
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     # Initialize Rule Engine
     print("Initializing Rule Engine...")
@@ -27,33 +38,38 @@ def main():
     # Process DataFrame
     print("Processing DataFrame...")
     try:
-        processing_start = time.time()
-        
-        # Convert Spark DataFrame to Pandas DataFrame
-        print("Converting Spark DataFrame to Pandas...")
-        df_pandas = df.toPandas()
-        print(f"Converted {len(df_pandas)} rows.")
+        processing_start = time.perf_counter()
         
-        result_df = engine.process_dataframe(df_pandas) 
-        processing_time = time.time() - processing_start
-        print(f"Processing complete in {processing_time:.2f} seconds.")
-        # Use len() for Pandas DataFrame
-        print(f"Output contains {len(result_df)} rows.")
+        # Derive the output columns from a one-row sample on the driver
+        sample_df = engine.process_dataframe(df.limit(1).toPandas())
+        output_columns = list(sample_df.columns)
+        output_schema = StructType([StructField(column, StringType(), True) for column in output_columns])
+
+        # Run the rule engine inside the executors, one pandas batch at a time. The engine is
+        # built per partition, so the driver's engine and its contracts are never pickled with the function
+        def process_partition(pdf_iter):
+            partition_engine = PLBRuleEngine(contracts_dir="contracts")
+            for pdf in pdf_iter:
+                yield to_string_frame(partition_engine.process_dataframe(pdf), output_columns)
+
+        result_sdf = df.mapInPandas(process_partition, schema=output_schema)
+        processing_time = time.perf_counter() - processing_start
+        print(f"Processing plan built in {processing_time:.2f} seconds.")
     except Exception as e:
         print(f"Error during processing: {e}")
         return
 
     # Save Output
-    print(f"Saving output to {output_file}...")
+    print(f"Saving output to {output_path}...")
     try:
-        # Result is already Pandas DataFrame
-        result_df.to_csv(output_file, index=False)
+        # Spark writes one CSV part file per partition; nothing is collected on the driver
+        result_sdf.write.mode("overwrite").option("header", True).csv(output_path)
         print("Successfully saved output CSV.")
     except Exception as e:
         print(f"Error saving output: {e}")
 
-    total_time = time.time() - start_time
+    total_time = time.perf_counter() - start_time
     print(f"Total execution time: {total_time:.2f} seconds.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,44 +1,108 @@
+import numpy as np
 import pandas as pd
 import sys
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+TARGET_DOCS = [
+    "Emirates EG Apr25-Mar26.pdf",
+    "QR EG Apr-Sep25 PLB.pdf",
+    "Air Cairo EG Jan-Dec25 PLB.pdf"
+]
+
+REQUIRED_COLUMNS = ['Contract_Document_Name', 'Sector_Airline_Eligibility']
+
+ELIGIBLE_VALUES = {True: True, 'True': True, 'true': True, 'TRUE': True}
+
+def _read_arrow_table(input_file):
+    """Read the CSV with Arrow, typed the way pd.read_csv types it.
+
+    pandas leaves timestamp-like text as strings and reads integer columns
+    with blanks as floats. Matching both keeps the filtered file's text the
+    same as the pandas path writes.
+    """
+    with pacsv.open_csv(input_file) as reader:
+        schema = reader.schema
+    text_columns = {field.name: pa.string() for field in schema if pa.types.is_timestamp(field.type)}
+    table = pacsv.read_csv(input_file, convert_options=pacsv.ConvertOptions(column_types=text_columns))
+
+    for index, column in enumerate(table.columns):
+        if pa.types.is_integer(column.type) and column.null_count:
+            table = table.set_column(index, table.field(index).name, pc.cast(column, pa.float64()))
+    return table
+
+def _filter_with_arrow(input_file, output_file, target_docs):
+    table = _read_arrow_table(input_file)
+    print(f"Columns: {table.column_names}")
+
+    # Check if columns exist
+    for column in REQUIRED_COLUMNS:
+        if column not in table.column_names:
+            print(f"Error: '{column}' column not found.")
+            return None
+
+    # Arrow already parses True/true/TRUE as booleans; fall back to a string compare otherwise
+    eligibility = table['Sector_Airline_Eligibility']
+    if not pa.types.is_boolean(eligibility.type):
+        eligibility = pc.equal(pc.utf8_lower(pc.cast(eligibility, pa.string())), 'true')
+
+    mask = pc.and_(
+        pc.is_in(table['Contract_Document_Name'], value_set=pa.array(target_docs)),
+        eligibility
+    )
+    filtered = table.filter(mask)
+
+    # Write through pandas so the file is formatted exactly as the pandas path writes it
+    filtered.to_pandas().to_csv(output_file, index=False)
+    return filtered.num_rows
+
+def _filter_with_pandas(input_file, output_file, target_docs):
+    df = pd.read_csv(input_file)
+    print(f"Columns: {list(df.columns)}")
+
+    # Check if columns exist
+    for column in REQUIRED_COLUMNS:
+        if column not in df.columns:
+            print(f"Error: '{column}' column not found.")
+            return None
+
+    # Filter
+    # Normalize eligibility to boolean with a single hashed lookup per value
+    # Handle "True", "true", "TRUE", etc.; anything else is not eligible
+    if df['Sector_Airline_Eligibility'].dtype == 'object':
+        df['Sector_Airline_Eligibility'] = df['Sector_Airline_Eligibility'].map(ELIGIBLE_VALUES).fillna(False).astype(bool)
+
+    mask = np.logical_and(
+        df['Contract_Document_Name'].isin(target_docs).to_numpy(),
+        df['Sector_Airline_Eligibility'].to_numpy() == True
+    )
+    filtered_df = df[mask]
+
+    filtered_df.to_csv(output_file, index=False)
+    return len(filtered_df)
+
 def filter_csv(input_file, output_file):
     try:
-        df = pd.read_csv(input_file)
-        print(f"Columns: {list(df.columns)}")
-        
-        target_docs = [
-            "Emirates EG Apr25-Mar26.pdf",
-            "QR EG Apr-Sep25 PLB.pdf",
-            "Air Cairo EG Jan-Dec25 PLB.pdf"
-        ]
-        
-        # Check if columns exist
-        if 'Contract_Document_Name' not in df.columns:
-            print("Error: 'Contract_Document_Name' column not found.")
-            return
-        if 'Sector_Airline_Eligibility' not in df.columns:
-            print("Error: 'Sector_Airline_Eligibility' column not found.")
+        if pa is not None:
+            filtered_count = _filter_with_arrow(input_file, output_file, TARGET_DOCS)
+        else:
+            filtered_count = _filter_with_pandas(input_file, output_file, TARGET_DOCS)
+
+        if filtered_count is None:
             return
 
-        # Filter
-        # Normalize eligibility to boolean if it's string
-        if df['Sector_Airline_Eligibility'].dtype == 'object':
-             # Handle "True", "true", "TRUE", etc.
-             df['Sector_Airline_Eligibility'] = df['Sector_Airline_Eligibility'].astype(str).str.lower() == 'true'
-        
-        filtered_df = df[
-            (df['Contract_Document_Name'].isin(target_docs)) &
-            (df['Sector_Airline_Eligibility'] == True)
-        ]
-        
-        print(f"Filtered count: {len(filtered_df)}")
+        print(f"Filtered count: {filtered_count}")
         
-        if len(filtered_df) == 150:
+        if filtered_count == 150:
             print("SUCCESS: Count matches expected 150.")
         else:
-            print(f"WARNING: Count {len(filtered_df)} does not match expected 150.")
+            print(f"WARNING: Count {filtered_count} does not match expected 150.")
             
-        filtered_df.to_csv(output_file, index=False)
         print(f"Saved to {output_file}")
 
     except Exception as e:
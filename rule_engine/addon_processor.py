@@ -2,13 +2,151 @@
 Addon Rule Case Processor for handling special eligibility overrides
 """
 
+import re
 from datetime import datetime, date
 from decimal import Decimal
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, NamedTuple, Tuple
 from loguru import logger
+import numpy as np
+import pandas as pd
 
-from .models import CouponData, ContractData, ContractAnalysis
+from .models import CouponData, ContractData, ContractAnalysis, _parse_coupon_date
 from .exceptions import RuleEngineError
+from .logging_utils import is_debug_enabled
+
+# Day-number sentinels for unset effective date bounds
+_NO_FROM_DAY = np.iinfo(np.int64).min
+_NO_TO_DAY = np.iinfo(np.int64).max
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _to_epoch_days(values: Any, missing: int) -> np.ndarray:
+    """
+    Parse YYYY-MM-DD date bounds in bulk into int64 days since epoch
+    
+    Each distinct value is parsed once with the format the scalar matcher uses;
+    day numbers come from date ordinals, so open-ended bounds such as 9999-12-31
+    stay in range.
+    
+    Args:
+        values: Date strings (array-like)
+        missing: Value to use for missing or unparseable dates
+        
+    Returns:
+        int64 array of day numbers
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    
+    # One extra slot for missing values, which factorize codes as -1
+    days = np.full(len(uniques) + 1, missing, dtype=np.int64)
+    for index, value in enumerate(uniques):
+        try:
+            days[index] = datetime.strptime(value, '%Y-%m-%d').toordinal() - _EPOCH_ORDINAL
+        except (TypeError, ValueError):
+            pass
+    
+    return days[codes]
+
+
+def _coupon_epoch_days(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse coupon dates the way CouponData does into int64 days since epoch
+    
+    Each distinct value is parsed once with the model's parser, so airline
+    formats such as 30MAY25 and its 2025-01-01 fallback give the same day as
+    the per-coupon path.
+    
+    Args:
+        values: Date strings or date objects
+        
+    Returns:
+        Tuple of (int64 day numbers, validity mask); invalid rows hold 0
+    """
+    codes, uniques = pd.factorize(values)
+    
+    # One extra slot for missing values, which factorize codes as -1
+    days = np.zeros(len(uniques) + 1, dtype=np.int64)
+    valid = np.zeros(len(uniques) + 1, dtype=bool)
+    for index, value in enumerate(uniques):
+        parsed = _parse_coupon_date(value)
+        if isinstance(parsed, datetime):
+            parsed = parsed.date()
+        if isinstance(parsed, date):
+            days[index] = parsed.toordinal() - _EPOCH_ORDINAL
+            valid[index] = True
+    
+    return days[codes], valid[codes]
+
+
+# Ordinal sentinels for unset effective dates in compiled scalar mappings
+_NO_FROM_ORDINAL = 0
+_NO_TO_ORDINAL = date.max.toordinal() + 1
+
+
+class _CompiledMapping(NamedTuple):
+    """Addon mapping normalized once for the scalar matcher"""
+    source: Dict[str, Any]
+    marketing_flight: str
+    operating_airline: str
+    route: str
+    eff_from_ordinal: int
+    eff_to_ordinal: int
+
+
+# Coupon fields read by addon matching; the columns of the structure-of-arrays frame
+ADDON_COUPON_FIELDS = (
+    'flight_number', 'marketing_airline', 'operating_airline',
+    'cpn_origin', 'cpn_destination', 'cpn_flown_date', 'code_share'
+)
+
+# when_to_apply predicate flags, compiled once per addon rule
+APPLY_BASE_FILTER = 1
+APPLY_REJECTED = 2
+APPLY_CODESHARE = 4
+APPLY_ROUTE = 8
+
+_WHEN_TO_APPLY_FLAGS = {
+    'after base in/out filtering': APPLY_BASE_FILTER,
+    'only for coupons rejected': APPLY_REJECTED,
+    'operating carrier': APPLY_CODESHARE,
+    'codeshare': APPLY_CODESHARE,
+    'route/flight constraints': APPLY_ROUTE,
+}
+_WHEN_TO_APPLY_RE = re.compile('|'.join(re.escape(pattern) for pattern in _WHEN_TO_APPLY_FLAGS))
+
+# Exclusion criterion keywords mapped to the exclusion family they select
+_EXCLUSION_KINDS = {
+    'otadoc': 'otadoc',
+    'other airline document': 'otadoc',
+    'rbd': 'rbd',
+    'deal': 'deal',
+    'discount': 'deal',
+}
+_EXCLUSION_RE = re.compile('|'.join(re.escape(keyword) for keyword in _EXCLUSION_KINDS))
+
+
+def _decide_addon_override(eligible: np.ndarray, codeshare: np.ndarray, matched: np.ndarray,
+                           apply_always: bool, apply_codeshare: bool) -> np.ndarray:
+    """
+    Decide which coupons an addon rule applies to in one array expression
+    
+    Args:
+        eligible: Whether the row is already trigger and payout eligible
+        codeshare: Codeshare / operating-carrier-differs flag per row
+        matched: Whether the row matched any of the rule's mappings
+        apply_always: Addon rule applies regardless of current eligibility
+        apply_codeshare: Addon rule also applies to codeshare coupons
+        
+    Returns:
+        Boolean array of rows the addon rule is applied to
+    """
+    if apply_always:
+        return matched.copy()
+    should_apply = ~eligible
+    if apply_codeshare:
+        should_apply = should_apply | codeshare
+    return should_apply & matched
 
 
 class AddonRuleProcessor:
@@ -19,10 +157,25 @@ class AddonRuleProcessor:
     def __init__(self):
         """Initialize addon rule processor"""
         self.logger = logger
+        self._debug_enabled = is_debug_enabled()
+        # Parsed mapping dates and when_to_apply flags, keyed by id() of the source dict
+        self._date_cache: Dict[int, tuple] = {}
+        self._apply_flags_cache: Dict[int, tuple] = {}
+        self._compiled_mappings_cache: Dict[int, tuple] = {}
+        self._scalar_mappings_cache: Dict[int, tuple] = {}
+        self._exclusion_kinds_cache: Dict[str, frozenset] = {}
+    
+    def clear_caches(self) -> None:
+        """Drop values cached per contract so replaced contracts can be freed"""
+        self._date_cache = {}
+        self._apply_flags_cache = {}
+        self._compiled_mappings_cache = {}
+        self._scalar_mappings_cache = {}
+        self._exclusion_kinds_cache = {}
     
     def process_addon_rules(self, coupon: CouponData, contract: ContractData, 
                            initial_trigger_eligible: bool, initial_payout_eligible: bool,
-                           contract_analysis: ContractAnalysis) -> Dict[str, Any]:
+                           contract_analysis: Optional[ContractAnalysis] = None) -> Dict[str, Any]:
         """
         Process addon rule cases for a coupon and contract
         
@@ -36,11 +189,15 @@ class AddonRuleProcessor:
         Returns:
             Dictionary with updated eligibility results and addon processing details
         """
+        # Sinks may be reconfigured after init; re-read the level once per contract
+        self._debug_enabled = is_debug_enabled()
+        
         try:
             # Check if contract has addon rules
             addon_rules = getattr(contract, 'addon_rule_cases', [])
             if not addon_rules:
-                self.logger.debug(f"No addon rules found for contract {contract.contract_id}")
+                if self._debug_enabled:
+                    self.logger.debug(f"No addon rules found for contract {contract.contract_id}")
                 return {
                     'trigger_eligible': initial_trigger_eligible,
                     'payout_eligible': initial_payout_eligible,
@@ -53,25 +210,27 @@ class AddonRuleProcessor:
             # Process each addon rule
             final_trigger_eligible = initial_trigger_eligible
             final_payout_eligible = initial_payout_eligible
-            addon_details = []
+            addon_applied = False
+            addon_details = [None] * len(addon_rules)
             
-            for addon_rule in addon_rules:
+            for index, addon_rule in enumerate(addon_rules):
                 addon_result = self._process_single_addon_rule(
                     coupon, contract, addon_rule, 
                     final_trigger_eligible, final_payout_eligible
                 )
                 
                 if addon_result['applied']:
+                    addon_applied = True
                     final_trigger_eligible = addon_result['trigger_eligible']
                     final_payout_eligible = addon_result['payout_eligible']
                     self.logger.info(f"Addon rule {addon_rule.get('addon_rule_id', 'Unknown')} applied successfully")
                 
-                addon_details.append(addon_result)
+                addon_details[index] = addon_result
             
             return {
                 'trigger_eligible': final_trigger_eligible,
                 'payout_eligible': final_payout_eligible,
-                'addon_applied': any(detail['applied'] for detail in addon_details),
+                'addon_applied': addon_applied,
                 'addon_details': addon_details
             }
             
@@ -85,6 +244,285 @@ class AddonRuleProcessor:
                 'error': str(e)
             }
     
+    @staticmethod
+    def coupons_to_frame(coupons: List[CouponData]) -> pd.DataFrame:
+        """
+        Build a structure-of-arrays frame of the addon matching fields
+        
+        Lets batch callers holding CouponData objects use the column-wise path;
+        each field is read once per coupon into a contiguous column.
+        
+        Args:
+            coupons: Coupon data objects
+            
+        Returns:
+            DataFrame with one column per ADDON_COUPON_FIELDS entry
+        """
+        return pd.DataFrame({
+            field: [getattr(coupon, field) for coupon in coupons]
+            for field in ADDON_COUPON_FIELDS
+        })
+    
+    def process_addon_rules_df(self, df: pd.DataFrame, contract: ContractData,
+                               initial_trigger_eligible: Union[bool, np.ndarray, pd.Series],
+                               initial_payout_eligible: Union[bool, np.ndarray, pd.Series]) -> pd.DataFrame:
+        """
+        Process addon rule cases for a whole coupon DataFrame against one contract
+        
+        Vectorized counterpart of process_addon_rules: each addon rule is evaluated
+        as a boolean mask over the full frame instead of once per coupon.
+        
+        Args:
+            df: Coupon DataFrame (CouponData field names as columns)
+            contract: Contract data
+            initial_trigger_eligible: Initial trigger eligibility (scalar or per-row)
+            initial_payout_eligible: Initial payout eligibility (scalar or per-row)
+        
+        Returns:
+            DataFrame aligned with df holding trigger_eligible, payout_eligible,
+            addon_applied and addon_names columns
+        """
+        n = len(df)
+        trigger = np.broadcast_to(np.asarray(initial_trigger_eligible, dtype=bool), (n,)).copy()
+        payout = np.broadcast_to(np.asarray(initial_payout_eligible, dtype=bool), (n,)).copy()
+        applied_any = np.zeros(n, dtype=bool)
+        applied_names = [[] for _ in range(n)]
+        self._debug_enabled = is_debug_enabled()
+        
+        try:
+            addon_rules = getattr(contract, 'addon_rule_cases', [])
+            if not addon_rules or n == 0:
+                if self._debug_enabled:
+                    self.logger.debug(f"No addon rules found for contract {contract.contract_id}")
+            else:
+                self.logger.info(f"Processing {len(addon_rules)} addon rules for contract {contract.contract_id} "
+                                 f"over {n} coupons")
+                columns = self._coupon_frame_columns(df)
+                rule_matches = self._rule_match_masks(addon_rules, columns)
+                
+                # Any applied rule makes a coupon trigger and payout eligible, and every
+                # rule applies to a still-ineligible coupon it matches, so the final flags
+                # are the initial ones OR'd with the union of all mapping matches
+                rescued = np.logical_or.reduce(rule_matches) if rule_matches else np.zeros(n, dtype=bool)
+                eligible = trigger & payout
+                trigger |= rescued
+                payout |= rescued
+                
+                # Per-rule bookkeeping of which addons were applied to which coupons
+                for addon_rule, matched in zip(addon_rules, rule_matches):
+                    flags = self._get_apply_flags(addon_rule)
+                    applied = _decide_addon_override(
+                        eligible, columns['codeshare'], matched,
+                        bool(flags & APPLY_ROUTE), bool(flags & APPLY_CODESHARE)
+                    )
+                    eligible = eligible | matched
+                    if not applied.any():
+                        continue
+                    
+                    applied_any |= applied
+                    addon_name = addon_rule.get('name', 'Unknown Addon Rule')
+                    for idx in np.flatnonzero(applied):
+                        applied_names[idx].append(addon_name)
+                    self.logger.info(f"Addon rule {addon_rule.get('addon_rule_id', 'Unknown')} applied "
+                                     f"to {int(applied.sum())} coupons")
+        
+        except Exception as e:
+            self.logger.error(f"Error processing addon rules: {str(e)}")
+            trigger = np.broadcast_to(np.asarray(initial_trigger_eligible, dtype=bool), (n,)).copy()
+            payout = np.broadcast_to(np.asarray(initial_payout_eligible, dtype=bool), (n,)).copy()
+            applied_any = np.zeros(n, dtype=bool)
+            applied_names = [[] for _ in range(n)]
+        
+        return pd.DataFrame({
+            'trigger_eligible': trigger,
+            'payout_eligible': payout,
+            'addon_applied': applied_any,
+            'addon_names': [', '.join(names) for names in applied_names]
+        }, index=df.index)
+    
+    def _rule_match_masks(self, addon_rules: List[Dict[str, Any]], columns: Dict[str, Any]) -> List[np.ndarray]:
+        """
+        Match every addon rule's mappings against the coupon columns
+        
+        Args:
+            addon_rules: Addon rule configurations
+            columns: Precomputed coupon columns
+            
+        Returns:
+            One boolean mask per addon rule
+        """
+        return [self._match_mappings_df(self._compile_mappings(addon_rule), columns) >= 0
+                for addon_rule in addon_rules]
+    
+    def _coupon_frame_columns(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Precompute the coupon columns used by addon matching once per frame
+        
+        Args:
+            df: Coupon DataFrame
+        
+        Returns:
+            Dictionary of normalized column arrays
+        """
+        def text(column: str) -> pd.Series:
+            if column not in df.columns:
+                return pd.Series('', index=df.index)
+            return df[column].fillna('').astype(str)
+        
+        flight = text('flight_number')
+        marketing = text('marketing_airline')
+        operating = text('operating_airline')
+        combined_flight = marketing.str.cat(flight).where(marketing != '', flight)
+        
+        if 'cpn_flown_date' in df.columns:
+            flown_days, flown_valid = _coupon_epoch_days(df['cpn_flown_date'])
+        else:
+            flown_days = np.zeros(len(df), dtype=np.int64)
+            flown_valid = np.zeros(len(df), dtype=bool)
+        
+        return {
+            'flight': flight.to_numpy(),
+            'combined_flight': combined_flight.to_numpy(),
+            'operating_airline': operating.to_numpy(),
+            'route': text('cpn_origin').str.cat(text('cpn_destination'), sep='-').to_numpy(),
+            'flown_day': flown_days,
+            'flown_valid': flown_valid,
+            'codeshare': ((text('code_share') != '') |
+                          ((operating != '') & (operating != marketing))).to_numpy()
+        }
+    
+    def _compile_mappings(self, addon_rule: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compile an addon rule's mappings into column arrays for vectorized matching
+        
+        Mappings are grouped by which of marketing_flight/operating_airline/route
+        they constrain, so each group can be hash-joined against the coupon frame.
+        
+        Args:
+            addon_rule: Addon rule configuration
+            
+        Returns:
+            Dictionary with per-field arrays, date bounds and mapping groups
+        """
+        cached = self._compiled_mappings_cache.get(id(addon_rule))
+        if cached is not None and cached[0] is addon_rule:
+            return cached[1]
+        
+        mappings = addon_rule.get('mappings', [])
+        count = len(mappings)
+        marketing_flight = np.empty(count, dtype=object)
+        operating_airline = np.empty(count, dtype=object)
+        route = np.empty(count, dtype=object)
+        groups: Dict[tuple, List[int]] = {}
+        
+        for idx, mapping in enumerate(mappings):
+            marketing_flight[idx] = mapping.get('marketing_flight', '') or ''
+            operating_airline[idx] = mapping.get('operating_airline', '') or ''
+            route[idx] = mapping.get('route', '') or ''
+            signature = tuple(field for field, values in (('marketing_flight', marketing_flight),
+                                                          ('operating_airline', operating_airline),
+                                                          ('route', route)) if values[idx])
+            groups.setdefault(signature, []).append(idx)
+        
+        # Parse all effective date bounds in one pass into int64 day numbers
+        from_values = [mapping.get('effective_from') or None for mapping in mappings]
+        to_values = [mapping.get('effective_to') or None for mapping in mappings]
+        eff_from = _to_epoch_days(from_values, _NO_FROM_DAY)
+        eff_to = _to_epoch_days(to_values, _NO_TO_DAY)
+        for key, values, days, missing in (('effective_from', from_values, eff_from, _NO_FROM_DAY),
+                                           ('effective_to', to_values, eff_to, _NO_TO_DAY)):
+            for idx in np.flatnonzero(days == missing):
+                if values[idx]:
+                    self.logger.warning(f"Invalid {key} date format: {values[idx]}")
+        
+        compiled = {
+            'count': count,
+            'marketing_flight': marketing_flight,
+            'operating_airline': operating_airline,
+            'route': route,
+            'eff_from': eff_from,
+            'eff_to': eff_to,
+            # The scalar scan stops at an empty mapping dict but treats it as no match
+            'empty': np.fromiter((not mapping for mapping in mappings), dtype=bool, count=count),
+            'groups': {signature: np.asarray(idxs, dtype=np.int64) for signature, idxs in groups.items()}
+        }
+        self._compiled_mappings_cache[id(addon_rule)] = (addon_rule, compiled)
+        return compiled
+    
+    def _match_mappings_df(self, compiled: Dict[str, Any], columns: Dict[str, Any]) -> np.ndarray:
+        """
+        Find the first matching mapping for every coupon row via hash joins
+        
+        Args:
+            compiled: Compiled mappings from _compile_mappings
+            columns: Precomputed coupon columns
+            
+        Returns:
+            Array with the matching mapping index per row, -1 where none match
+        """
+        n = len(columns['route'])
+        count = compiled['count']
+        if count == 0 or n == 0:
+            return np.full(n, -1, dtype=np.int64)
+        
+        coupons = pd.DataFrame({
+            'row': np.arange(n, dtype=np.int64),
+            'flight': columns['flight'],
+            'combined_flight': columns['combined_flight'],
+            'operating_airline': columns['operating_airline'],
+            'route': columns['route']
+        })
+        
+        pair_rows = []
+        pair_mappings = []
+        for signature, idxs in compiled['groups'].items():
+            mapping_frame = pd.DataFrame({'mapping_idx': idxs})
+            for field in signature:
+                mapping_frame[field] = compiled[field][idxs]
+            
+            if not signature:
+                # Mapping without field constraints matches every coupon
+                pair_rows.append(np.repeat(coupons['row'].to_numpy(), len(idxs)))
+                pair_mappings.append(np.tile(idxs, n))
+                continue
+            
+            other_fields = [field for field in signature if field != 'marketing_flight']
+            if 'marketing_flight' in signature:
+                # Marketing flight may match either the bare or the airline-prefixed flight number
+                joins = [(['flight'] + other_fields), (['combined_flight'] + other_fields)]
+                right_on = ['marketing_flight'] + other_fields
+            else:
+                joins = [other_fields]
+                right_on = other_fields
+            
+            for left_on in joins:
+                joined = coupons.merge(mapping_frame, left_on=left_on, right_on=right_on, how='inner')
+                pair_rows.append(joined['row'].to_numpy(dtype=np.int64))
+                pair_mappings.append(joined['mapping_idx'].to_numpy(dtype=np.int64))
+        
+        rows = np.concatenate(pair_rows)
+        mapping_idx = np.concatenate(pair_mappings)
+        
+        # Effective date window as integer day compares; unset bounds are min/max
+        # sentinels, and coupons without a valid flown date only pass unbounded mappings
+        flown_day = columns['flown_day'][rows]
+        from_day = compiled['eff_from'][mapping_idx]
+        to_day = compiled['eff_to'][mapping_idx]
+        unbounded = (from_day == _NO_FROM_DAY) & (to_day == _NO_TO_DAY)
+        in_window = (flown_day >= from_day) & (flown_day <= to_day) & (columns['flown_valid'][rows] | unbounded)
+        rows = rows[in_window]
+        mapping_idx = mapping_idx[in_window]
+        
+        # Keep the first mapping in declaration order, as the scalar scan does
+        first = np.full(n, count, dtype=np.int64)
+        np.minimum.at(first, rows, mapping_idx)
+        first[first == count] = -1
+        
+        # A row whose first match is an empty mapping is unmatched, as in _process_single_addon_rule
+        hits = np.flatnonzero(first >= 0)
+        first[hits[compiled['empty'][first[hits]]]] = -1
+        return first
+    
     def _process_single_addon_rule(self, coupon: CouponData, contract: ContractData,
                                   addon_rule: Dict[str, Any], current_trigger_eligible: bool,
                                   current_payout_eligible: bool) -> Dict[str, Any]:
@@ -109,7 +547,8 @@ class AddonRuleProcessor:
             mappings = addon_rule.get('mappings', [])
             exclusions = addon_rule.get('exclusions_still_applicable', [])
             
-            self.logger.debug(f"Processing addon rule: {addon_rule_id} - {addon_name}")
+            if self._debug_enabled:
+                self.logger.debug(f"Processing addon rule: {addon_rule_id} - {addon_name}")
             
             # Check if this addon rule should be applied
             should_apply = self._should_apply_addon_rule(
@@ -126,8 +565,10 @@ class AddonRuleProcessor:
                     'payout_eligible': current_payout_eligible
                 }
             
-            # Check if coupon matches any mapping in the addon rule
-            matching_mapping = self._find_matching_mapping(coupon, mappings)
+            # Find the first matching mapping and check exclusions in a single pass
+            matching_mapping, excluded_by_exclusions = self._find_applicable_mapping(
+                coupon, mappings, exclusions
+            )
             
             if not matching_mapping:
                 return {
@@ -139,9 +580,6 @@ class AddonRuleProcessor:
                     'payout_eligible': current_payout_eligible
                 }
             
-            # Check exclusions that still apply
-            excluded_by_exclusions = self._check_exclusions(coupon, exclusions)
-            
             if excluded_by_exclusions:
                 return {
                     'addon_rule_id': addon_rule_id,
@@ -193,123 +631,154 @@ class AddonRuleProcessor:
             True if addon rule should be applied
         """
         try:
-            when_to_apply = addon_rule.get('when_to_apply', '').lower()
-            
-            # Common patterns for when to apply addon rules
-            if 'after base in/out filtering' in when_to_apply:
-                # Apply if coupon was rejected due to base filtering
-                if not current_trigger_eligible or not current_payout_eligible:
-                    return True
-            
-            if 'only for coupons rejected' in when_to_apply:
-                # Apply only if coupon was initially rejected
-                if not current_trigger_eligible or not current_payout_eligible:
-                    return True
-            
-            if 'operating carrier' in when_to_apply or 'codeshare' in when_to_apply:
-                # Apply if coupon has codeshare or operating carrier issues
-                if coupon.code_share or (coupon.operating_airline and coupon.operating_airline != coupon.marketing_airline):
-                    return True
-            
-            if 'route/flight constraints' in when_to_apply:
-                # Apply if there might be route/flight constraint issues
+            flags = self._get_apply_flags(addon_rule)
+            
+            # Route/flight constraint rules always apply; base-filter, rejected-coupon
+            # and default rules all reduce to "coupon was initially ineligible"
+            if flags & APPLY_ROUTE or not (current_trigger_eligible and current_payout_eligible):
                 return True
             
-            # Default: apply if coupon was initially ineligible
-            return not current_trigger_eligible or not current_payout_eligible
+            # Codeshare rules also apply to eligible coupons with operating carrier differences
+            return bool(flags & APPLY_CODESHARE and (
+                coupon.code_share or
+                (coupon.operating_airline and coupon.operating_airline != coupon.marketing_airline)
+            ))
             
         except Exception as e:
             self.logger.error(f"Error determining if addon rule should apply: {str(e)}")
             return False
     
-    def _find_matching_mapping(self, coupon: CouponData, mappings: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    def _find_applicable_mapping(self, coupon: CouponData, mappings: List[Dict[str, Any]],
+                                 exclusions: List[str]) -> tuple:
         """
-        Find a mapping that matches the coupon data
+        Find the first mapping matching the coupon and check exclusions in one pass
+        
+        Flight, operating airline, route and effective date checks are inlined
+        over coupon fields read once into locals; the combined flight and route
+        strings are built once per coupon rather than once per mapping.
         
         Args:
             coupon: Coupon data
             mappings: List of addon rule mappings
+            exclusions: List of exclusion criteria still applicable
             
         Returns:
-            Matching mapping or None
+            Tuple of (matching mapping or None, exclusion reason or None)
         """
         try:
-            for mapping in mappings:
-                if self._coupon_matches_mapping(coupon, mapping):
-                    return mapping
+            coupon_flight = str(coupon.flight_number) if coupon.flight_number else ''
+            combined_flight = f"{coupon.marketing_airline}{coupon_flight}" if coupon.marketing_airline else coupon_flight
+            coupon_operating = coupon.operating_airline
+            coupon_route = f"{coupon.cpn_origin}-{coupon.cpn_destination}"
+            travel_ordinal = coupon.cpn_flown_date.toordinal()
+            
+            for m in self._get_scalar_mappings(mappings):
+                # Check marketing flight against flight number or marketing airline + flight number
+                if m.marketing_flight and m.marketing_flight != coupon_flight and m.marketing_flight != combined_flight:
+                    continue
+                
+                # Check operating airline
+                if m.operating_airline and m.operating_airline != coupon_operating:
+                    continue
+                
+                # Check route built from origin and destination
+                if m.route and m.route != coupon_route:
+                    continue
+                
+                # Check effective dates against travel date; unset bounds are sentinels
+                if travel_ordinal < m.eff_from_ordinal or travel_ordinal > m.eff_to_ordinal:
+                    continue
+                
+                return m.source, self._check_exclusions(coupon, exclusions)
             
-            return None
+            return None, None
             
         except Exception as e:
             self.logger.error(f"Error finding matching mapping: {str(e)}")
-            return None
+            return None, None
     
-    def _coupon_matches_mapping(self, coupon: CouponData, mapping: Dict[str, Any]) -> bool:
+    def _get_scalar_mappings(self, mappings: List[Dict[str, Any]]) -> List[_CompiledMapping]:
         """
-        Check if coupon matches a specific mapping
+        Get an addon rule's mappings as compiled tuples, compiling once per list
         
         Args:
-            coupon: Coupon data
-            mapping: Mapping configuration
+            mappings: List of addon rule mappings
             
         Returns:
-            True if coupon matches mapping
+            List of _CompiledMapping in declaration order
         """
-        try:
-            # Check marketing flight
-            marketing_flight = mapping.get('marketing_flight', '')
-            if marketing_flight:
-                # Compare with flight number or marketing airline + flight number
-                coupon_flight = str(coupon.flight_number) if coupon.flight_number else ''
-                if marketing_flight != coupon_flight:
-                    # Try combining marketing airline with flight number
-                    combined_flight = f"{coupon.marketing_airline}{coupon_flight}" if coupon.marketing_airline else coupon_flight
-                    if marketing_flight != combined_flight:
-                        return False
-            
-            # Check operating airline
-            operating_airline = mapping.get('operating_airline', '')
-            if operating_airline:
-                if operating_airline != coupon.operating_airline:
-                    return False
-            
-            # Check route
-            route = mapping.get('route', '')
-            if route:
-                # Build route from origin and destination
-                coupon_route = f"{coupon.cpn_origin}-{coupon.cpn_destination}"
-                if route != coupon_route:
-                    return False
-            
-            # Check effective dates
-            effective_from = mapping.get('effective_from')
-            effective_to = mapping.get('effective_to')
-            
-            if effective_from or effective_to:
-                # Use travel date for effective date checking
-                travel_date = coupon.cpn_flown_date
-                
-                if effective_from:
-                    try:
-                        from_date = datetime.strptime(effective_from, '%Y-%m-%d').date()
-                        if travel_date < from_date:
-                            return False
-                    except ValueError:
-                        self.logger.warning(f"Invalid effective_from date format: {effective_from}")
-                
-                if effective_to:
-                    try:
-                        to_date = datetime.strptime(effective_to, '%Y-%m-%d').date()
-                        if travel_date > to_date:
-                            return False
-                    except ValueError:
-                        self.logger.warning(f"Invalid effective_to date format: {effective_to}")
+        if not mappings:
+            return []
+        
+        cached = self._scalar_mappings_cache.get(id(mappings))
+        if cached is not None and cached[0] is mappings:
+            return cached[1]
+        
+        compiled = []
+        for mapping in mappings:
+            from_date, to_date = self._get_mapping_dates(mapping)
+            compiled.append(_CompiledMapping(
+                source=mapping,
+                marketing_flight=mapping.get('marketing_flight', '') or '',
+                operating_airline=mapping.get('operating_airline', '') or '',
+                route=mapping.get('route', '') or '',
+                eff_from_ordinal=from_date.toordinal() if from_date else _NO_FROM_ORDINAL,
+                eff_to_ordinal=to_date.toordinal() if to_date else _NO_TO_ORDINAL
+            ))
+        
+        self._scalar_mappings_cache[id(mappings)] = (mappings, compiled)
+        return compiled
+    
+    def _get_mapping_dates(self, mapping: Dict[str, Any]) -> tuple:
+        """
+        Get parsed effective_from/effective_to dates for a mapping, parsing once
+        
+        Args:
+            mapping: Mapping configuration
             
-            return True
+        Returns:
+            Tuple of (from_date, to_date), None where unset or invalid
+        """
+        cached = self._date_cache.get(id(mapping))
+        if cached is not None and cached[0] is mapping:
+            return cached[1], cached[2]
+        
+        dates = []
+        for key in ('effective_from', 'effective_to'):
+            value = mapping.get(key)
+            parsed = None
+            if value:
+                try:
+                    parsed = datetime.strptime(value, '%Y-%m-%d').date()
+                except ValueError:
+                    self.logger.warning(f"Invalid {key} date format: {value}")
+            dates.append(parsed)
+        
+        # Hold a reference to the mapping so its id() cannot be reused while cached
+        self._date_cache[id(mapping)] = (mapping, dates[0], dates[1])
+        return dates[0], dates[1]
+    
+    def _get_apply_flags(self, addon_rule: Dict[str, Any]) -> int:
+        """
+        Get the compiled when_to_apply flags for an addon rule, scanning the text once
+        
+        Args:
+            addon_rule: Addon rule configuration
             
-        except Exception as e:
-            self.logger.error(f"Error checking coupon mapping match: {str(e)}")
-            return False
+        Returns:
+            Bitmask of APPLY_* flags
+        """
+        cached = self._apply_flags_cache.get(id(addon_rule))
+        if cached is not None and cached[0] is addon_rule:
+            return cached[1]
+        
+        when_to_apply = addon_rule.get('when_to_apply', '').lower()
+        flags = 0
+        for match in _WHEN_TO_APPLY_RE.finditer(when_to_apply):
+            flags |= _WHEN_TO_APPLY_FLAGS[match.group()]
+        
+        self._apply_flags_cache[id(addon_rule)] = (addon_rule, flags)
+        return flags
     
     def _check_exclusions(self, coupon: CouponData, exclusions: List[str]) -> Optional[str]:
         """
@@ -344,33 +813,32 @@ class AddonRuleProcessor:
         Returns:
             True if excluded
         """
-        try:
-            exclusion_lower = exclusion.lower()
-            
-            # Check for OTADOC (Other Airline Document)
-            if 'otadoc' in exclusion_lower or 'other airline document' in exclusion_lower:
-                # This would need to be determined from coupon data
-                # For now, assume not excluded unless we have specific logic
-                return False
-            
-            # Check for disallowed RBDs
-            if 'disallowed rbd' in exclusion_lower or 'rbd' in exclusion_lower:
-                # Check if coupon RBD is in disallowed list
-                # This would need to be checked against the specific RBD exclusions
-                # For now, assume not excluded unless we have specific logic
-                return False
-            
-            # Check for disallowed deal/discount families
-            if 'deal' in exclusion_lower or 'discount' in exclusion_lower:
-                # Check fare type or other deal-related fields
-                # This would need to be checked against specific deal exclusions
-                return False
-            
+        kinds = self._exclusion_kinds_cache.get(exclusion)
+        if kinds is None:
+            kinds = frozenset(_EXCLUSION_KINDS[match.group()]
+                              for match in _EXCLUSION_RE.finditer(exclusion.lower()))
+            self._exclusion_kinds_cache[exclusion] = kinds
+        
+        # Check for OTADOC (Other Airline Document)
+        if 'otadoc' in kinds:
+            # This would need to be determined from coupon data
+            # For now, assume not excluded unless we have specific logic
             return False
-            
-        except Exception as e:
-            self.logger.error(f"Error checking exclusion criterion: {str(e)}")
+        
+        # Check for disallowed RBDs
+        if 'rbd' in kinds:
+            # Check if coupon RBD is in disallowed list
+            # This would need to be checked against the specific RBD exclusions
+            # For now, assume not excluded unless we have specific logic
             return False
+        
+        # Check for disallowed deal/discount families
+        if 'deal' in kinds:
+            # Check fare type or other deal-related fields
+            # This would need to be checked against specific deal exclusions
+            return False
+        
+        return False
     
     def update_contract_analysis_with_addon(self, contract_analysis: ContractAnalysis,
                                           addon_result: Dict[str, Any]) -> ContractAnalysis:
@@ -395,22 +863,68 @@ class AddonRuleProcessor:
                 applied_addons = [detail for detail in addon_details if detail['applied']]
                 
                 if applied_addons:
-                    addon_names = [addon['addon_name'] for addon in applied_addons]
-                    addon_reason = f"Addon rules applied: {', '.join(addon_names)}"
-                    
-                    # Append to existing reasons
-                    if contract_analysis.trigger_eligibility_reason:
-                        contract_analysis.trigger_eligibility_reason += f"; {addon_reason}"
-                    else:
-                        contract_analysis.trigger_eligibility_reason = addon_reason
-                    
-                    if contract_analysis.payout_eligibility_reason:
-                        contract_analysis.payout_eligibility_reason += f"; {addon_reason}"
-                    else:
-                        contract_analysis.payout_eligibility_reason = addon_reason
+                    self._append_addon_reason(
+                        contract_analysis, ', '.join(addon['addon_name'] for addon in applied_addons)
+                    )
             
             return contract_analysis
             
         except Exception as e:
             self.logger.error(f"Error updating contract analysis with addon results: {str(e)}")
             return contract_analysis
+    
+    def update_contract_analyses_with_addon(self, coupons: List[CouponData], contract: ContractData,
+                                            contract_analyses: List[ContractAnalysis]) -> int:
+        """
+        Apply a contract's addon rules to the analyses of a batch of coupons
+        
+        Batch counterpart of process_addon_rules followed by
+        update_contract_analysis_with_addon: initial eligibility is read from the
+        analyses and all coupons are evaluated in one process_addon_rules_df call.
+        
+        Args:
+            coupons: Sector-eligible coupons, aligned with contract_analyses
+            contract: Contract data
+            contract_analyses: Analyses of the coupons against this contract, updated in place
+            
+        Returns:
+            Number of analyses an addon rule was applied to
+        """
+        count = len(contract_analyses)
+        results = self.process_addon_rules_df(
+            self.coupons_to_frame(coupons), contract,
+            np.fromiter((analysis.trigger_eligibility for analysis in contract_analyses), dtype=bool, count=count),
+            np.fromiter((analysis.payout_eligibility for analysis in contract_analyses), dtype=bool, count=count)
+        )
+        
+        applied = 0
+        for contract_analysis, row in zip(contract_analyses, results.itertuples(index=False)):
+            if not row.addon_applied:
+                continue
+            contract_analysis.trigger_eligibility = bool(row.trigger_eligible)
+            contract_analysis.payout_eligibility = bool(row.payout_eligible)
+            self._append_addon_reason(contract_analysis, row.addon_names)
+            applied += 1
+        return applied
+    
+    @staticmethod
+    def _append_addon_reason(contract_analysis: ContractAnalysis, addon_names: str) -> None:
+        """
+        Record the applied addon rules in the trigger and payout reasons
+        
+        Args:
+            contract_analysis: Contract analysis to update
+            addon_names: Comma-separated names of the applied addon rules
+        """
+        addon_reason = f"Addon rules applied: {addon_names}"
+        
+        # Append to existing reasons
+        if contract_analysis.trigger_eligibility_reason:
+            contract_analysis.trigger_eligibility_reason += f"; {addon_reason}"
+        else:
+            contract_analysis.trigger_eligibility_reason = addon_reason
+        
+        if contract_analysis.payout_eligibility_reason:
+            contract_analysis.payout_eligibility_reason += f"; {addon_reason}"
+        else:
+            contract_analysis.payout_eligibility_reason = addon_reason
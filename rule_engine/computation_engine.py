@@ -3,14 +3,62 @@ Computation engine for trigger and payout calculations
 """
 
 import re
+import bisect
+from functools import lru_cache
 from datetime import datetime, date
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Tuple, NamedTuple
 from loguru import logger
+import numpy as np
 
 from .models import CouponData, ContractData
 from .exceptions import ComputationError
 from .formula_parser import FormulaParser
+from .logging_utils import is_debug_enabled
+
+
+# Formula classification: operator characters, parameter references, descriptive words
+_MATH_CHARS = frozenset("=+-*/()^")
+_PARAM_RE = re.compile(r'\b(BASE|YQ|YR|XT|TOTAL|slab_percent|tier_percent)\b')
+_DESCRIPTIVE_RE = re.compile(
+    r'excluding|including|revenue|flown|commissions|refunds|taxes|nrf|ticketed|operated|on|program|incentive',
+    re.IGNORECASE
+)
+
+# Decimal constants and quantizers shared by the computation paths
+_Q4 = Decimal('0.0001')
+_Q2 = Decimal('0.01')
+_ZERO = Decimal('0')
+_HUNDRED = Decimal('100')
+_INF = Decimal('Infinity')
+
+
+
+class TierRow(NamedTuple):
+    """Tier row with target bounds and payout parsed once from either row format"""
+    min_value: Decimal
+    max_value: Decimal
+    payout_value: Decimal
+    payout_unit: str
+    row: Dict[str, Any]
+    # payout_value / 100 for percentage rows (any unit other than AMOUNT), else None
+    ratio: Optional[Decimal]
+
+
+class ContractDecimals(NamedTuple):
+    """Contract payout and capping amounts converted to Decimal once"""
+    payout_percentage: Optional[Decimal]
+    payout_fixed_amount: Optional[Decimal]
+    trigger_capping_value: Optional[Decimal]
+    payout_capping_value: Optional[Decimal]
+
+
+# Value kinds computed by ComputationEngine._compute
+_TRIGGER = 'trigger'
+_PAYOUT = 'payout'
+
+# Position of each revenue component in the coupon revenue vector
+_COMPONENT_INDEX = {'BASE': 0, 'YQ': 1, 'YR': 2, 'XT': 3}
 
 
 class ComputationEngine:
@@ -23,6 +71,28 @@ class ComputationEngine:
         self.logger = logger
         self.precision = 4  # Decimal precision for calculations
         self.formula_parser = FormulaParser()
+        # Refreshed per compute call; skips building debug messages when DEBUG is off
+        self._debug_enabled = is_debug_enabled()
+        # Compiled formulas keyed by formula string (None = use text evaluation)
+        self._formula_cache: Dict[str, Any] = {}
+        # Revenue vector indices keyed by id() of a contract's component list
+        self._component_index_cache: Dict[int, Tuple[List[str], Tuple[int, ...]]] = {}
+        # Decimal payout/capping amounts keyed by id() of contract, with the raw values they came from
+        self._contract_decimals_cache: Dict[int, Tuple[ContractData, Tuple[Any, ...], ContractDecimals]] = {}
+        # Validation results keyed by id() of contract, with the fields they were derived from
+        self._validation_cache: Dict[int, Tuple[ContractData, Tuple[Any, ...], Dict[str, Any]]] = {}
+        # Normalized tier rows per tier table, keyed by id() of a contract's tier list
+        self._normalized_tiers_cache: Dict[int, Tuple[List[Dict[str, Any]], List[List[TierRow]]]] = {}
+        # Tier row minimums and flattened rows, keyed by id() of a contract's tier list
+        self._tier_index_cache: Dict[int, Tuple[List[Dict[str, Any]], List[Decimal], List[TierRow], bool]] = {}
+    
+    def clear_caches(self) -> None:
+        """Drop values cached per contract so replaced contracts can be freed"""
+        self._component_index_cache = {}
+        self._contract_decimals_cache = {}
+        self._validation_cache = {}
+        self._normalized_tiers_cache = {}
+        self._tier_index_cache = {}
 
     def _safe_decimal(self, value: Any, default: str = "0") -> Decimal:
         """
@@ -32,12 +102,47 @@ class ComputationEngine:
         provided default (as a string) to avoid Decimal(ConversionSyntax)
         bubbling up and breaking processing.
         """
+        value_type = type(value)
+        if value_type is Decimal:
+            return value
+        if value_type is int:
+            return Decimal(value)
         try:
-            return Decimal(str(value))
+            # str() keeps the shortest repr for floats; strings parse directly
+            return Decimal(value if value_type is str else str(value))
         except Exception as e:
             self.logger.warning(f"Invalid decimal value '{value}' – using default {default}. Error: {e}")
             return Decimal(default)
     
+    def _eval_cached(self, formula: str, coupon: CouponData, contract: ContractData,
+                     additional_params: Optional[Dict[str, Any]] = None) -> Decimal:
+        """
+        Evaluate a formula, parsing and compiling each distinct formula string once
+        
+        Args:
+            formula: Formula string to evaluate
+            coupon: Coupon data
+            contract: Contract data
+            additional_params: Additional parameters for the formula
+            
+        Returns:
+            Calculated result
+        """
+        if formula in self._formula_cache:
+            compiled = self._formula_cache[formula]
+        else:
+            compiled = self.formula_parser.compile_formula(formula)
+            self._formula_cache[formula] = compiled
+        
+        if compiled is not None:
+            try:
+                return self.formula_parser.evaluate_compiled(compiled, coupon, contract, additional_params)
+            except Exception:
+                # Missing parameters or unusual values keep the text path's handling
+                pass
+        
+        return self.formula_parser.evaluate_formula(formula, coupon, contract, additional_params)
+    
     def compute_trigger(self, coupon: CouponData, contract: ContractData) -> Decimal:
         """
         Compute trigger value using contract formula
@@ -49,73 +154,223 @@ class ComputationEngine:
         Returns:
             Calculated trigger value
         """
+        return self._compute(_TRIGGER, coupon, contract)
+    
+    def compute_payout(self, coupon: CouponData, contract: ContractData) -> Decimal:
+        """
+        Compute payout value using contract formula
+        
+        Args:
+            coupon: Coupon data
+            contract: Contract data
+            
+        Returns:
+            Calculated payout value
+        """
+        return self._compute(_PAYOUT, coupon, contract)
+    
+    def _compute(self, kind: str, coupon: CouponData, contract: ContractData) -> Decimal:
+        """
+        Compute a trigger or payout value: formula or components, then capping and rounding
+        
+        Args:
+            kind: _TRIGGER or _PAYOUT
+            coupon: Coupon data
+            contract: Contract data
+            
+        Returns:
+            Calculated value
+        """
+        self._debug_enabled = is_debug_enabled()
+        is_trigger = kind == _TRIGGER
+        label = 'Trigger' if is_trigger else 'Payout'
         try:
-            # Check if contract has a specific trigger formula
-            if contract.trigger_formula and self._is_mathematical_formula(contract.trigger_formula):
-                # Use formula parser to evaluate the trigger formula
-                trigger_value = self.formula_parser.evaluate_formula(
-                    contract.trigger_formula, coupon, contract
-                )
-                self.logger.debug(f"Trigger value calculated using formula: {trigger_value}")
-            else:
-                # Fallback to component-based calculation
-                components = contract.trigger_components
-                considered_revenue = self._calculate_considered_revenue(coupon, components)
-                trigger_value = self._apply_trigger_formula(considered_revenue, contract)
-                self.logger.debug(f"Trigger value calculated from components: {trigger_value}")
+            value = self._compute_uncapped(kind, coupon, contract)
             
             # Apply capping if enabled
-            if hasattr(contract, 'trigger_capping') and contract.trigger_capping:
-                trigger_value = self._apply_capping(trigger_value, contract.trigger_capping_value)
+            if contract.trigger_capping if is_trigger else contract.payout_capping:
+                decimals = self._ensure_contract_decimals(contract)
+                cap_decimal = decimals.trigger_capping_value if is_trigger else decimals.payout_capping_value
+                value = self._apply_capping(value, cap_decimal)
             
-            return trigger_value.quantize(Decimal('0.0001'), rounding=ROUND_HALF_UP)
+            return value.quantize(_Q4, rounding=ROUND_HALF_UP)
             
         except Exception as e:
-            self.logger.error(f"Error computing trigger: {str(e)}")
-            raise ComputationError(f"Trigger computation failed: {str(e)}")
+            self.logger.error(f"Error computing {kind}: {str(e)}")
+            raise ComputationError(f"{label} computation failed: {str(e)}")
     
-    def compute_payout(self, coupon: CouponData, contract: ContractData) -> Decimal:
+    def _compute_uncapped(self, kind: str, coupon: CouponData, contract: ContractData) -> Decimal:
         """
-        Compute payout value using contract formula
+        Compute a trigger or payout value from the formula or components, before capping and rounding
         
         Args:
+            kind: _TRIGGER or _PAYOUT
             coupon: Coupon data
             contract: Contract data
             
         Returns:
-            Calculated payout value
+            Unrounded value
+        """
+        is_trigger = kind == _TRIGGER
+        label = 'Trigger' if is_trigger else 'Payout'
+        formula = contract.trigger_formula if is_trigger else contract.payout_formula
+            
+        # Check if contract has a specific formula
+        if formula and self._is_mathematical_formula(formula):
+            # Use formula parser to evaluate the formula
+            value = self._eval_cached(formula, coupon, contract)
+            if self._debug_enabled:
+                self.logger.debug(f"{label} value calculated using formula: {value}")
+        elif is_trigger:
+            # Fallback to component-based calculation
+            considered_revenue = self._calculate_considered_revenue(coupon, contract.trigger_components)
+            value = self._apply_trigger_formula(considered_revenue, contract)
+            if self._debug_enabled:
+                self.logger.debug(f"Trigger value calculated from components: {value}")
+        else:
+            # Fallback to type-based calculation
+            considered_revenue = self._calculate_considered_revenue(coupon, contract.payout_components)
+            
+            if contract.payout_type == "PERCENTAGE":
+                value = self._apply_percentage_payout(considered_revenue, contract)
+            elif contract.payout_type == "AMOUNT":
+                value = self._apply_fixed_payout(considered_revenue, contract)
+            else:
+                value = self._apply_tiered_payout(considered_revenue, contract)
+            
+            if self._debug_enabled:
+                self.logger.debug(f"Payout value calculated from type: {value}")
+        
+        return value
+    
+    def compute_payout_batch(self, coupons: List[CouponData], contract: ContractData) -> np.ndarray:
+        """
+        Compute payout values for many coupons against one contract
+        
+        Revenue components are stacked into a float64 matrix once and the payout
+        type is applied as array operations. Values are rounded half up to 4 places
+        like compute_payout; rows whose float value lies too close to a rounding
+        midpoint, formula contracts and tier tables with overlapping rows are
+        computed per coupon in Decimal. Capping is skipped when no cap value is set.
+        
+        Args:
+            coupons: Coupons to compute payouts for
+            contract: Contract data
+            
+        Returns:
+            float64 array of payout values, one per coupon
         """
         try:
-            # Check if contract has a specific payout formula
-            if contract.payout_formula and self._is_mathematical_formula(contract.payout_formula):
-                # Use formula parser to evaluate the payout formula
-                payout_value = self.formula_parser.evaluate_formula(
-                    contract.payout_formula, coupon, contract
-                )
-                self.logger.debug(f"Payout value calculated using formula: {payout_value}")
+            self._debug_enabled = is_debug_enabled()
+            cap = self._ensure_contract_decimals(contract).payout_capping_value if contract.payout_capping else None
+            
+            use_formula = bool(contract.payout_formula) and self._is_mathematical_formula(contract.payout_formula)
+            tiered = contract.payout_type not in ("PERCENTAGE", "AMOUNT") and bool(contract.tiers)
+            if use_formula or (tiered and not self._get_tier_index(contract.tiers)[2]):
+                return np.array([self._exact_batch_payout(coupon, contract, cap) for coupon in coupons],
+                                dtype=np.float64)
+            
+            count = len(coupons)
+            indices = self._get_component_indices(contract.payout_components)
+            if indices is None:
+                revenue = np.array([coupon.cpn_total_revenue for coupon in coupons], dtype=np.float64)
             else:
-                # Fallback to type-based calculation
-                components = contract.payout_components
-                considered_revenue = self._calculate_considered_revenue(coupon, components)
-                
-                if contract.payout_type == "PERCENTAGE":
-                    payout_value = self._apply_percentage_payout(considered_revenue, contract)
-                elif contract.payout_type == "AMOUNT":
-                    payout_value = self._apply_fixed_payout(considered_revenue, contract)
+                vectors = np.array(
+                    [
+                        (coupon.cpn_revenue_base, coupon.cpn_revenue_yq, coupon.cpn_revenue_yr, coupon.cpn_revenue_xt)
+                        for coupon in coupons
+                    ],
+                    dtype=np.float64
+                ).reshape(count, 4)
+                revenue = vectors[:, list(indices)].sum(axis=1)
+            
+            if contract.payout_type == "PERCENTAGE":
+                payout_percentage = self._ensure_contract_decimals(contract).payout_percentage
+                if not payout_percentage:
+                    self.logger.warning("No payout percentage specified, returning 0")
+                    payouts = np.zeros(count, dtype=np.float64)
                 else:
-                    payout_value = self._apply_tiered_payout(considered_revenue, contract)
-                
-                self.logger.debug(f"Payout value calculated from type: {payout_value}")
+                    payouts = revenue * float(payout_percentage)
+            elif contract.payout_type == "AMOUNT":
+                fixed_amount = self._ensure_contract_decimals(contract).payout_fixed_amount
+                payouts = np.full(count, float(fixed_amount), dtype=np.float64)
+            elif not tiered:
+                self.logger.warning("No tiers specified for tiered payout, returning 0")
+                payouts = np.zeros(count, dtype=np.float64)
+            else:
+                payouts = self._tiered_payout_array(revenue, contract.tiers)
             
             # Apply capping if enabled
-            if hasattr(contract, 'payout_capping') and contract.payout_capping:
-                payout_value = self._apply_capping(payout_value, contract.payout_capping_value)
+            if cap is not None:
+                payouts = np.minimum(payouts, float(cap))
+            
+            # Round half away from zero, as Decimal ROUND_HALF_UP does
+            scaled = np.abs(payouts) * 10000.0
+            result = np.copysign(np.floor(scaled + 0.5), payouts) / 10000.0
+            # Float error can move a value across a midpoint; settle those rows in Decimal
+            near_midpoint = np.abs(scaled - np.floor(scaled) - 0.5) <= 1e-12 * np.maximum(scaled, 1.0)
+            for index in np.flatnonzero(near_midpoint):
+                result[index] = self._exact_batch_payout(coupons[index], contract, cap)
             
-            return payout_value.quantize(Decimal('0.0001'), rounding=ROUND_HALF_UP)
+            return result
             
         except Exception as e:
-            self.logger.error(f"Error computing payout: {str(e)}")
-            raise ComputationError(f"Payout computation failed: {str(e)}")
+            self.logger.error(f"Error computing payout batch: {str(e)}")
+            raise ComputationError(f"Payout batch computation failed: {str(e)}")
+    
+    def _exact_batch_payout(self, coupon: CouponData, contract: ContractData, cap: Optional[Decimal]) -> float:
+        """
+        Compute one coupon's batch payout in Decimal, capped and rounded like compute_payout
+        
+        Args:
+            coupon: Coupon data
+            contract: Contract data
+            cap: Payout cap, or None to leave the value uncapped
+            
+        Returns:
+            Payout value as float
+        """
+        value = self._compute_uncapped(_PAYOUT, coupon, contract)
+        if cap is not None:
+            value = self._apply_capping(value, cap)
+        return float(value.quantize(_Q4, rounding=ROUND_HALF_UP))
+    
+    def _tiered_payout_array(self, revenue: np.ndarray, tiers: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Apply tiered payout to an array of revenues using ordered tier rows
+        
+        Args:
+            revenue: float64 array of considered revenue
+            tiers: List of tier definitions whose rows ascend without overlap
+            
+        Returns:
+            float64 array of tiered payout values
+        """
+        mins, rows, _ = self._get_tier_index(tiers)
+        if not rows:
+            return np.zeros(len(revenue), dtype=np.float64)
+        
+        row_mins = np.array(mins, dtype=np.float64)
+        row_maxs = np.array([tier_row.max_value for tier_row in rows], dtype=np.float64)
+        is_amount = np.array([tier_row.payout_unit == 'AMOUNT' for tier_row in rows])
+        values = np.array([tier_row.payout_value for tier_row in rows], dtype=np.float64)
+        # Empty row dicts never apply, matching the scalar path
+        has_row = np.array([bool(tier_row.row) for tier_row in rows])
+        rates = np.where(has_row & ~is_amount, values / 100.0, 0.0)
+        amounts = np.where(has_row & is_amount, values, 0.0)
+        
+        row_index = np.searchsorted(row_mins, revenue, side='right') - 1
+        # Rows sharing a boundary value both match; the earlier row wins
+        while True:
+            step_back = (row_index > 0) & (revenue <= row_maxs[np.maximum(row_index - 1, 0)])
+            if not step_back.any():
+                break
+            row_index = row_index - step_back
+        
+        safe_index = np.maximum(row_index, 0)
+        matched = (row_index >= 0) & (revenue <= row_maxs[safe_index])
+        payouts = revenue * rates[safe_index] + amounts[safe_index]
+        return np.where(matched, payouts, 0.0)
     
     def _calculate_considered_revenue(self, coupon: CouponData, components: List[str]) -> Decimal:
         """
@@ -128,30 +383,58 @@ class ComputationEngine:
         Returns:
             Sum of considered revenue components
         """
-        considered_revenue = Decimal('0')
+        indices = self._get_component_indices(components)
         
         # Handle NONE components - return 0 for contracts that don't use revenue components
-        if 'NONE' in components:
-            self.logger.debug("NONE component detected - using total revenue as fallback")
+        if indices is None:
             return coupon.cpn_total_revenue
         
-        # Map component names to coupon fields
-        component_mapping = {
-            'BASE': coupon.cpn_revenue_base,
-            'YQ': coupon.cpn_revenue_yq,
-            'YR': coupon.cpn_revenue_yr,
-            'XT': coupon.cpn_revenue_xt
-        }
+        values = (
+            coupon.cpn_revenue_base,
+            coupon.cpn_revenue_yq,
+            coupon.cpn_revenue_yr,
+            coupon.cpn_revenue_xt
+        )
         
-        for component in components:
-            if component in component_mapping:
-                considered_revenue += component_mapping[component]
-                self.logger.debug(f"Added {component}: {component_mapping[component]}")
-            else:
-                self.logger.warning(f"Unknown component: {component}")
+        if not indices:
+            return _ZERO
+        
+        # Start from the first component rather than adding it to zero; most rules use one or two
+        considered_revenue = values[indices[0]]
+        for index in indices[1:]:
+            considered_revenue += values[index]
         
         return considered_revenue
     
+    def _get_component_indices(self, components: List[str]) -> Optional[Tuple[int, ...]]:
+        """
+        Get revenue vector indices for a component list, resolved once per list
+        
+        Args:
+            components: List of revenue components to include
+            
+        Returns:
+            Tuple of indices into the coupon revenue vector, or None for NONE components
+        """
+        cached = self._component_index_cache.get(id(components))
+        if cached is not None and cached[0] is components:
+            return cached[1]
+        
+        if 'NONE' in components:
+            self.logger.debug("NONE component detected - using total revenue as fallback")
+            indices = None
+        else:
+            index_list = []
+            for component in components:
+                if component in _COMPONENT_INDEX:
+                    index_list.append(_COMPONENT_INDEX[component])
+                else:
+                    self.logger.warning(f"Unknown component: {component}")
+            indices = tuple(index_list)
+        
+        self._component_index_cache[id(components)] = (components, indices)
+        return indices
+    
     def _apply_trigger_formula(self, considered_revenue: Decimal, contract: ContractData) -> Decimal:
         """
         Apply trigger formula to considered revenue
@@ -178,14 +461,15 @@ class ComputationEngine:
         Returns:
             Calculated payout value
         """
-        if not contract.payout_percentage:
+        payout_percentage = self._ensure_contract_decimals(contract).payout_percentage
+        if not payout_percentage:
             self.logger.warning("No payout percentage specified, returning 0")
-            return Decimal('0')
+            return _ZERO
         
-        payout_percentage = contract.payout_percentage 
         payout_value = considered_revenue * payout_percentage
         
-        self.logger.debug(f"Percentage payout: {considered_revenue} * {payout_percentage} = {payout_value}")
+        if self._debug_enabled:
+            self.logger.debug(f"Percentage payout: {considered_revenue} * {payout_percentage} = {payout_value}")
         return payout_value
     
     def _apply_fixed_payout(self, considered_revenue: Decimal, contract: ContractData) -> Decimal:
@@ -200,8 +484,9 @@ class ComputationEngine:
             Fixed payout value
         """
         # For fixed payout, return the fixed amount regardless of revenue
-        fixed_amount = getattr(contract, 'payout_fixed_amount', Decimal('0'))
-        self.logger.debug(f"Fixed payout: {fixed_amount}")
+        fixed_amount = self._ensure_contract_decimals(contract).payout_fixed_amount
+        if self._debug_enabled:
+            self.logger.debug(f"Fixed payout: {fixed_amount}")
         return fixed_amount
     
     def _apply_tiered_payout(self, considered_revenue: Decimal, contract: ContractData) -> Decimal:
@@ -217,19 +502,21 @@ class ComputationEngine:
         """
         if not contract.tiers:
             self.logger.warning("No tiers specified for tiered payout, returning 0")
-            return Decimal('0')
+            return _ZERO
         
         # Find the appropriate tier for the revenue amount
-        applicable_tier = self._find_applicable_tier(considered_revenue, contract.tiers)
+        applicable_tier = self._find_tier_row(considered_revenue, contract.tiers)
         
-        if not applicable_tier:
-            self.logger.debug(f"No applicable tier found for revenue: {considered_revenue}")
-            return Decimal('0')
+        if applicable_tier is None or not applicable_tier.row:
+            if self._debug_enabled:
+                self.logger.debug(f"No applicable tier found for revenue: {considered_revenue}")
+            return _ZERO
         
         # Calculate payout based on tier
         payout_value = self._calculate_tier_payout(considered_revenue, applicable_tier)
         
-        self.logger.debug(f"Tiered payout: {considered_revenue} -> tier {applicable_tier} -> {payout_value}")
+        if self._debug_enabled:
+            self.logger.debug(f"Tiered payout: {considered_revenue} -> tier {applicable_tier.row} -> {payout_value}")
         return payout_value
     
     def _find_applicable_tier(self, revenue: Decimal, tiers: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
@@ -243,134 +530,229 @@ class ComputationEngine:
         Returns:
             Applicable tier or None
         """
-        for tier in tiers:
-            rows = tier.get('rows', [])
-            for row in rows:
-                # Handle both old format (target_min/target_max) and new format (target.min/target.max)
-                if 'target' in row and isinstance(row['target'], dict):
-                    # New format
-                    target = row['target']
-                    min_value = self._safe_decimal(target.get('min', 0))
-                    max_raw = target.get('max', float('inf'))
-                    max_value = self._safe_decimal(max_raw) if max_raw != float('inf') else Decimal(str(float('inf')))
-                else:
-                    # Old format
-                    min_value = self._safe_decimal(row.get('target_min', 0))
-                    max_raw = row.get('target_max', float('inf'))
-                    max_value = self._safe_decimal(max_raw) if max_raw != float('inf') else Decimal(str(float('inf')))
-                
-                if min_value <= revenue <= max_value:
-                    return row
-        
-        return None
+        tier_row = self._find_tier_row(revenue, tiers)
+        return tier_row.row if tier_row is not None else None
     
-    def _calculate_tier_payout(self, revenue: Decimal, tier: Dict[str, Any]) -> Decimal:
+    def _find_tier_row(self, revenue: Decimal, tiers: List[Dict[str, Any]]) -> Optional[TierRow]:
         """
-        Calculate payout for a specific tier
+        Find the first tier row (in contract order) whose target range contains the revenue
         
         Args:
             revenue: Revenue amount
-            tier: Tier definition
+            tiers: List of tier definitions
             
         Returns:
-            Calculated payout value
+            Normalized tier row or None
+        """
+        mins, rows, ordered = self._get_tier_index(tiers)
+        
+        if not ordered:
+            # Overlapping or unordered rows: keep the first-match scan
+            for tier_row in rows:
+                if tier_row.min_value <= revenue <= tier_row.max_value:
+                    return tier_row
+            return None
+        
+        i = bisect.bisect_right(mins, revenue) - 1
+        if i < 0 or revenue > rows[i].max_value:
+            return None
+        
+        # Rows sharing a boundary value both match; the earlier row wins
+        while i > 0 and revenue <= rows[i - 1].max_value:
+            i -= 1
+        return rows[i]
+    
+    def _get_tier_index(self, tiers: List[Dict[str, Any]]) -> Tuple[List[Decimal], List[TierRow], bool]:
+        """
+        Get normalized tier rows for a tier list, built once per list
+        
+        Args:
+            tiers: List of tier definitions
+            
+        Returns:
+            Tuple of (row minimums, normalized rows, ordered) where ordered means the
+            rows ascend without overlap (boundaries may touch) so bisect can be used
         """
+        cached = self._tier_index_cache.get(id(tiers))
+        if cached is not None and cached[0] is tiers:
+            return cached[1], cached[2], cached[3]
+        
+        rows = [tier_row for tier_rows in self._normalize_tiers(tiers) for tier_row in tier_rows]
+        mins = [tier_row.min_value for tier_row in rows]
+        ordered = all(tier_row.min_value <= tier_row.max_value for tier_row in rows) and all(
+            rows[i].max_value <= rows[i + 1].min_value for i in range(len(rows) - 1)
+        )
+        
+        self._tier_index_cache[id(tiers)] = (tiers, mins, rows, ordered)
+        return mins, rows, ordered
+    
+    def _normalize_tiers(self, tiers: List[Dict[str, Any]]) -> List[List[TierRow]]:
+        """
+        Get normalized rows for each tier table, parsed once per tier list
+        
+        Args:
+            tiers: List of tier definitions
+            
+        Returns:
+            List of normalized rows per tier table
+        """
+        cached = self._normalized_tiers_cache.get(id(tiers))
+        if cached is not None and cached[0] is tiers:
+            return cached[1]
+        
+        normalized = [
+            [self._normalize_tier_row(row) for row in tier.get('rows', [])]
+            for tier in tiers
+        ]
+        
+        self._normalized_tiers_cache[id(tiers)] = (tiers, normalized)
+        return normalized
+    
+    def _normalize_tier_row(self, row: Dict[str, Any]) -> TierRow:
+        """
+        Parse a tier row from either the old or the new format
+        
+        Args:
+            row: Tier row definition
+            
+        Returns:
+            Normalized tier row
+        """
+        # Handle both old format (target_min/target_max) and new format (target.min/target.max)
+        if 'target' in row and isinstance(row['target'], dict):
+            # New format
+            target = row['target']
+            min_value = self._safe_decimal(target.get('min', 0))
+            max_raw = target.get('max')
+        else:
+            # Old format
+            min_value = self._safe_decimal(row.get('target_min', 0))
+            max_raw = row.get('target_max')
+        # A missing (or null) maximum leaves the row open-ended
+        max_value = _INF if max_raw is None else self._safe_decimal(max_raw)
+        
         # Handle both old format (payout_value/payout_unit) and new format (payout.value/payout.unit)
-        if 'payout' in tier and isinstance(tier['payout'], dict):
+        if 'payout' in row and isinstance(row['payout'], dict):
             # New format
-            payout = tier['payout']
+            payout = row['payout']
             payout_value = self._safe_decimal(payout.get('value', 0))
             payout_unit = payout.get('unit', 'PERCENT')
         else:
             # Old format
-            payout_value = self._safe_decimal(tier.get('payout_value', 0))
-            payout_unit = tier.get('payout_unit', 'PERCENT')
-        
-        if payout_unit == 'PERCENT':
-            # Apply percentage to revenue (convert percentage to decimal)
-            percentage = payout_value / Decimal('100')
-            return revenue * percentage
-        elif payout_unit == 'AMOUNT':
-            # Fixed amount per tier
-            return payout_value
-        else:
-            # Default to percentage
-            percentage = payout_value / Decimal('100')
-            return revenue * percentage
+            payout_value = self._safe_decimal(row.get('payout_value', 0))
+            payout_unit = row.get('payout_unit', 'PERCENT')
+        
+        ratio = None if payout_unit == 'AMOUNT' else payout_value / _HUNDRED
+        return TierRow(min_value, max_value, payout_value, payout_unit, row, ratio)
+    
+    def _calculate_tier_payout(self, revenue: Decimal, tier: Union[TierRow, Dict[str, Any]]) -> Decimal:
+        """
+        Calculate payout for a specific tier
+        
+        Args:
+            revenue: Revenue amount
+            tier: Normalized tier row or tier definition
+            
+        Returns:
+            Calculated payout value
+        """
+        if not isinstance(tier, TierRow):
+            tier = self._normalize_tier_row(tier)
+        
+        # Percentage units (and unknown units, which default to percentage) carry a precomputed ratio
+        if tier.ratio is not None:
+            return revenue * tier.ratio
+        
+        # Fixed amount per tier
+        return tier.payout_value
+    
+    def _ensure_contract_decimals(self, contract: ContractData) -> ContractDecimals:
+        """
+        Get a contract's payout and capping amounts as Decimals, converted once
+        
+        The conversion is redone only when one of the raw contract values changes.
+        
+        Args:
+            contract: Contract data
+            
+        Returns:
+            ContractDecimals for the contract (None where the raw value is None)
+        """
+        raw = (
+            contract.payout_percentage,
+            getattr(contract, 'payout_fixed_amount', _ZERO),
+            contract.trigger_capping_value,
+            contract.payout_capping_value
+        )
+        cached = self._contract_decimals_cache.get(id(contract))
+        if cached is not None and cached[0] is contract and cached[1] == raw:
+            return cached[2]
+        
+        payout_percentage, fixed_amount, trigger_cap, payout_cap = raw
+        decimals = ContractDecimals(
+            payout_percentage=None if payout_percentage is None else self._safe_decimal(payout_percentage),
+            payout_fixed_amount=None if fixed_amount is None else self._safe_decimal(fixed_amount),
+            trigger_capping_value=None if trigger_cap is None else Decimal(str(trigger_cap)),
+            payout_capping_value=None if payout_cap is None else Decimal(str(payout_cap))
+        )
+        
+        self._contract_decimals_cache[id(contract)] = (contract, raw, decimals)
+        return decimals
     
-    def _apply_capping(self, value: Decimal, cap_value: Union[Decimal, float, int]) -> Decimal:
+    def _apply_capping(self, value: Decimal, cap_decimal: Decimal) -> Decimal:
         """
         Apply capping to a value
         
         Args:
             value: Value to cap
-            cap_value: Maximum allowed value
+            cap_decimal: Maximum allowed value
             
         Returns:
             Capped value
         """
-        cap_decimal = Decimal(str(cap_value))
-        
         if value > cap_decimal:
-            self.logger.debug(f"Value {value} capped to {cap_decimal}")
+            if self._debug_enabled:
+                self.logger.debug(f"Value {value} capped to {cap_decimal}")
             return cap_decimal
         
         return value
     
-    def compute_tier_progression(self, revenue: Decimal, tiers: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def compute_tier_progression(self, revenue: Decimal, tiers: List[Dict[str, Any]],
+                                 as_float: bool = True) -> Dict[str, Any]:
         """
         Compute tier progression analysis for a given revenue amount
         
         Args:
             revenue: Revenue amount
             tiers: List of tier definitions
+            as_float: Convert amounts to floats in the result; False keeps Decimals
             
         Returns:
             Tier progression analysis
         """
         try:
             analysis = {
-                'current_revenue': float(revenue),
+                'current_revenue': revenue,
                 'current_tier': None,
                 'next_tier': None,
                 'tier_progression': [],
                 'payout_breakdown': []
             }
             
-            for tier in tiers:
-                rows = tier.get('rows', [])
-                for i, row in enumerate(rows):
-                    # Handle both old format and new format
-                    if 'target' in row and isinstance(row['target'], dict):
-                        # New format
-                        target = row['target']
-                        min_value = self._safe_decimal(target.get('min', 0))
-                        max_raw = target.get('max', float('inf'))
-                        max_value = self._safe_decimal(max_raw) if max_raw != float('inf') else Decimal(str(float('inf')))
-                    else:
-                        # Old format
-                        min_value = self._safe_decimal(row.get('target_min', 0))
-                        max_raw = row.get('target_max', float('inf'))
-                        max_value = self._safe_decimal(max_raw) if max_raw != float('inf') else Decimal(str(float('inf')))
-                    
-                    if 'payout' in row and isinstance(row['payout'], dict):
-                        # New format
-                        payout = row['payout']
-                        payout_value = self._safe_decimal(payout.get('value', 0))
-                        payout_unit = payout.get('unit', 'PERCENT')
-                    else:
-                        # Old format
-                        payout_value = self._safe_decimal(row.get('payout_value', 0))
-                        payout_unit = row.get('payout_unit', 'PERCENT')
+            for rows in self._normalize_tiers(tiers):
+                # Maximum of the previous row in this tier table
+                prev_max = _INF
+                for i, tier_row in enumerate(rows):
+                    min_value, max_value, payout_value, payout_unit = tier_row[:4]
                     
                     tier_info = {
                         'tier_index': i,
-                        'min_revenue': float(min_value),
-                        'max_revenue': float(max_value) if max_value != float('inf') else None,
-                        'payout_value': float(payout_value),
+                        'min_revenue': min_value,
+                        'max_revenue': max_value if max_value != _INF else None,
+                        'payout_value': payout_value,
                         'payout_unit': payout_unit,
                         'is_current': min_value <= revenue <= max_value,
-                        'is_next': revenue < min_value and (i == 0 or Decimal(str(rows[i-1].get('target_max', 0))) < revenue)
+                        'is_next': revenue < min_value and (i == 0 or prev_max < revenue)
                     }
                     
                     analysis['tier_progression'].append(tier_info)
@@ -380,19 +762,32 @@ class ComputationEngine:
                         
                         # Calculate payout for current tier
                         if payout_unit == 'PERCENT':
-                            payout_amount = revenue * (payout_value / Decimal('100'))
+                            payout_amount = revenue * tier_row.ratio
                         else:
                             payout_amount = payout_value
                         
                         analysis['payout_breakdown'].append({
                             'tier': i,
-                            'revenue_used': float(revenue),
-                            'payout_rate': float(payout_value),
-                            'payout_amount': float(payout_amount)
+                            'revenue_used': revenue,
+                            'payout_rate': payout_value,
+                            'payout_amount': payout_amount
                         })
                     
                     if tier_info['is_next']:
                         analysis['next_tier'] = tier_info
+                    
+                    prev_max = max_value
+            
+            if as_float:
+                # Convert once at the end; tier_info dicts are shared with current/next tier
+                analysis['current_revenue'] = float(revenue)
+                for tier_info in analysis['tier_progression']:
+                    for key in ('min_revenue', 'max_revenue', 'payout_value'):
+                        if tier_info[key] is not None:
+                            tier_info[key] = float(tier_info[key])
+                for breakdown in analysis['payout_breakdown']:
+                    for key in ('revenue_used', 'payout_rate', 'payout_amount'):
+                        breakdown[key] = float(breakdown[key])
             
             return analysis
             
@@ -404,6 +799,41 @@ class ComputationEngine:
         """
         Validate computation parameters for a contract
         
+        Args:
+            contract: Contract data to validate
+            
+        Returns:
+            Validation results
+        """
+        # Validation only reads these fields; reuse the result while they are unchanged
+        fingerprint = (
+            id(contract.trigger_components),
+            bool(contract.trigger_components),
+            id(contract.payout_components),
+            bool(contract.payout_components),
+            contract.payout_type,
+            contract.payout_percentage,
+            id(contract.tiers),
+            len(contract.tiers) if contract.tiers else 0
+        )
+        cached = self._validation_cache.get(id(contract))
+        if cached is not None and cached[0] is contract and cached[1] == fingerprint:
+            validation_results = cached[2]
+        else:
+            validation_results = self._validate_computation_parameters(contract)
+            self._validation_cache[id(contract)] = (contract, fingerprint, validation_results)
+        
+        # Callers get their own lists so the cached result stays intact
+        return {
+            'valid': validation_results['valid'],
+            'warnings': list(validation_results['warnings']),
+            'errors': list(validation_results['errors'])
+        }
+    
+    def _validate_computation_parameters(self, contract: ContractData) -> Dict[str, Any]:
+        """
+        Validate computation parameters for a contract (uncached)
+        
         Args:
             contract: Contract data to validate
             
@@ -469,11 +899,9 @@ class ComputationEngine:
             Calculated result
         """
         try:
-            result = self.formula_parser.evaluate_formula(
-                formula, coupon, contract, additional_params
-            )
-            self.logger.debug(f"Formula '{formula}' computed: {result}")
-            return result.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            result = self._eval_cached(formula, coupon, contract, additional_params)
+            self.logger.debug("Formula '{}' computed: {}", formula, result)
+            return result.quantize(_Q2, rounding=ROUND_HALF_UP)
             
         except Exception as e:
             self.logger.error(f"Error computing formula '{formula}': {str(e)}")
@@ -500,14 +928,46 @@ class ComputationEngine:
             results = {}
             for formula_name, formula_string in formulas.items():
                 try:
-                    result = self.formula_parser.evaluate_formula(
-                        formula_string, coupon, contract
-                    )
+                    result = self._eval_cached(formula_string, coupon, contract)
                     results[formula_name] = result
-                    self.logger.debug(f"Formula '{formula_name}': {result}")
+                    self.logger.debug("Formula '{}': {}", formula_name, result)
                 except Exception as e:
                     self.logger.warning(f"Failed to compute formula '{formula_name}': {str(e)}")
-                    results[formula_name] = Decimal('0')
+                    results[formula_name] = _ZERO
+            
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Error extracting and computing formulas: {str(e)}")
+            return {}
+    
+    def extract_and_compute_formulas_batch(self, rule_data: Dict[str, Any], coupons: List[CouponData],
+                                           contract: ContractData) -> Dict[str, np.ndarray]:
+        """
+        Extract all formulas from rule data once and compute them for many coupons
+        
+        Args:
+            rule_data: Rule JSON data
+            coupons: Coupons to evaluate the formulas for
+            contract: Contract data
+            
+        Returns:
+            Dictionary of formula names and float64 arrays of their values, one per coupon
+        """
+        try:
+            # Extract formulas from rule
+            formulas = self.formula_parser.extract_formulas_from_rule(rule_data)
+            
+            # Compute each formula across all coupons; compiled forms are shared via _formula_cache
+            results = {}
+            for formula_name, formula_string in formulas.items():
+                values = np.zeros(len(coupons), dtype=np.float64)
+                for i, coupon in enumerate(coupons):
+                    try:
+                        values[i] = float(self._eval_cached(formula_string, coupon, contract))
+                    except Exception as e:
+                        self.logger.warning(f"Failed to compute formula '{formula_name}': {str(e)}")
+                results[formula_name] = values
             
             return results
             
@@ -530,7 +990,9 @@ class ComputationEngine:
         """
         return self.formula_parser.validate_formula(formula, coupon, contract)
     
-    def _is_mathematical_formula(self, formula: str) -> bool:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _is_mathematical_formula(formula: str) -> bool:
         """
         Check if a formula string is a mathematical expression
         
@@ -544,20 +1006,15 @@ class ComputationEngine:
             return False
         
         # Check for mathematical operators
-        math_operators = ['=', '+', '-', '*', '/', '(', ')', '^', '**']
-        has_operators = any(op in formula for op in math_operators)
+        if _MATH_CHARS.isdisjoint(formula):
+            return False
         
         # Check for parameter references (BASE, YQ, etc.)
-        parameter_pattern = r'\b(BASE|YQ|YR|XT|TOTAL|slab_percent|tier_percent)\b'
-        has_parameters = bool(re.search(parameter_pattern, formula))
-        
-        # Check if it's just descriptive text (contains common descriptive words)
-        descriptive_words = ['excluding', 'including', 'revenue', 'flown', 'commissions', 'refunds', 'taxes', 
-                            'nrf', 'ticketed', 'operated', 'on', 'program', 'incentive']
-        is_descriptive = any(word in formula.lower() for word in descriptive_words)
+        if not _PARAM_RE.search(formula):
+            return False
         
-        # It's a mathematical formula if it has operators and parameters, and is not just descriptive
-        return has_operators and has_parameters and not is_descriptive
+        # It's a mathematical formula unless it is just descriptive text
+        return _DESCRIPTIVE_RE.search(formula) is None
     
     def _validate_tier_progression(self, tiers: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -594,7 +1051,7 @@ class ComputationEngine:
                 current_max = Decimal(str(rows[i].get('target_max', 0)))
                 next_min = Decimal(str(rows[i + 1].get('target_min', 0)))
                 
-                if current_max + Decimal('0.01') < next_min:
+                if current_max + _Q2 < next_min:
                     validation_results['warnings'].append(f"Gap in tiers: tier {i} max {current_max} < tier {i+1} min {next_min}")
         
         return validation_results
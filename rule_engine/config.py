@@ -3,51 +3,150 @@ Configuration management for the Rule Engine
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
-from pydantic import BaseModel, Field
-import json
+from dataclasses import dataclass, field, fields, asdict
 
+from .json_utils import read_json, write_json
 
-class RuleEngineConfig(BaseModel):
+
+def _to_bool(value: Any) -> bool:
+    """Coerce a JSON or environment value to bool"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE_STRINGS:
+            return True
+        if lowered in _FALSE_STRINGS:
+            return False
+        raise ValueError(f"not a boolean: {value!r}")
+    if value in (0, 1):
+        return bool(value)
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def _to_int(value: Any) -> int:
+    """Coerce a JSON or environment value to int, rejecting fractional numbers"""
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            value = float(value)
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"not an integer: {value!r}")
+        return int(value)
+    return int(value)
+
+
+def _to_str(value: Any) -> str:
+    """Accept only string values for string settings"""
+    if not isinstance(value, str):
+        raise ValueError(f"not a string: {value!r}")
+    return value
+
+
+def _identity(value: Any) -> Any:
+    """Leave a value of an uncoerced field type unchanged"""
+    return value
+
+
+# String spellings accepted for boolean settings
+_TRUE_STRINGS = frozenset({'1', 'true', 't', 'yes', 'y', 'on'})
+_FALSE_STRINGS = frozenset({'0', 'false', 'f', 'no', 'n', 'off'})
+
+# Coercion applied per declared field type when building RuleEngineConfig
+_FIELD_COERCERS = {bool: _to_bool, int: _to_int, str: _to_str}
+
+
+@dataclass
+class RuleEngineConfig:
     """Configuration model for the Rule Engine"""
     
     # Core settings
-    contracts_dir: str = Field(default="contracts", description="Directory containing contract JSON files")
-    log_level: str = Field(default="INFO", description="Logging level")
-    log_file: str = Field(default="rule_engine.log", description="Log file path")
-    log_rotation: str = Field(default="10 MB", description="Log rotation size")
-    log_retention: str = Field(default="30 days", description="Log retention period")
+    contracts_dir: str = field(default="contracts", metadata={"description": "Directory containing contract JSON files"})
+    log_level: str = field(default="INFO", metadata={"description": "Logging level"})
+    log_file: str = field(default="rule_engine.log", metadata={"description": "Log file path"})
+    log_rotation: str = field(default="10 MB", metadata={"description": "Log rotation size"})
+    log_retention: str = field(default="30 days", metadata={"description": "Log retention period"})
     
     # Processing settings
-    max_contracts_per_coupon: int = Field(default=100, description="Maximum contracts to process per coupon")
-    processing_timeout: int = Field(default=300, description="Processing timeout in seconds")
-    enable_caching: bool = Field(default=True, description="Enable contract caching")
-    cache_ttl: int = Field(default=3600, description="Cache TTL in seconds")
+    max_contracts_per_coupon: int = field(default=100, metadata={"description": "Maximum contracts to process per coupon"})
+    processing_timeout: int = field(default=300, metadata={"description": "Processing timeout in seconds"})
+    enable_caching: bool = field(default=True, metadata={"description": "Enable contract caching"})
+    cache_ttl: int = field(default=3600, metadata={"description": "Cache TTL in seconds"})
     
     # Validation settings
-    strict_validation: bool = Field(default=True, description="Enable strict validation")
-    validate_contracts_on_load: bool = Field(default=True, description="Validate contracts on load")
-    allow_invalid_contracts: bool = Field(default=False, description="Allow processing with invalid contracts")
+    strict_validation: bool = field(default=True, metadata={"description": "Enable strict validation"})
+    validate_contracts_on_load: bool = field(default=True, metadata={"description": "Validate contracts on load"})
+    allow_invalid_contracts: bool = field(default=False, metadata={"description": "Allow processing with invalid contracts"})
     
     # Output settings
-    output_precision: int = Field(default=2, description="Decimal precision for output values")
-    include_metadata: bool = Field(default=True, description="Include metadata in output")
-    include_debug_info: bool = Field(default=False, description="Include debug information in output")
+    output_precision: int = field(default=2, metadata={"description": "Decimal precision for output values"})
+    include_metadata: bool = field(default=True, metadata={"description": "Include metadata in output"})
+    include_debug_info: bool = field(default=False, metadata={"description": "Include debug information in output"})
     
     # Performance settings
-    parallel_processing: bool = Field(default=False, description="Enable parallel processing")
-    max_workers: int = Field(default=4, description="Maximum number of worker processes")
-    memory_limit: int = Field(default=1024, description="Memory limit in MB")
+    parallel_processing: bool = field(default=False, metadata={"description": "Enable parallel processing"})
+    max_workers: int = field(default=4, metadata={"description": "Maximum number of worker processes"})
+    memory_limit: int = field(default=1024, metadata={"description": "Memory limit in MB"})
     
     # API settings (for future use)
-    api_host: str = Field(default="localhost", description="API host")
-    api_port: int = Field(default=8000, description="API port")
-    api_debug: bool = Field(default=False, description="API debug mode")
+    api_host: str = field(default="localhost", metadata={"description": "API host"})
+    api_port: int = field(default=8000, metadata={"description": "API port"})
+    api_debug: bool = field(default=False, metadata={"description": "API debug mode"})
     
-    class Config:
-        env_prefix = "RULE_ENGINE_"
-        case_sensitive = False
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RuleEngineConfig":
+        """
+        Build a configuration from parsed JSON or environment values
+        
+        Known fields are coerced to their declared type; unknown keys are ignored.
+        
+        Args:
+            data: Mapping of field name to raw value
+            
+        Returns:
+            RuleEngineConfig instance
+            
+        Raises:
+            ValueError: If a value cannot be coerced to its field type
+        """
+        values = {}
+        for config_field in fields(cls):
+            if config_field.name in data:
+                coerce = _FIELD_COERCERS.get(config_field.type, _identity)
+                try:
+                    values[config_field.name] = coerce(data[config_field.name])
+                except (TypeError, ValueError) as e:
+                    raise ValueError(f"Invalid value for {config_field.name}: {data[config_field.name]!r}") from e
+        return cls(**values)
+    
+    def dict(self) -> Dict[str, Any]:
+        """Return the configuration as a plain dictionary"""
+        return asdict(self)
+
+
+# (field name, environment variable) for every config field, built once at import
+_ENV_MAP = tuple(
+    (field_name, f"RULE_ENGINE_{field_name.upper()}")
+    for field_name in (config_field.name for config_field in fields(RuleEngineConfig))
+)
+
+
+# Accepted log levels
+_VALID_LOG_LEVELS = frozenset({'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'})
+
+# (field name, check, error message) for numeric settings, in reporting order
+_NUMERIC_VALIDATORS = (
+    ('max_contracts_per_coupon', lambda value: value > 0, "max_contracts_per_coupon must be positive"),
+    ('processing_timeout', lambda value: value > 0, "processing_timeout must be positive"),
+    ('max_workers', lambda value: value > 0, "max_workers must be positive"),
+    ('output_precision', lambda value: value >= 0, "output_precision must be non-negative"),
+    ('api_port', lambda value: 1 <= value <= 65535, "api_port must be between 1 and 65535"),
+)
 
 
 class ConfigManager:
@@ -62,24 +161,52 @@ class ConfigManager:
         """
         self.config_file = config_file or "rule_engine_config.json"
         self._config = None
+        # Environment overrides, read once until refreshed
+        self._env_config = None
+        # (st_mtime_ns, st_size, st_ino) of the config file last loaded, None if none was read
+        self._config_sig = None
         self._load_config()
     
-    def _load_config(self) -> None:
-        """Load configuration from file or environment"""
+    def _load_config(self, force: bool = False) -> None:
+        """Load configuration from file or environment, skipping an unchanged file"""
         try:
             # Try to load from file first
-            if Path(self.config_file).exists():
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
-                self._config = RuleEngineConfig(**config_data)
+            config_path = Path(self.config_file)
+            try:
+                stat = config_path.stat()
+                signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            except OSError:
+                signature = None
+            
+            if not force and self._config is not None and signature is not None and signature == self._config_sig:
+                return
+            
+            if signature is not None:
+                config_data = read_json(config_path)
+                self._config = RuleEngineConfig.from_dict(config_data)
             else:
                 # Load from environment variables
                 self._config = RuleEngineConfig()
+            self._config_sig = signature
                 
         except Exception as e:
             print(f"Warning: Failed to load configuration: {e}")
             # Fallback to default configuration
             self._config = RuleEngineConfig()
+            self._config_sig = None
+    
+    def reload(self, force: bool = False) -> RuleEngineConfig:
+        """
+        Reload configuration from file
+        
+        Args:
+            force: Re-read the file even if it has not changed since the last load
+            
+        Returns:
+            Current configuration
+        """
+        self._load_config(force=force)
+        return self._config
     
     def get_config(self) -> RuleEngineConfig:
         """Get current configuration"""
@@ -95,8 +222,7 @@ class ConfigManager:
     def save_config(self) -> None:
         """Save current configuration to file"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self._config.dict(), f, indent=2)
+            write_json(Path(self.config_file), self._config.dict())
         except Exception as e:
             print(f"Warning: Failed to save configuration: {e}")
     
@@ -119,32 +245,15 @@ class ConfigManager:
                 validation_results['warnings'].append(f"Contracts directory does not exist: {contracts_dir}")
             
             # Check log level
-            valid_log_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
-            if self._config.log_level.upper() not in valid_log_levels:
+            if self._config.log_level.upper() not in _VALID_LOG_LEVELS:
                 validation_results['errors'].append(f"Invalid log level: {self._config.log_level}")
                 validation_results['valid'] = False
             
-            # Check numeric values
-            if self._config.max_contracts_per_coupon <= 0:
-                validation_results['errors'].append("max_contracts_per_coupon must be positive")
-                validation_results['valid'] = False
-            
-            if self._config.processing_timeout <= 0:
-                validation_results['errors'].append("processing_timeout must be positive")
-                validation_results['valid'] = False
-            
-            if self._config.max_workers <= 0:
-                validation_results['errors'].append("max_workers must be positive")
-                validation_results['valid'] = False
-            
-            if self._config.output_precision < 0:
-                validation_results['errors'].append("output_precision must be non-negative")
-                validation_results['valid'] = False
-            
-            # Check API settings
-            if not (1 <= self._config.api_port <= 65535):
-                validation_results['errors'].append("api_port must be between 1 and 65535")
-                validation_results['valid'] = False
+            # Check numeric values and API settings
+            for field_name, is_valid, message in _NUMERIC_VALIDATORS:
+                if not is_valid(getattr(self._config, field_name)):
+                    validation_results['errors'].append(message)
+                    validation_results['valid'] = False
             
         except Exception as e:
             validation_results['errors'].append(f"Configuration validation error: {str(e)}")
@@ -152,43 +261,56 @@ class ConfigManager:
         
         return validation_results
     
-    def get_environment_config(self) -> Dict[str, str]:
-        """Get configuration from environment variables"""
-        env_config = {}
+    def get_environment_config(self, refresh: bool = False) -> Dict[str, str]:
+        """
+        Get configuration from environment variables
         
-        for field_name, field_info in RuleEngineConfig.__fields__.items():
-            env_var_name = f"RULE_ENGINE_{field_name.upper()}"
-            env_value = os.getenv(env_var_name)
-            
-            if env_value is not None:
-                env_config[field_name] = env_value
+        The environment is read once and the result reused; pass refresh=True
+        to pick up variables changed since the last read.
+        """
+        if self._env_config is None or refresh:
+            # One snapshot of the environment instead of a getenv per field
+            environ = dict(os.environ)
+            self._env_config = {
+                field_name: environ[env_var_name]
+                for field_name, env_var_name in _ENV_MAP
+                if env_var_name in environ
+            }
         
-        return env_config
+        return dict(self._env_config)
     
     def create_sample_config(self, output_file: str = "rule_engine_config_sample.json") -> None:
         """Create a sample configuration file"""
         sample_config = RuleEngineConfig()
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(sample_config.dict(), f, indent=2)
+        write_json(Path(output_file), sample_config.dict())
         
         print(f"Sample configuration created: {output_file}")
 
 
-# Global configuration instance
-config_manager = ConfigManager()
+@lru_cache(maxsize=None)
+def get_config_manager() -> ConfigManager:
+    """Get the global configuration manager, created on first use"""
+    return ConfigManager()
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve the global `config_manager` lazily so importing this module does no I/O"""
+    if name == "config_manager":
+        return get_config_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_config() -> RuleEngineConfig:
     """Get the global configuration instance"""
-    return config_manager.get_config()
+    return get_config_manager().get_config()
 
 
 def update_config(**kwargs) -> None:
     """Update the global configuration"""
-    config_manager.update_config(**kwargs)
+    get_config_manager().update_config(**kwargs)
 
 
 def save_config() -> None:
     """Save the global configuration"""
-    config_manager.save_config()
+    get_config_manager().save_config()
@@ -2,16 +2,46 @@
 Contract loading and discovery functionality
 """
 
-import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
+from functools import lru_cache
 from decimal import Decimal
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, FrozenSet, Iterator, Callable
 from loguru import logger
 
 from .models import ContractData
 from .exceptions import ContractError
+from .config import get_config
+from .json_utils import read_json
+
+
+# Trigger IN criteria that restrict which airlines a contract applies to
+_AIRLINE_FILTER_KEYS = ('Marketing Airline', 'Operating Airline', 'Ticketing Airline')
+
+# Formats tried by the contract and rule loaders' _parse_date after the ISO fast path
+_DATE_FORMATS = ('%Y-%m-%d', '%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%S.%f%z')
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_string(date_str: str) -> Optional[date]:
+    """Parse a contract date string; None if no supported format matches"""
+    # Plain YYYY-MM-DD goes through the C parser without the strptime loop
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        try:
+            return date.fromisoformat(date_str)
+        except ValueError:
+            pass
+    
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except ValueError:
+            continue
+    
+    return None
 
 
 class ContractLoader:
@@ -27,8 +57,24 @@ class ContractLoader:
             contracts_dir: Directory containing contract JSON files
         """
         self.contracts_dir = Path(contracts_dir)
+        # path -> ((st_mtime_ns, st_size, st_ino), ContractData or None); files are re-read only when changed
         self._contracts_cache = {}
+        self._cache_lock = threading.Lock()
         self._last_scan = None
+        # Lookup indexes over the loaded contracts, rebuilt when any file is (re)loaded or removed
+        self._cache_version = 0
+        self._index_version = -1
+        self._by_id: Dict[str, ContractData] = {}
+        self._by_airline: Dict[str, List[ContractData]] = {}
+        # Per-contract summary fields derived once per index build, aligned with the contract list
+        self._airline_keys: List[str] = []
+        self._start_iso: List[str] = []
+        self._end_iso: List[str] = []
+        # Contract summary and the cache version it was built from
+        self._summary = None
+        self._summary_version = -1
+        # Airline filter sets keyed by id() of contract
+        self._airline_filters: Dict[int, Tuple[ContractData, Tuple[FrozenSet[str], ...]]] = {}
         
         if not self.contracts_dir.exists():
             logger.warning(f"Contracts directory {self.contracts_dir} does not exist")
@@ -41,22 +87,64 @@ class ContractLoader:
         Returns:
             List of ContractData objects
         """
-        contracts = []
-        
         try:
-            # Scan for JSON files
-            json_files = list(self.contracts_dir.glob("*.json"))
-            logger.info(f"Found {len(json_files)} contract files")
+            # Scan for JSON files; directory entries carry their file type and a cached stat
+            with os.scandir(self.contracts_dir) as entries:
+                json_entries = [entry for entry in entries if entry.name.endswith('.json') and entry.is_file()]
+            logger.info(f"Found {len(json_entries)} contract files")
             
-            for json_file in json_files:
-                try:
-                    contract = self._load_contract_file(json_file)
-                    if contract:
-                        contracts.append(contract)
-                        logger.debug(f"Loaded contract: {contract.contract_name}")
-                except Exception as e:
-                    logger.error(f"Failed to load contract from {json_file}: {str(e)}")
-                    continue
+            # One clock read per scan, shared by every file parsed in it
+            now = datetime.now()
+            
+            with self._cache_lock:
+                signatures = {}
+                for entry in json_entries:
+                    try:
+                        stat = entry.stat()
+                        signatures[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+                    except Exception as e:
+                        logger.error(f"Failed to load contract from {entry.path}: {str(e)}")
+                        continue
+                
+                # Only new or changed files are read and parsed
+                pending = [
+                    json_file for json_file, signature in signatures.items()
+                    if self._contracts_cache.get(json_file, (None,))[0] != signature
+                ]
+                if pending:
+                    loaded = self._load_contract_files(pending, now)
+                    for json_file, contract in zip(pending, loaded):
+                        self._contracts_cache[json_file] = (signatures[json_file], contract)
+                        self._cache_version += 1
+                        if contract:
+                            logger.debug(f"Loaded contract: {contract.contract_name}")
+                
+                contracts = [
+                    self._contracts_cache[json_file][1] for json_file in signatures
+                    if self._contracts_cache[json_file][1]
+                ]
+                
+                # Drop files that no longer exist
+                for stale_path in set(self._contracts_cache) - set(signatures):
+                    del self._contracts_cache[stale_path]
+                    self._cache_version += 1
+                
+                if self._index_version != self._cache_version:
+                    self._by_id = {}
+                    for contract in contracts:
+                        self._by_id.setdefault(contract.contract_id, contract)
+                    # Filled per airline (and per contract) on first lookup
+                    self._by_airline = {}
+                    self._airline_filters = {}
+                    self._airline_keys = [
+                        contract.document_name.split('_')[0] if '_' in contract.document_name else 'Unknown'
+                        for contract in contracts
+                    ]
+                    self._start_iso = [contract.start_date.isoformat() for contract in contracts]
+                    self._end_iso = [contract.end_date.isoformat() for contract in contracts]
+                    self._index_version = self._cache_version
+                
+                self._last_scan = datetime.now()
             
             logger.info(f"Successfully loaded {len(contracts)} contracts")
             return contracts
@@ -65,6 +153,51 @@ class ContractLoader:
             logger.error(f"Error loading contracts: {str(e)}")
             raise ContractError(f"Failed to load contracts: {str(e)}")
     
+    def _load_contract_files(self, json_files: List[Path], now: datetime) -> List[Optional[ContractData]]:
+        """
+        Load several contract files, on a thread pool when parallel processing is enabled
+        
+        Args:
+            json_files: Paths to JSON files
+            now: Load timestamp used for generated IDs and dates
+            
+        Returns:
+            ContractData (or None on failure) per file, in input order
+        """
+        if len(json_files) > 1:
+            self._prefetch_files(json_files)
+        
+        config = get_config()
+        if config.parallel_processing and len(json_files) > 1:
+            # File reads and C-level JSON parsing release the GIL
+            with ThreadPoolExecutor(max_workers=config.max_workers) as executor:
+                return list(executor.map(lambda json_file: self._load_contract_file(json_file, now=now), json_files))
+        
+        return [self._load_contract_file(json_file, now=now) for json_file in json_files]
+    
+    def _prefetch_files(self, file_paths: List[Path]) -> None:
+        """
+        Ask the kernel to start reading all files before they are parsed one by one
+        
+        On platforms with posix_fadvise this queues readahead for every file up front,
+        so cold reads overlap instead of stalling each file in turn. Elsewhere it is a no-op.
+        
+        Args:
+            file_paths: Files about to be read
+        """
+        if not hasattr(os, 'posix_fadvise'):
+            return
+        
+        for file_path in file_paths:
+            try:
+                fd = os.open(file_path, os.O_RDONLY)
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                finally:
+                    os.close(fd)
+            except OSError:
+                continue
+    
     def load_contract_by_id(self, contract_id: str) -> Optional[ContractData]:
         """
         Load a specific contract by ID
@@ -75,11 +208,11 @@ class ContractLoader:
         Returns:
             ContractData object or None if not found
         """
-        contracts = self.load_all_contracts()
+        self.load_all_contracts()
         
-        for contract in contracts:
-            if contract.contract_id == contract_id:
-                return contract
+        contract = self._by_id.get(contract_id)
+        if contract is not None:
+            return contract
         
         logger.warning(f"Contract with ID {contract_id} not found")
         return None
@@ -94,58 +227,123 @@ class ContractLoader:
         Returns:
             List of applicable ContractData objects
         """
-        all_contracts = self.load_all_contracts()
-        applicable_contracts = []
-        
-        for contract in all_contracts:
-            if self._is_contract_applicable_to_airline(contract, airline_code):
-                applicable_contracts.append(contract)
+        applicable_contracts = list(self.iter_contracts_for_airline(airline_code))
         
         logger.info(f"Found {len(applicable_contracts)} contracts for airline {airline_code}")
         return applicable_contracts
     
-    def _load_contract_file(self, file_path: Path) -> Optional[ContractData]:
+    def iter_contracts_for_airline(self, airline_code: str) -> Iterator[ContractData]:
+        """
+        Iterate over contracts applicable to a specific airline
+        
+        Yields the cached ContractData instances themselves; nothing is copied or re-validated.
+        
+        Args:
+            airline_code: Airline code (e.g., "QR", "LH")
+            
+        Returns:
+            Iterator over applicable ContractData objects
+        """
+        all_contracts = self.load_all_contracts()
+        
+        applicable_contracts = self._by_airline.get(airline_code)
+        if applicable_contracts is None:
+            applicable_contracts = [
+                contract for contract in all_contracts
+                if self._is_contract_applicable_to_airline(contract, airline_code)
+            ]
+            self._by_airline[airline_code] = applicable_contracts
+        
+        return iter(applicable_contracts)
+    
+    def filter_by(self, **criteria: Any) -> List[ContractData]:
+        """
+        Filter loaded contracts by airline, active date and/or field values
+        
+        Supported criteria:
+            airline: Airline code the contract must apply to (uses the airline index)
+            active_on: Date that must fall inside the contract window
+            any other ContractData field name: value the field must equal
+        
+        Args:
+            **criteria: Filter criteria, all of which must match
+            
+        Returns:
+            List of matching ContractData objects (cached instances, not copies)
+        """
+        airline_code = criteria.pop('airline', None)
+        if airline_code is not None:
+            candidates = list(self.iter_contracts_for_airline(airline_code))
+        else:
+            candidates = self.load_all_contracts()
+        
+        predicates: List[Callable[[ContractData], bool]] = []
+        
+        active_on = criteria.pop('active_on', None)
+        if active_on is not None:
+            predicates.append(lambda contract: contract.start_date <= active_on <= contract.end_date)
+        
+        contract_fields = getattr(ContractData, 'model_fields', None) or ContractData.__fields__
+        for field_name, expected in criteria.items():
+            if field_name not in contract_fields:
+                raise ContractError(f"Unknown contract filter: {field_name}")
+            predicates.append(
+                lambda contract, field_name=field_name, expected=expected:
+                    getattr(contract, field_name) == expected
+            )
+        
+        if not predicates:
+            return list(candidates)
+        return [contract for contract in candidates if all(check(contract) for check in predicates)]
+    
+    def _load_contract_file(self, file_path: Path, now: Optional[datetime] = None) -> Optional[ContractData]:
         """
         Load a single contract file
         
         Args:
             file_path: Path to JSON file
+            now: Load timestamp used for generated IDs and dates (defaults to the current time)
             
         Returns:
             ContractData object or None if parsing fails
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = read_json(file_path)
             
-            return self._parse_contract_data(data, file_path.name)
+            return self._parse_contract_data(data, file_path.name, now=now)
             
         except Exception as e:
             logger.error(f"Error loading contract file {file_path}: {str(e)}")
             return None
     
-    def _parse_contract_data(self, data: Dict[str, Any], filename: str) -> Optional[ContractData]:
+    def _parse_contract_data(self, data: Dict[str, Any], filename: str,
+                             now: Optional[datetime] = None) -> Optional[ContractData]:
         """
         Parse contract JSON data into ContractData object
         
         Args:
             data: Parsed JSON data
             filename: Source filename
+            now: Load timestamp used for generated IDs and dates (defaults to the current time)
             
         Returns:
             ContractData object or None if parsing fails
         """
         try:
+            now = now or datetime.now()
+            today = now.date()
+            
             # Extract document header
             doc_header = data.get('Document_Header', {})
             
             # Extract MTP data (assuming single MTP for now)
-            mtp_key = next((k for k in data.keys() if k.startswith('MTP')), 'MTP1')
+            mtp_key = next((k for k in data if k.startswith('MTP')), 'MTP1')
             mtp_data = data.get(mtp_key, {})
+            tier_data = mtp_data.get('Tier', [])
             
             # Parse dates
-            start_date = self._parse_date(doc_header.get('Start Date', '2025-01-01'))
-            end_date = self._parse_date(doc_header.get('End Date', '2025-12-31'))
+            start_date = self._parse_date(doc_header.get('Start Date', '2025-01-01'), today=today)
+            end_date = self._parse_date(doc_header.get('End Date', '2025-12-31'), today=today)
             
             # Extract trigger configuration
             trigger_config = mtp_data.get('trigger', {})
@@ -158,17 +356,20 @@ class ContractLoader:
             payout_eligibility = payout_config.get('payout_eligibility_criteria', {})
             
             # Calculate payout percentage from tiers
-            payout_percentage = self._calculate_payout_percentage(mtp_data.get('Tier', []))
+            payout_percentage = self._calculate_payout_percentage(tier_data)
             
             # Extract tiers
-            tiers = self._extract_tiers(mtp_data.get('Tier', []))
+            tiers = self._extract_tiers(tier_data)
             
             # Generate IDs
-            document_id = f"DOC_{datetime.now().strftime('%Y%m%d')}_{filename.replace('.json', '')}"
+            document_id = f"DOC_{now.strftime('%Y%m%d')}_{filename.replace('.json', '')}"
             contract_id = f"MTP_{document_id}_1"
             rule_id = f"RULE_{contract_id}_001"
             
-            contract = ContractData(
+            # Every field below is already built with its model type, so validation
+            # can be skipped unless strict validation is configured
+            build_contract = ContractData if get_config().strict_validation else self._construct_contract
+            contract = build_contract(
                 document_name=doc_header.get('Name', filename),
                 document_id=document_id,
                 contract_name=mtp_data.get('MTP_name', 'Unknown Contract'),
@@ -184,8 +385,8 @@ class ContractLoader:
                 payout_percentage=payout_percentage,
                 payout_eligibility_criteria=payout_eligibility,
                 tiers=tiers,
-                creation_date=datetime.now().date(),
-                update_date=datetime.now().date(),
+                creation_date=today,
+                update_date=today,
                 iata_codes=doc_header.get('IATA', []),
                 countries=doc_header.get('Countries', [])
             )
@@ -196,26 +397,38 @@ class ContractLoader:
             logger.error(f"Error parsing contract data: {str(e)}")
             return None
     
-    def _parse_date(self, date_str: str) -> date:
+    @staticmethod
+    def _construct_contract(**fields) -> ContractData:
+        """
+        Build a ContractData without running field validation
+        
+        Args:
+            **fields: ContractData field values of the declared types
+            
+        Returns:
+            ContractData object
+        """
+        construct = getattr(ContractData, 'model_construct', None) or ContractData.construct
+        return construct(**fields)
+    
+    def _parse_date(self, date_str: str, today: Optional[date] = None) -> date:
         """
         Parse date string to date object
         
         Args:
             date_str: Date string in various formats
+            today: Fallback date when parsing fails (defaults to the current date)
             
         Returns:
             date object
         """
         if isinstance(date_str, str):
-            # Try common date formats
-            for fmt in ['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%S.%f%z']:
-                try:
-                    return datetime.strptime(date_str, fmt).date()
-                except ValueError:
-                    continue
+            parsed = _parse_date_string(date_str)
+            if parsed is not None:
+                return parsed
         
         # Default to current date if parsing fails
-        return datetime.now().date()
+        return today or datetime.now().date()
     
     def _calculate_payout_percentage(self, tiers: List[Dict[str, Any]]) -> Optional[Decimal]:
         """
@@ -230,21 +443,20 @@ class ContractLoader:
         if not tiers:
             return None
         
-        total_percentage = Decimal('0')
-        count = 0
-        
-        for tier in tiers:
-            rows = tier.get('rows', [])
-            for row in rows:
-                payout_value = row.get('payout_value', 0)
-                payout_unit = row.get('payout_unit', '')
-                
-                if payout_unit == 'PERCENT':
-                    total_percentage += Decimal(str(payout_value))
-                    count += 1
-        
-        if count > 0:
-            return total_percentage / count
+        percent_values = [
+            row.get('payout_value', 0)
+            for tier in tiers
+            for row in tier.get('rows', [])
+            if row.get('payout_unit', '') == 'PERCENT'
+        ]
+        
+        if percent_values:
+            # ints convert exactly without str(); floats keep their shortest repr
+            total_percentage = sum(
+                (Decimal(value) if type(value) is int else Decimal(str(value)) for value in percent_values),
+                Decimal('0')
+            )
+            return total_percentage / len(percent_values)
         
         return None
     
@@ -258,28 +470,24 @@ class ContractLoader:
         Returns:
             Normalized tier data
         """
-        tiers = []
-        
-        for tier in tier_data:
-            normalized_tier = {
+        # Rows are built as dict literals inside comprehensions: no per-row append or intermediate dict
+        return [
+            {
                 'table_label': tier.get('table_label', 'Total Target Revenue'),
                 'table_filter': tier.get('table_filter', {'key': 'NONE', 'value': ['NONE']}),
-                'rows': []
+                'rows': [
+                    {
+                        'metric': row.get('metric', 'Net Flown Revenue'),
+                        'target_min': row.get('target_min', 0),
+                        'target_max': row.get('target_max', 0),
+                        'payout_value': row.get('payout_value', 0),
+                        'payout_unit': row.get('payout_unit', 'PERCENT')
+                    }
+                    for row in tier.get('rows', [])
+                ]
             }
-            
-            for row in tier.get('rows', []):
-                normalized_row = {
-                    'metric': row.get('metric', 'Net Flown Revenue'),
-                    'target_min': row.get('target_min', 0),
-                    'target_max': row.get('target_max', 0),
-                    'payout_value': row.get('payout_value', 0),
-                    'payout_unit': row.get('payout_unit', 'PERCENT')
-                }
-                normalized_tier['rows'].append(normalized_row)
-            
-            tiers.append(normalized_tier)
-        
-        return tiers
+            for tier in tier_data
+        ]
     
     def _is_contract_applicable_to_airline(self, contract: ContractData, airline_code: str) -> bool:
         """
@@ -292,27 +500,37 @@ class ContractLoader:
         Returns:
             True if applicable, False otherwise
         """
-        # Check trigger eligibility criteria
-        trigger_criteria = contract.trigger_eligibility_criteria
-        in_criteria = trigger_criteria.get('IN', {})
-        
-        # Check marketing airline
-        marketing_airlines = in_criteria.get('Marketing Airline', [])
-        if marketing_airlines and airline_code not in marketing_airlines:
-            return False
-        
-        # Check operating airline
-        operating_airlines = in_criteria.get('Operating Airline', [])
-        if operating_airlines and airline_code not in operating_airlines:
-            return False
-        
-        # Check ticketing airline
-        ticketing_airlines = in_criteria.get('Ticketing Airline', [])
-        if ticketing_airlines and airline_code not in ticketing_airlines:
-            return False
+        # Marketing, operating and ticketing airline filters; an empty filter allows any airline
+        for airlines in self._get_airline_filters(contract):
+            if airlines and airline_code not in airlines:
+                return False
         
         return True
     
+    def _get_airline_filters(self, contract: ContractData) -> Tuple[FrozenSet[str], ...]:
+        """
+        Get a contract's trigger airline filters as sets, built once per contract
+        
+        Args:
+            contract: Contract data
+            
+        Returns:
+            Tuple of airline code sets for the marketing, operating and ticketing filters
+        """
+        cached = self._airline_filters.get(id(contract))
+        if cached is not None and cached[0] is contract:
+            return cached[1]
+        
+        in_criteria = contract.trigger_eligibility_criteria.get('IN', {})
+        filters = []
+        for key in _AIRLINE_FILTER_KEYS:
+            airlines = in_criteria.get(key, [])
+            filters.append(frozenset([airlines] if isinstance(airlines, str) else airlines))
+        filters = tuple(filters)
+        
+        self._airline_filters[id(contract)] = (contract, filters)
+        return filters
+    
     def get_contract_summary(self) -> Dict[str, Any]:
         """
         Get summary of all loaded contracts
@@ -322,6 +540,30 @@ class ContractLoader:
         """
         contracts = self.load_all_contracts()
         
+        if self._summary is None or self._summary_version != self._index_version:
+            self._summary = self._build_contract_summary(contracts)
+            self._summary_version = self._index_version
+        
+        # Fresh containers per call so callers cannot modify the cached summary
+        summary = self._summary
+        return {
+            'total_contracts': summary['total_contracts'],
+            'contracts_by_airline': dict(summary['contracts_by_airline']),
+            'contracts_by_document': dict(summary['contracts_by_document']),
+            'date_ranges': [dict(date_range) for date_range in summary['date_ranges']],
+            'contract_types': list(summary['contract_types'])
+        }
+    
+    def _build_contract_summary(self, contracts: List[ContractData]) -> Dict[str, Any]:
+        """
+        Build the contract summary from scratch
+        
+        Args:
+            contracts: Loaded contracts, aligned with the precomputed summary fields
+            
+        Returns:
+            Dictionary with contract summary
+        """
         summary = {
             'total_contracts': len(contracts),
             'contracts_by_airline': {},
@@ -330,9 +572,9 @@ class ContractLoader:
             'contract_types': set()
         }
         
-        for contract in contracts:
+        columns = zip(contracts, self._airline_keys, self._start_iso, self._end_iso)
+        for contract, airline, start_iso, end_iso in columns:
             # Group by airline
-            airline = contract.document_name.split('_')[0] if '_' in contract.document_name else 'Unknown'
             if airline not in summary['contracts_by_airline']:
                 summary['contracts_by_airline'][airline] = 0
             summary['contracts_by_airline'][airline] += 1
@@ -345,8 +587,8 @@ class ContractLoader:
             
             # Collect date ranges
             summary['date_ranges'].append({
-                'start': contract.start_date.isoformat(),
-                'end': contract.end_date.isoformat(),
+                'start': start_iso,
+                'end': end_iso,
                 'contract_name': contract.contract_name
             })
             
@@ -356,3 +598,12 @@ class ContractLoader:
         summary['contract_types'] = list(summary['contract_types'])
         
         return summary
+
+
+def _warm_contract_schema() -> None:
+    """Resolve the ContractData schema at import so the first contract load does not pay for it"""
+    rebuild = getattr(ContractData, 'model_rebuild', None) or ContractData.update_forward_refs
+    rebuild()
+
+
+_warm_contract_schema()
@@ -3,20 +3,168 @@ Core Rule Engine implementation
 """
 
 import json
+import multiprocessing
 import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, date, timezone
 from decimal import Decimal
+from enum import IntFlag
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Iterable
 from loguru import logger
 
-from .models import CouponData, ContractData, ContractAnalysis, ProcessingResult
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .models import CouponData, ContractData, ContractAnalysis, ContractWindow, ProcessingResult
 from .exceptions import RuleEngineError, ValidationError, ContractError
 from .contract_loader import ContractLoader
 from .rule_loader import RuleLoader
 from .eligibility_checker_v2 import EligibilityCheckerV2
 from .computation_engine import ComputationEngine
 from .addon_processor import AddonRuleProcessor
+from .config import get_config
+from .logging_utils import is_debug_enabled
+from .reasons import DATE_WINDOW_FAIL, GEO_FAIL, BOOKING_FAIL, TECHNICAL_FAIL
+
+
+# Minimum sector contracts per coupon before evaluation is spread over threads
+_PARALLEL_CONTRACT_THRESHOLD = 8
+
+# Trigger and payout reasons for a contract whose sector check failed; shared, never mutated
+_SECTOR_SKIPPED_REASONS = ("Skipped due to sector ineligibility",)
+
+# Coupons sent to a worker process per task in process_coupons_parallel
+_PARALLEL_COUPON_CHUNK_SIZE = 256
+
+# Engine inherited by forked batch workers; set only while process_coupons_parallel runs
+_WORKER_ENGINE: Optional["RuleEngine"] = None
+# Held for a whole process_coupons_parallel call so concurrent callers cannot swap _WORKER_ENGINE
+_WORKER_ENGINE_LOCK = threading.Lock()
+
+# Shared zero for analyses with no computed value (Decimal is immutable)
+_DEC_ZERO = Decimal('0')
+
+# Tier percentages shown when a contract's own tiers cannot be extracted
+_DEFAULT_TIER_PERCENTAGES = (1.0, 2.0, 3.0, 4.0)
+
+
+class ReasonFlag(IntFlag):
+    """Failed trigger criteria recorded in an eligibility reason string"""
+    DATE = 1
+    GEO = 2
+    BOOKING = 4
+    TECHNICAL = 8
+
+
+# (flag, reason fragment) pairs recognised in trigger eligibility reasons
+_REASON_MARKERS = (
+    (ReasonFlag.DATE, DATE_WINDOW_FAIL),
+    (ReasonFlag.GEO, GEO_FAIL),
+    (ReasonFlag.BOOKING, BOOKING_FAIL),
+    (ReasonFlag.TECHNICAL, TECHNICAL_FAIL),
+)
+
+
+@lru_cache(maxsize=4096)
+def _reason_flags(reason: str) -> ReasonFlag:
+    """Scan a reason string once for failed criteria; repeated reasons are served from the cache"""
+    flags = ReasonFlag(0)
+    for flag, marker in _REASON_MARKERS:
+        if marker in reason:
+            flags |= flag
+    return flags
+
+
+@lru_cache(maxsize=256)
+def _contract_keys(count: int) -> Tuple[str, ...]:
+    """Labels Contract_1..Contract_<count> for a coupon's analyses, built once per count and shared"""
+    return tuple(f'Contract_{number}' for number in range(1, count + 1))
+
+
+@lru_cache(maxsize=4096)
+def _mtp_id(contract_id: str) -> str:
+    """Derive a contract's MTP ID by dropping the last segment (e.g., "ET-NG-2025H1-PLB-01" -> "ET-NG-2025H1-PLB")"""
+    if contract_id.count('-') >= 3:
+        return contract_id.rsplit('-', 1)[0]
+    return contract_id
+
+
+def _construct_model(model_cls: Any, **fields: Any) -> Any:
+    """Build a result model from values the engine has already typed, skipping field validation"""
+    construct = getattr(model_cls, 'model_construct', None) or model_cls.construct
+    return construct(**fields)
+
+
+def _decimal_to_float(value: Any) -> Any:
+    """Safely convert a Decimal to float, leaving other values unchanged"""
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _format_date(date_value: Any) -> Optional[str]:
+    """Format a date as ISO text for JSON output"""
+    if isinstance(date_value, (date, datetime)):
+        return date_value.isoformat()
+    elif isinstance(date_value, str):
+        return date_value
+    return str(date_value) if date_value else None
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize values orjson does not handle natively"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dump_indented(value: Any, indent: bytes) -> bytes:
+    """Serialize a value with orjson's 2-space indent, nested under the given indentation"""
+    # orjson escapes newlines inside strings, so every raw newline is a line break
+    return orjson.dumps(value, default=_json_default, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n" + indent)
+
+
+def _write_json_stream(f: Any, document: Dict[str, Any], stream_key: str) -> None:
+    """
+    Write a JSON object to a binary file section by section with orjson
+    
+    The list under stream_key is written one item at a time, so at most one
+    item's serialized bytes are held in memory. The bytes are identical to
+    orjson.dumps(document, option=OPT_INDENT_2).
+    
+    Args:
+        f: Binary file object
+        document: Object to write
+        stream_key: Key whose list value is streamed item by item
+    """
+    f.write(b"{")
+    for key_index, (key, value) in enumerate(document.items()):
+        f.write((b"," if key_index else b"") + b"\n  " + orjson.dumps(key) + b": ")
+        if key == stream_key and isinstance(value, list) and value:
+            f.write(b"[")
+            for item_index, item in enumerate(value):
+                f.write((b"," if item_index else b"") + b"\n    " + _dump_indented(item, b"    "))
+            f.write(b"\n  ]")
+        else:
+            f.write(_dump_indented(value, b"  "))
+    f.write(b"\n}" if document else b"}")
+
+
+def _process_coupon_chunk(coupons: List[CouponData]) -> List[ProcessingResult]:
+    """Process a chunk of coupons in a forked worker with the engine inherited from the parent"""
+    engine = _WORKER_ENGINE
+    # Pool threads do not survive fork; let the worker create its own if needed
+    engine._contract_executor = None
+    return engine.process_coupons(coupons)
 
 
 def get_rule_engine_version() -> str:
@@ -57,6 +205,24 @@ class RuleEngine:
         
         # Cache for loaded contracts to prevent re-loading on every coupon
         self._contracts_cache = None
+        # contract_id -> cached contract, rebuilt with the cache
+        self._contract_by_id: Dict[str, ContractData] = {}
+        # Upper-cased sector airline code -> cached contracts for it, in cache order
+        self._contracts_by_airline: Dict[str, List[ContractData]] = {}
+        # Cached contracts with no airline_codes in their rule metadata
+        self._contracts_without_airlines: List[ContractData] = []
+        # (tier rates, display percentages) keyed by contract_id, with the contract they were extracted from
+        self._tier_percentages_cache: Dict[str, Tuple[ContractData, Tuple[float, ...], Tuple[float, ...]]] = {}
+        # Formula descriptions keyed by id() of contract, with the fields they were built from
+        self._formulas_cache: Dict[int, Tuple[ContractData, Tuple[Any, ...], Dict[str, Any]]] = {}
+        # Contract windows keyed by id() of contract, with the dates they were built from
+        self._windows_cache: Dict[int, Tuple[ContractData, Tuple[date, date], ContractWindow]] = {}
+        # Thread pool for parallel contract evaluation, created on first use
+        self._contract_executor: Optional[ThreadPoolExecutor] = None
+        # (path, st_mtime_ns, st_size) of the source files the cache was loaded from
+        self._contracts_sig = None
+        # Whether the rule loader raised while loading the cache
+        self._rules_load_failed = False
             
         # Use V2 eligibility checker
         self.eligibility_checker = EligibilityCheckerV2()
@@ -83,10 +249,16 @@ class RuleEngine:
         """Load and cache all contracts once for performance"""
         if self._contracts_cache is not None:
             return  # Already cached
-            
+        
+        self._contracts_sig = self._contracts_source_signature()
+        self._rules_load_failed = False
         try:
             if self.rule_loader:
-                self._contracts_cache = self.rule_loader.load_all_rules()
+                try:
+                    self._contracts_cache = self.rule_loader.load_all_rules()
+                except Exception:
+                    self._rules_load_failed = True
+                    raise
                 logger.info(f"Cached {len(self._contracts_cache)} contracts from rules")
             elif self.contract_loader:
                 self._contracts_cache = self.contract_loader.load_all_contracts()
@@ -96,6 +268,91 @@ class RuleEngine:
         except Exception as e:
             logger.error(f"Error loading contracts cache: {e}")
             self._contracts_cache = []
+        
+        self._index_contracts()
+    
+    def _index_contracts(self) -> None:
+        """Rebuild the contract_id and sector airline indexes over the contract cache"""
+        self._contract_by_id = {}
+        self._contracts_by_airline = {}
+        self._contracts_without_airlines = []
+        self._tier_percentages_cache = {}
+        self._formulas_cache = {}
+        self._windows_cache = {}
+        # Component caches hold references to the contracts they were built from
+        self.eligibility_checker.clear_caches()
+        self.computation_engine.clear_caches()
+        self.addon_processor.clear_caches()
+        
+        for contract in self._contracts_cache:
+            # First occurrence wins, matching the loaders' deduplication
+            self._contract_by_id.setdefault(contract.contract_id, contract)
+            
+            contract_airline_codes = contract.airline_codes or []
+            if not contract_airline_codes:
+                self._contracts_without_airlines.append(contract)
+                continue
+            
+            for airline_code in {str(c).strip().upper() for c in contract_airline_codes if c}:
+                self._contracts_by_airline.setdefault(airline_code, []).append(contract)
+    
+    def _contracts_source_signature(self) -> Optional[Tuple[Tuple[str, int, int], ...]]:
+        """
+        Fingerprint the JSON files the contract cache is loaded from
+        
+        Returns:
+            Sorted (path, st_mtime_ns, st_size) tuples, or None if no source directory is readable
+        """
+        if self.rule_loader:
+            source_files = self.rule_loader.rules_dir.glob("**/*.json")
+        elif self.contract_loader:
+            source_files = self.contract_loader.contracts_dir.glob("*.json")
+        else:
+            return None
+        
+        try:
+            signature = []
+            for file_path in source_files:
+                stat = file_path.stat()
+                signature.append((str(file_path), stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            return None
+        
+        signature.sort()
+        return tuple(signature)
+    
+    def _get_all_contracts(self, refresh: bool = False) -> List[ContractData]:
+        """
+        Get the cached contracts, loading them on first use
+        
+        Args:
+            refresh: Stat the source files and reload the cache if any were added, removed or modified
+            
+        Returns:
+            List of cached ContractData objects
+        """
+        if self._contracts_cache is not None and refresh:
+            if self._contracts_source_signature() != self._contracts_sig:
+                logger.info("Contract files changed on disk, reloading contract cache")
+                self._contracts_cache = None
+        
+        if self._contracts_cache is None:
+            self._load_contracts_cache()
+        
+        return self._contracts_cache
+    
+    def get_contracts_for_airline(self, airline_code: str) -> List[ContractData]:
+        """
+        Get the cached contracts whose rule metadata lists a sector airline code
+        
+        Args:
+            airline_code: Sector airline code (e.g., "QR", "ET"); case and surrounding whitespace are ignored
+            
+        Returns:
+            List of matching ContractData objects, in cache order
+        """
+        self._get_all_contracts()
+        return list(self._contracts_by_airline.get((airline_code or "").strip().upper(), []))
 
 
     def process_single_coupon(self, coupon_data: CouponData) -> ProcessingResult:
@@ -108,7 +365,135 @@ class RuleEngine:
         Returns:
             ProcessingResult with all contract analyses
         """
-        start_time = datetime.now()
+        # Use cached contracts (already loaded at initialization)
+        # This prevents re-loading contracts for every coupon which causes row duplication
+        return self._process_coupon(coupon_data, self._get_all_contracts(), is_debug_enabled())
+    
+    def process_coupons(self, coupons: Iterable[CouponData]) -> List[ProcessingResult]:
+        """
+        Process a batch of coupons against all available contracts
+        
+        The contract cache and the log level are resolved once for the whole batch
+        rather than once per coupon, and sector contracts once per distinct airline
+        code; each coupon is otherwise processed exactly as process_single_coupon would.
+        
+        Args:
+            coupons: Coupon data to process
+            
+        Returns:
+            ProcessingResult per coupon, in input order
+        """
+        all_contracts = self._get_all_contracts()
+        debug_enabled = is_debug_enabled()
+        sector_contracts_by_code: Dict[str, List[ContractData]] = {}
+        
+        results = [
+            self._process_coupon(coupon_data, all_contracts, debug_enabled, sector_contracts_by_code,
+                                 defer_addons=True)
+            for coupon_data in coupons
+        ]
+        self._apply_addon_rules(results, sector_contracts_by_code)
+        return results
+    
+    def _apply_addon_rules(self, results: List[ProcessingResult],
+                           sector_contracts_by_code: Dict[str, List[ContractData]]) -> None:
+        """
+        Apply addon rules to a processed batch, one column-wise pass per contract
+        
+        Collects the sector-eligible analyses of every contract with addon rules and
+        hands them to the addon processor together, instead of running the addon
+        rules once per coupon and contract.
+        
+        Args:
+            results: Results of _process_coupon with defer_addons set, updated in place
+            sector_contracts_by_code: Sector contracts used for the batch, keyed by cpn_airline_code
+        """
+        pending: Dict[int, Tuple[ContractData, List[CouponData], List[ContractAnalysis]]] = {}
+        for result in results:
+            sector_contracts = sector_contracts_by_code.get(result.coupon_data.cpn_airline_code, [])
+            # Contract_N analyses are in sector contract order
+            for contract, contract_analysis in zip(sector_contracts, result.contract_analyses.values()):
+                if contract_analysis.sector_eligibility and getattr(contract, 'addon_rule_cases', None):
+                    _, batch_coupons, analyses = pending.setdefault(id(contract), (contract, [], []))
+                    batch_coupons.append(result.coupon_data)
+                    analyses.append(contract_analysis)
+        
+        for contract, batch_coupons, analyses in pending.values():
+            applied = self.addon_processor.update_contract_analyses_with_addon(batch_coupons, contract, analyses)
+            if applied:
+                logger.info(f"Addon rules applied to contract {contract.contract_id} for {applied} coupons")
+    
+    def process_coupons_parallel(self, coupons: Iterable[CouponData],
+                                 workers: Optional[int] = None) -> List[ProcessingResult]:
+        """
+        Process a batch of coupons across worker processes
+        
+        Workers are forked so they inherit the loaded contract cache instead of
+        receiving a pickled copy; coupons are sent in chunks and results are
+        returned in input order. Falls back to process_coupons when fork is not
+        available or the batch is too small to split.
+        
+        Args:
+            coupons: Coupon data to process
+            workers: Number of worker processes (defaults to the max_workers setting)
+            
+        Returns:
+            ProcessingResult per coupon, in input order
+        """
+        global _WORKER_ENGINE
+        
+        coupons = list(coupons)
+        workers = min(workers or get_config().max_workers, os.cpu_count() or 1)
+        
+        if (workers <= 1 or len(coupons) <= _PARALLEL_COUPON_CHUNK_SIZE
+                or 'fork' not in multiprocessing.get_all_start_methods()):
+            return self.process_coupons(coupons)
+        
+        # Load before forking so every worker shares the parent's cache
+        self._get_all_contracts()
+        chunks = [
+            coupons[start:start + _PARALLEL_COUPON_CHUNK_SIZE]
+            for start in range(0, len(coupons), _PARALLEL_COUPON_CHUNK_SIZE)
+        ]
+        
+        results = []
+        with _WORKER_ENGINE_LOCK:
+            # Forking while pool threads hold locks can deadlock the children
+            if self._contract_executor is not None:
+                self._contract_executor.shutdown(wait=True)
+                self._contract_executor = None
+            
+            _WORKER_ENGINE = self
+            try:
+                with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                         mp_context=multiprocessing.get_context('fork')) as executor:
+                    for chunk_results in executor.map(_process_coupon_chunk, chunks):
+                        results.extend(chunk_results)
+            finally:
+                _WORKER_ENGINE = None
+        
+        return results
+    
+    def _process_coupon(self, coupon_data: CouponData, all_contracts: List[ContractData],
+                        debug_enabled: bool,
+                        sector_contracts_by_code: Optional[Dict[str, List[ContractData]]] = None,
+                        defer_addons: bool = False) -> ProcessingResult:
+        """
+        Process one coupon against already loaded contracts
+        
+        Args:
+            coupon_data: Coupon data
+            all_contracts: Cached contracts from _get_all_contracts
+            debug_enabled: Whether per-contract debug messages should be formatted
+            sector_contracts_by_code: Sector contracts already looked up in this batch, keyed by
+                cpn_airline_code; filled in as new codes are seen
+            defer_addons: Leave addon rules to the caller, which applies them for the whole batch
+            
+        Returns:
+            ProcessingResult with all contract analyses
+        """
+        # Monotonic and cheaper than subtracting datetime.now() values
+        start_ns = time.perf_counter_ns()
         logger.info(f"Processing coupon: {coupon_data.ticket_number}-{coupon_data.coupon_number}")
         
         try:
@@ -116,195 +501,63 @@ class RuleEngine:
             validated_coupon = self._validate_coupon_input(coupon_data)
             
             # Step 2: Use cached contracts (already loaded at initialization)
-            # This prevents re-loading contracts for every coupon which causes row duplication
-            if self._contracts_cache is None:
-                self._load_contracts_cache()
-            
-            all_contracts = self._contracts_cache
             if not all_contracts:
                 logger.warning("No contracts available in cache")
                 raise RuleEngineError("No contracts available")
             
-            logger.debug(f"Using {len(all_contracts)} cached contracts")
+            if debug_enabled:
+                logger.debug(f"Using {len(all_contracts)} cached contracts")
+            
+            # CRITICAL: If contract has no airline_codes defined, skip it (invalid rule)
+            # Every rule MUST have airline_codes in metadata to define which airline's sectors it applies to
+            for contract in self._contracts_without_airlines:
+                logger.warning(
+                    f"Skipping contract {contract.contract_id}: "
+                    f"No airline_codes defined in rule metadata - cannot determine sector airline eligibility"
+                )
+            
+            # STRICT OPTIMIZATION: Sector airline check - use ONLY contract.airline_codes from metadata
+            # Marketing/Ticketing/Operating Airline are for TRIGGER/PAYOUT filters, NOT sector
+            # For sector eligibility, compare ONLY cpn_airline_code (sector airline) against
+            # contract.airline_codes; the airline index yields only matching contracts, in cache order
+            airline_code = validated_coupon.cpn_airline_code
+            if sector_contracts_by_code is None:
+                sector_contracts = self.get_contracts_for_airline(airline_code)
+            else:
+                sector_contracts = sector_contracts_by_code.get(airline_code)
+                if sector_contracts is None:
+                    sector_contracts = self.get_contracts_for_airline(airline_code)
+                    sector_contracts_by_code[airline_code] = sector_contracts
             
             # Initialize output
-            result = ProcessingResult(
+            result = _construct_model(
+                ProcessingResult,
                 coupon_data=validated_coupon,
                 airline_eligibility=False
             )
             
             # Step 3: Process all contracts with 3-phase eligibility
             contract_analyses = {}
-            contract_count = 0
             eligible_count = 0
             any_sector_eligible = False
             
-            for contract in all_contracts:
-                try:
-                    # STRICT OPTIMIZATION: Sector airline check - use ONLY contract.airline_codes from metadata
-                    # Marketing/Ticketing/Operating Airline are for TRIGGER/PAYOUT filters, NOT sector
-                    contract_airline_codes = getattr(contract, 'airline_codes', []) or []
-                    
-                    # CRITICAL: If contract has no airline_codes defined, skip it (invalid rule)
-                    # Every rule MUST have airline_codes in metadata to define which airline's sectors it applies to
-                    if not contract_airline_codes:
-                        logger.warning(
-                            f"Skipping contract {contract.contract_id}: "
-                            f"No airline_codes defined in rule metadata - cannot determine sector airline eligibility"
-                        )
-                        continue
-                    
-                    # For sector eligibility, compare ONLY cpn_airline_code (sector airline) 
-                    # against contract.airline_codes from rule metadata
-                    coupon_sector_airline = (validated_coupon.cpn_airline_code or "").strip().upper()
-                    contract_airline_codes_upper = {str(c).strip().upper() for c in contract_airline_codes if c}
-                    
-                    # If coupon sector airline doesn't match contract airline codes, skip entirely
-                    if coupon_sector_airline not in contract_airline_codes_upper:
-                        logger.trace(
-                            f"Skipping contract {contract.contract_id}: "
-                            f"coupon sector airline {coupon_sector_airline} not in contract airline codes {contract_airline_codes_upper}"
-                        )
-                        continue
-
-                    contract_count += 1
-                    logger.debug(f"Processing contract {contract_count}: {contract.contract_name}")
-                    
-                    # Extract formulas and components
-                    formulas = self._extract_formulas_and_components(contract)
-                    
-                    # --- 3-PHASE ELIGIBILITY CHECK ---
-                    
-                    # Phase 1: Sector Eligibility
-                    sector_eligible, sector_reasons = self.eligibility_checker.check_sector_eligibility(
-                        validated_coupon, contract
-                    )
-                    
-                    trigger_eligible = False
-                    trigger_reasons = []
-                    payout_eligible = False
-                    payout_reasons = []
-                    
-                    # Initialize values
-                    trigger_value = Decimal('0')
-                    payout_value = Decimal('0')
-                    
-                    if sector_eligible:
-                        any_sector_eligible = True
-                        
-                        # Compute values ONLY if sector is eligible
-                        # Apply trigger formula
-                        trigger_value = self.computation_engine.compute_trigger(validated_coupon, contract)
-                        
-                        # Apply payout formula
-                        payout_value = self.computation_engine.compute_payout(validated_coupon, contract)
-                        
-                        # Phase 2: Trigger Eligibility
-                        trigger_eligible, trigger_reasons = self.eligibility_checker.check_trigger_eligibility(
-                            validated_coupon, contract, sector_eligible
-                        )
-                        
-                        # Phase 3: Payout Eligibility
-                        payout_eligible, payout_reasons = self.eligibility_checker.check_payout_eligibility(
-                            validated_coupon, contract, sector_eligible
-                        )
-                    else:
-                        # If sector failed, subsequent phases are skipped (already handled in V2 but explicit here for clarity)
-                        trigger_reasons = ["Skipped due to sector ineligibility"]
-                        payout_reasons = ["Skipped due to sector ineligibility"]
-
-                    # Update global eligible count (requires full trigger eligibility)
-                    if trigger_eligible:
-                        eligible_count += 1
-                    
-                    # Create contract analysis
-                    contract_analysis = ContractAnalysis(
-                        document_name=contract.document_name,
-                        document_id=contract.document_id,
-                        contract_name=contract.contract_name,
-                        contract_id=contract.contract_id,
-                        rule_id=contract.rule_id,
-                        # New fields for dynamic rule loading
-                        ruleset_id=getattr(contract, 'ruleset_id', contract.document_name),
-                        source_name=getattr(contract, 'source_name', contract.document_id),
-                        currency=getattr(contract, 'currency', 'USD'),  # Currency from contract
-                        contract_window_date={
-                            "start": contract.start_date,
-                            "end": contract.end_date
-                        },
-                        trigger_formula=formulas['trigger_formula'],
-                        trigger_value=trigger_value,
-                        payout_formula=formulas['payout_formula'],
-                        payout_value=payout_value,
-                        
-                        # 3-Phase Status
-                        sector_eligibility=sector_eligible,
-                        trigger_eligibility=trigger_eligible,
-                        payout_eligibility=payout_eligible,
-                        
-                        # Reasons
-                        sector_eligibility_reason="; ".join(sector_reasons) if sector_reasons else "Eligible",
-                        trigger_eligibility_reason="; ".join(trigger_reasons) if trigger_reasons else "Eligible",
-                        payout_eligibility_reason="; ".join(payout_reasons) if payout_reasons else "Eligible",
-                        
-                        rule_creation_date=contract.creation_date,
-                        rule_update_date=contract.update_date
-                    )
-                    
-                    # Process addon rules if any exist (and primary sector check passed)
-                    if sector_eligible:
-                        addon_result = self.addon_processor.process_addon_rules(
-                            validated_coupon, contract, trigger_eligible, payout_eligible, contract_analysis
-                        )
-                        
-                        # Update contract analysis with addon results
-                        if addon_result['addon_applied']:
-                            contract_analysis = self.addon_processor.update_contract_analysis_with_addon(
-                                contract_analysis, addon_result
-                            )
-                            logger.info(f"Addon rules applied to contract {contract.contract_id}")
-                    
-                    contract_analyses[f'Contract_{contract_count}'] = contract_analysis
-                    
-                except Exception as e:
-                    logger.error(f"Error processing contract {contract.contract_id}: {str(e)}")
-                    
-                    # Create a failed contract analysis
-                    failed_contract_analysis = ContractAnalysis(
-                        document_name=contract.document_name,
-                        document_id=contract.document_id,
-                        contract_name=contract.contract_name,
-                        contract_id=contract.contract_id,
-                        rule_id=contract.rule_id,
-                        ruleset_id=getattr(contract, 'ruleset_id', contract.document_name),
-                        source_name=getattr(contract, 'source_name', contract.document_id),
-                        currency=getattr(contract, 'currency', 'USD'),  # Currency from contract
-                        contract_window_date={
-                            "start": contract.start_date,
-                            "end": contract.end_date
-                        },
-                        trigger_formula="Error in processing",
-                        trigger_value=Decimal('0'),
-                        payout_formula="Error in processing",
-                        payout_value=Decimal('0'),
-                        sector_eligibility=False,
-                        trigger_eligibility=False,
-                        payout_eligibility=False,
-                        sector_eligibility_reason=f"Processing error: {str(e)}",
-                        trigger_eligibility_reason=f"Processing error: {str(e)}",
-                        payout_eligibility_reason=f"Processing error: {str(e)}",
-                        rule_creation_date=contract.creation_date,
-                        rule_update_date=contract.update_date
-                    )
-                    
-                    contract_analyses[f'Contract_{contract_count}'] = failed_contract_analysis
-                    continue
+            evaluations = self._evaluate_contracts(validated_coupon, sector_contracts, debug_enabled, defer_addons)
+            contract_count = len(evaluations)
+            for contract_key, (contract_analysis, sector_eligible, counted_eligible) in zip(
+                    _contract_keys(contract_count), evaluations):
+                if sector_eligible:
+                    any_sector_eligible = True
+                if counted_eligible:
+                    eligible_count += 1
+                contract_analyses[contract_key] = contract_analysis
             
             # [NEW] Handle case where no contracts matched the airline
             if not contract_analyses:
-                 logger.debug(f"No matching contracts found for airline {validated_coupon.cpn_airline_code}")
+                 if debug_enabled:
+                     logger.debug(f"No matching contracts found for airline {validated_coupon.cpn_airline_code}")
                  
-                 no_contract_analysis = ContractAnalysis(
+                 no_contract_analysis = _construct_model(
+                    ContractAnalysis,
                     document_name="N/A",
                     document_id="N/A",
                     contract_name="No Contract Found",
@@ -313,11 +566,11 @@ class RuleEngine:
                     ruleset_id="N/A",
                     source_name="N/A",
                     currency=None,  # No currency when no contract
-                    contract_window_date={"start": date.min, "end": date.max},
+                    contract_window_date=_construct_model(ContractWindow, start=date.min, end=date.max),
                     trigger_formula="N/A",
-                    trigger_value=Decimal('0'),
+                    trigger_value=_DEC_ZERO,
                     payout_formula="N/A",
-                    payout_value=Decimal('0'),
+                    payout_value=_DEC_ZERO,
                     
                     # 3-Phase Status - All False
                     sector_eligibility=False,
@@ -341,8 +594,7 @@ class RuleEngine:
             result.eligible_contracts = eligible_count
             
             # Calculate processing time
-            end_time = datetime.now()
-            result.processing_time_ms = int((end_time - start_time).total_seconds() * 1000)
+            result.processing_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             
             logger.info(f"Processing completed - {contract_count} contracts processed, {eligible_count} eligible")
             
@@ -352,6 +604,186 @@ class RuleEngine:
             logger.error(f"Error processing coupon: {str(e)}")
             raise RuleEngineError(f"Failed to process coupon: {str(e)}")
     
+    def _evaluate_contracts(self, validated_coupon: CouponData, sector_contracts: List[ContractData],
+                            debug_enabled: bool, defer_addons: bool = False) -> List[Tuple[ContractAnalysis, bool, bool]]:
+        """
+        Evaluate a coupon against its sector contracts, in contract order
+        
+        With parallel_processing enabled and enough contracts, contracts are
+        evaluated on a shared thread pool; otherwise they run sequentially.
+        
+        Args:
+            validated_coupon: Validated coupon data
+            sector_contracts: Contracts whose sector airline matches the coupon
+            debug_enabled: Whether per-contract debug messages should be formatted
+            defer_addons: Skip addon rules; the batch caller applies them
+            
+        Returns:
+            _evaluate_contract results, one per contract
+        """
+        jobs = [
+            (validated_coupon, contract, contract_number, debug_enabled, defer_addons)
+            for contract_number, contract in enumerate(sector_contracts, 1)
+        ]
+        
+        if len(jobs) >= _PARALLEL_CONTRACT_THRESHOLD and get_config().parallel_processing:
+            # map() yields in submission order, so Contract_N numbering is unchanged
+            return list(self._get_contract_executor().map(lambda job: self._evaluate_contract(*job), jobs))
+        
+        return [self._evaluate_contract(*job) for job in jobs]
+    
+    def _get_contract_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool used for contract evaluation, created on first use"""
+        if self._contract_executor is None:
+            self._contract_executor = ThreadPoolExecutor(
+                max_workers=min(get_config().max_workers, os.cpu_count() or 1)
+            )
+        return self._contract_executor
+    
+    def _evaluate_contract(self, validated_coupon: CouponData, contract: ContractData,
+                           contract_number: int, debug_enabled: bool,
+                           defer_addons: bool = False) -> Tuple[ContractAnalysis, bool, bool]:
+        """
+        Run the 3-phase eligibility check, computations and addon rules for one contract
+        
+        Args:
+            validated_coupon: Validated coupon data
+            contract: Contract whose sector airline matches the coupon
+            contract_number: 1-based position of the contract for this coupon
+            debug_enabled: Whether per-contract debug messages should be formatted
+            defer_addons: Skip addon rules; the batch caller applies them
+            
+        Returns:
+            Tuple of (contract analysis, sector eligible, counted as eligible)
+        """
+        sector_eligible = False
+        counted_eligible = False
+        
+        try:
+            if debug_enabled:
+                logger.debug(f"Processing contract {contract_number}: {contract.contract_name}")
+            
+            # Extract formulas and components
+            formulas = self._extract_formulas_and_components(contract)
+            
+            # --- 3-PHASE ELIGIBILITY CHECK ---
+            
+            # Phase 1: Sector Eligibility
+            sector_eligible, sector_reasons = self.eligibility_checker.check_sector_eligibility(
+                validated_coupon, contract
+            )
+            
+            trigger_eligible = False
+            trigger_reasons = []
+            payout_eligible = False
+            payout_reasons = []
+            
+            # Initialize values
+            trigger_value = _DEC_ZERO
+            payout_value = _DEC_ZERO
+            
+            if sector_eligible:
+                # Compute values ONLY if sector is eligible
+                # Apply trigger formula
+                trigger_value = self.computation_engine.compute_trigger(validated_coupon, contract)
+                
+                # Apply payout formula
+                payout_value = self.computation_engine.compute_payout(validated_coupon, contract)
+                
+                # Phase 2: Trigger Eligibility
+                trigger_eligible, trigger_reasons = self.eligibility_checker.check_trigger_eligibility(
+                    validated_coupon, contract, sector_eligible
+                )
+                
+                # Phase 3: Payout Eligibility
+                payout_eligible, payout_reasons = self.eligibility_checker.check_payout_eligibility(
+                    validated_coupon, contract, sector_eligible
+                )
+            else:
+                # If sector failed, subsequent phases are skipped (already handled in V2 but explicit here for clarity)
+                trigger_reasons = payout_reasons = _SECTOR_SKIPPED_REASONS
+
+            # Update global eligible count (requires full trigger eligibility)
+            counted_eligible = trigger_eligible
+            
+            # Create contract analysis
+            contract_analysis = _construct_model(
+                ContractAnalysis,
+                document_name=contract.document_name,
+                document_id=contract.document_id,
+                contract_name=contract.contract_name,
+                contract_id=contract.contract_id,
+                rule_id=contract.rule_id,
+                # New fields for dynamic rule loading
+                ruleset_id=contract.ruleset_id,
+                source_name=contract.source_name,
+                currency=contract.currency,  # Currency from contract
+                contract_window_date=self._get_contract_window(contract),
+                trigger_formula=formulas['trigger_formula'],
+                trigger_value=trigger_value,
+                payout_formula=formulas['payout_formula'],
+                payout_value=payout_value,
+                
+                # 3-Phase Status
+                sector_eligibility=sector_eligible,
+                trigger_eligibility=trigger_eligible,
+                payout_eligibility=payout_eligible,
+                
+                # Reasons
+                sector_eligibility_reason="; ".join(sector_reasons) if sector_reasons else "Eligible",
+                trigger_eligibility_reason="; ".join(trigger_reasons) if trigger_reasons else "Eligible",
+                payout_eligibility_reason="; ".join(payout_reasons) if payout_reasons else "Eligible",
+                
+                rule_creation_date=contract.creation_date,
+                rule_update_date=contract.update_date
+            )
+            
+            # Process addon rules if any exist (and primary sector check passed)
+            if sector_eligible and not defer_addons:
+                addon_result = self.addon_processor.process_addon_rules(
+                    validated_coupon, contract, trigger_eligible, payout_eligible, contract_analysis
+                )
+                
+                # Update contract analysis with addon results
+                if addon_result['addon_applied']:
+                    contract_analysis = self.addon_processor.update_contract_analysis_with_addon(
+                        contract_analysis, addon_result
+                    )
+                    logger.info(f"Addon rules applied to contract {contract.contract_id}")
+            
+            return contract_analysis, sector_eligible, counted_eligible
+            
+        except Exception as e:
+            logger.error(f"Error processing contract {contract.contract_id}: {str(e)}")
+            
+            # Create a failed contract analysis
+            failed_contract_analysis = _construct_model(
+                ContractAnalysis,
+                document_name=contract.document_name,
+                document_id=contract.document_id,
+                contract_name=contract.contract_name,
+                contract_id=contract.contract_id,
+                rule_id=contract.rule_id,
+                ruleset_id=contract.ruleset_id,
+                source_name=contract.source_name,
+                currency=contract.currency,  # Currency from contract
+                contract_window_date=self._get_contract_window(contract),
+                trigger_formula="Error in processing",
+                trigger_value=_DEC_ZERO,
+                payout_formula="Error in processing",
+                payout_value=_DEC_ZERO,
+                sector_eligibility=False,
+                trigger_eligibility=False,
+                payout_eligibility=False,
+                sector_eligibility_reason=f"Processing error: {str(e)}",
+                trigger_eligibility_reason=f"Processing error: {str(e)}",
+                payout_eligibility_reason=f"Processing error: {str(e)}",
+                rule_creation_date=contract.creation_date,
+                rule_update_date=contract.update_date
+            )
+            
+            return failed_contract_analysis, sector_eligible, counted_eligible
+    
     def _validate_coupon_input(self, coupon_data: CouponData) -> CouponData:
         """
         Validate coupon input data
@@ -387,6 +819,57 @@ class RuleEngine:
         """
         Extract trigger and payout formulas from contract
         
+        The result depends only on the contract, so it is built once per contract
+        and rebuilt only when one of the fields it is derived from changes.
+        
+        Args:
+            contract: Contract data
+            
+        Returns:
+            Dictionary with formulas and components
+        """
+        raw = (
+            contract.trigger_formula,
+            contract.payout_formula,
+            contract.payout_type,
+            contract.payout_percentage,
+            contract.trigger_components,
+            contract.payout_components
+        )
+        cached = self._formulas_cache.get(id(contract))
+        if cached is not None and cached[0] is contract and cached[1] == raw:
+            return cached[2]
+        
+        formulas = self._build_formulas_and_components(contract)
+        self._formulas_cache[id(contract)] = (contract, raw, formulas)
+        return formulas
+    
+    def _get_contract_window(self, contract: ContractData) -> ContractWindow:
+        """
+        Get the validity window reported for a contract
+        
+        Analyses never modify their window, so one instance is shared by every
+        analysis of the same contract.
+        
+        Args:
+            contract: Contract data
+            
+        Returns:
+            ContractWindow spanning the contract's start and end dates
+        """
+        raw = (contract.start_date, contract.end_date)
+        cached = self._windows_cache.get(id(contract))
+        if cached is not None and cached[0] is contract and cached[1] == raw:
+            return cached[2]
+        
+        window = _construct_model(ContractWindow, start=raw[0], end=raw[1])
+        self._windows_cache[id(contract)] = (contract, raw, window)
+        return window
+    
+    def _build_formulas_and_components(self, contract: ContractData) -> Dict[str, Any]:
+        """
+        Build trigger and payout formula descriptions for a contract
+        
         Args:
             contract: Contract data
             
@@ -426,22 +909,35 @@ class RuleEngine:
         Returns:
             List of tier percentages as decimals (e.g., [0.02, 0.0225, 0.03, 0.035, 0.04, 0.0425])
         """
+        return list(self._get_tier_rates(analysis)[0])
+    
+    def _get_tier_rates(self, analysis) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+        """
+        Get a contract analysis's tier rates and their display percentages
+        
+        Both are computed once per cached contract and shared, not copied.
+        
+        Args:
+            analysis: Contract analysis result
+            
+        Returns:
+            Tuple of (tier rates as decimals, the same rates as percentages); both empty if unavailable
+        """
         try:
             tier_percentages = []
             
-            # Get the original contract by loading all contracts and finding the matching one
+            # Get the original contract from the cached contracts by ID
             if hasattr(analysis, 'contract_id') and hasattr(self, 'rule_loader') and self.rule_loader:
                 contract_id = analysis.contract_id
                 
-                # Load all contracts to find the matching one
                 try:
-                    all_contracts = self.rule_loader.load_all_rules()
-                    original_contract = None
+                    self._get_all_contracts()
+                    original_contract = self._contract_by_id.get(contract_id)
                     
-                    for contract in all_contracts:
-                        if contract.contract_id == contract_id:
-                            original_contract = contract
-                            break
+                    # Tiers do not change for a cached contract; walk them once per contract
+                    cached = self._tier_percentages_cache.get(contract_id)
+                    if cached is not None and cached[0] is original_contract:
+                        return cached[1], cached[2]
                     
                     if original_contract and hasattr(original_contract, 'tiers') and original_contract.tiers:
                         for tier in original_contract.tiers:
@@ -465,15 +961,22 @@ class RuleEngine:
                                         if payout_value is not None and payout_unit == 'PERCENT':
                                             # Convert percentage to decimal (2.0% = 0.02)
                                             tier_percentages.append(float(payout_value) / 100.0)
+                    
+                    rates = tuple(tier_percentages)
+                    # Convert to percentage for display
+                    display_percentages = tuple(percentage * 100 for percentage in rates)
+                    if original_contract is not None:
+                        self._tier_percentages_cache[contract_id] = (original_contract, rates, display_percentages)
+                    return rates, display_percentages
                 
                 except Exception as e:
                     logger.warning(f"Failed to load contracts for tier percentage extraction: {str(e)}")
             
-            return tier_percentages
+            return (), ()
             
         except Exception as e:
             logger.error(f"Error extracting tier percentages: {str(e)}")
-            return []
+            return (), ()
     
     def get_contract_summary(self) -> Dict[str, Any]:
         """
@@ -482,71 +985,48 @@ class RuleEngine:
         Returns:
             Dictionary with contract summary information
         """
-        # Load all contracts (try rules first, then contracts)
-        contracts = []
-        if self.rule_loader:
-            try:
-                contracts = self.rule_loader.load_all_rules()
-            except Exception:
-                if self.contract_loader:
-                    try:
-                        contracts = self.contract_loader.load_all_contracts()
-                    except Exception:
-                        contracts = []
-        elif self.contract_loader:
+        # Cached contracts, reloaded if the files changed
+        contracts = self._get_all_contracts(refresh=True)
+        if self._rules_load_failed and self.contract_loader:
+            # Coupon processing uses no contracts then, but the summary still covers the contract files
             try:
                 contracts = self.contract_loader.load_all_contracts()
             except Exception:
                 contracts = []
         
-        summary = {
-            'total_contracts': len(contracts),
-            'contracts_by_airline': {},
-            'contracts_by_document': {}
-        }
+        # Group by document
+        contracts_by_document = Counter(contract.document_name for contract in contracts)
         
-        for contract in contracts:
-            # Group by airline (extract from contract name or criteria)
-            airline = contract.document_name.split('_')[0] if '_' in contract.document_name else 'Unknown'
-            if airline not in summary['contracts_by_airline']:
-                summary['contracts_by_airline'][airline] = 0
-            summary['contracts_by_airline'][airline] += 1
-            
-            # Group by document
-            doc_name = contract.document_name
-            if doc_name not in summary['contracts_by_document']:
-                summary['contracts_by_document'][doc_name] = 0
-            summary['contracts_by_document'][doc_name] += 1
+        # Group by airline (extract from contract name), splitting each distinct document name once
+        contracts_by_airline = Counter()
+        for doc_name, count in contracts_by_document.items():
+            airline = doc_name.split('_', 1)[0] if '_' in doc_name else 'Unknown'
+            contracts_by_airline[airline] += count
         
-        return summary
+        return {
+            'total_contracts': len(contracts),
+            'contracts_by_airline': dict(contracts_by_airline),
+            'contracts_by_document': dict(contracts_by_document)
+        }
     
-    def generate_json_output(self, processing_result: ProcessingResult, output_file: Optional[str] = None) -> Dict[str, Any]:
+    def generate_json_output(self, processing_result: ProcessingResult, output_file: Optional[str] = None,
+                             processing_timestamp: Optional[str] = None) -> Dict[str, Any]:
         """
         Generate JSON output for a processed coupon according to the specified format
         
         Args:
             processing_result: Result from process_single_coupon
             output_file: Optional file path to save JSON output
+            processing_timestamp: ISO timestamp to report; batch callers can compute one and
+                pass it for every coupon (defaults to the current UTC time)
             
         Returns:
             Dictionary containing the JSON-formatted output
         """
         try:
             coupon = processing_result.coupon_data
-            
-            # Helper function to safely convert Decimal to float
-            def decimal_to_float(value):
-                if isinstance(value, Decimal):
-                    return float(value)
-                return value
-            
-            # Helper function to format date
-            def format_date(date_value):
-                if isinstance(date_value, (date, datetime)):
-                    return date_value.isoformat()
-                elif isinstance(date_value, str):
-                    return date_value
-                return str(date_value) if date_value else None
+            decimal_to_float = _decimal_to_float
+            format_date = _format_date
             
             # Build coupon_info section
             coupon_info = {
@@ -577,7 +1057,7 @@ class RuleEngine:
             processing_summary = {
                 "total_contracts_processed": processing_result.total_contracts_processed,
                 "eligible_contracts": processing_result.eligible_contracts,
-                "processing_timestamp": datetime.now(timezone.utc).isoformat(),
+                "processing_timestamp": processing_timestamp or datetime.now(timezone.utc).isoformat(),
                 "rule_engine_version": get_rule_engine_version()
             }
             
@@ -585,37 +1065,34 @@ class RuleEngine:
             contract_results = []
             for contract_key, analysis in processing_result.contract_analyses.items():
                 # Generate payout calculations with tiers
-                payout_calculations = {}
                 base_payout = decimal_to_float(analysis.payout_value)
                 
-                # Extract actual tier percentages from contract
-                actual_tier_percentages = self._extract_actual_tier_percentages(analysis)
+                # Extract actual tier percentages from contract (cached per contract)
+                tier_rates, display_percentages = self._get_tier_rates(analysis)
                 
-                if actual_tier_percentages:
-                    # Use actual tier percentages from contract
-                    for i, percentage in enumerate(actual_tier_percentages, 1):
-                        tier_amount = base_payout * percentage if base_payout else 0.0
-                        payout_calculations[f"tier_{i}"] = {
-                            "tier_name": f"Tier {i}",
-                            "tier_percentage": percentage * 100,  # Convert to percentage for display
-                            "payout_amount": tier_amount
-                        }
-                else:
+                if not tier_rates:
                     # Fallback to default percentages if extraction fails
-                    tier_percentages = [1.0, 2.0, 3.0, 4.0]
-                    for i, percentage in enumerate(tier_percentages, 1):
-                        tier_amount = base_payout * percentage if base_payout else 0.0
-                        payout_calculations[f"tier_{i}"] = {
-                            "tier_name": f"Tier {i}",
-                            "tier_percentage": percentage,
-                            "payout_amount": tier_amount
-                        }
+                    tier_rates = display_percentages = _DEFAULT_TIER_PERCENTAGES
                 
-                # Extract MTP ID from contract ID or rule ID
-                mtp_id = analysis.contract_id
-                if '-' in mtp_id and mtp_id.count('-') >= 3:
-                    # Extract MTP ID by removing the last segment (e.g., "ET-NG-2025H1-PLB-01" -> "ET-NG-2025H1-PLB")
-                    mtp_id = '-'.join(mtp_id.split('-')[:-1])
+                # All tier amounts in one pass; a zero payout needs no multiplication
+                if base_payout:
+                    tier_amounts = [base_payout * rate for rate in tier_rates]
+                else:
+                    tier_amounts = [0.0] * len(tier_rates)
+                
+                payout_calculations = {
+                    f"tier_{i}": {
+                        "tier_name": f"Tier {i}",
+                        "tier_percentage": percentage,
+                        "payout_amount": tier_amount
+                    }
+                    for i, (percentage, tier_amount) in enumerate(zip(display_percentages, tier_amounts), 1)
+                }
+                
+                # Extract MTP ID from contract ID (derived once per distinct ID)
+                mtp_id = _mtp_id(analysis.contract_id)
+                
+                trigger_flags = _reason_flags(analysis.trigger_eligibility_reason)
                 
                 contract_result = {
                     "contract_id": analysis.contract_id,
@@ -631,10 +1108,10 @@ class RuleEngine:
                     "payout_calculations": payout_calculations,
                     "eligibility_details": {
                         "airline_eligibility": processing_result.airline_eligibility,
-                        "date_eligibility": "Date not in contract window" not in analysis.trigger_eligibility_reason,
-                        "geographic_eligibility": "Geographic criteria not met" not in analysis.trigger_eligibility_reason,
-                        "booking_eligibility": "Booking criteria not met" not in analysis.trigger_eligibility_reason,
-                        "technical_eligibility": "Technical criteria not met" not in analysis.trigger_eligibility_reason,
+                        "date_eligibility": not trigger_flags & ReasonFlag.DATE,
+                        "geographic_eligibility": not trigger_flags & ReasonFlag.GEO,
+                        "booking_eligibility": not trigger_flags & ReasonFlag.BOOKING,
+                        "technical_eligibility": not trigger_flags & ReasonFlag.TECHNICAL,
                         "payout_eligibility": analysis.payout_eligibility
                     }
                 }
@@ -653,8 +1130,14 @@ class RuleEngine:
                 output_path = Path(output_file)
                 output_path.parent.mkdir(parents=True, exist_ok=True)
                 
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(json_output, f, indent=2, ensure_ascii=False)
+                if orjson is not None:
+                    # Contract results are serialized one at a time rather than as one large buffer
+                    with open(output_path, 'wb') as f:
+                        _write_json_stream(f, json_output, "contract_results")
+                else:
+                    # json.dump already writes encoder chunks to the file as it goes
+                    with open(output_path, 'w', encoding='utf-8') as f:
+                        json.dump(json_output, f, indent=2, ensure_ascii=False, default=_json_default)
                 
                 logger.info(f"JSON output saved to: {output_path}")
             
@@ -4,11 +4,25 @@ Eligibility checking functionality for all criteria
 
 from datetime import datetime, date
 from decimal import Decimal
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, NamedTuple
 from loguru import logger
 
 from .models import CouponData, ContractData
 from .exceptions import EligibilityError
+from .reasons import AIRLINE_FAIL, DATE_FAIL, GEO_FAIL, BOOKING_FAIL, TECHNICAL_FAIL
+
+
+class EligibilityResults(NamedTuple):
+    """Eligibility outcome for one coupon against one contract"""
+    airline_eligibility: bool
+    date_eligibility: bool
+    geographic_eligibility: bool
+    booking_eligibility: bool
+    technical_eligibility: bool
+    trigger_eligibility: bool
+    payout_eligibility: bool
+    trigger_eligibility_reason: str
+    payout_eligibility_reason: str
 
 
 class EligibilityChecker:
@@ -64,7 +78,7 @@ class EligibilityChecker:
                 if not self._check_list_criteria(coupon.flight_numbers, in_criteria.get('Flight_Nos', []), out_criteria.get('Flight_Nos', []), 'Flight_Nos'):
                     return False
             
-            self.logger.debug(f"Airline eligibility passed for {coupon.cpn_airline_code}")
+            self.logger.debug("Airline eligibility passed for {}", coupon.cpn_airline_code)
             return True
             
         except Exception as e:
@@ -94,7 +108,7 @@ class EligibilityChecker:
             
             # Check if date is within contract window
             if coupon_date < contract.start_date or coupon_date > contract.end_date:
-                self.logger.debug(f"Coupon date {coupon_date} outside contract window {contract.start_date} to {contract.end_date}")
+                self.logger.debug("Coupon date {} outside contract window {} to {}", coupon_date, contract.start_date, contract.end_date)
                 return False
             
             # Check specific date criteria from contract
@@ -109,7 +123,7 @@ class EligibilityChecker:
             if travel_date_range and not self._check_date_range_criteria(coupon.cpn_flown_date, travel_date_range.get('start', ''), travel_date_range.get('end', ''), 'Travel_Date'):
                 return False
             
-            self.logger.debug(f"Date eligibility passed for {coupon_date}")
+            self.logger.debug("Date eligibility passed for {}", coupon_date)
             return True
             
         except Exception as e:
@@ -138,7 +152,7 @@ class EligibilityChecker:
                 coupon_iata_str = str(int(float(coupon.iata))) if coupon.iata else str(coupon.iata)
                 contract_iata_strs = [str(iata).strip() for iata in contract.iata_codes]
                 if coupon_iata_str not in contract_iata_strs:
-                    self.logger.debug(f"IATA code {coupon_iata_str} not in eligible list: {contract_iata_strs}")
+                    self.logger.debug("IATA code {} not in eligible list: {}", coupon_iata_str, contract_iata_strs)
                     return False
             
             # Check countries (if we had country mapping)
@@ -359,6 +373,22 @@ class EligibilityChecker:
         Returns:
             Dictionary with eligibility results for each criterion
         """
+        return self.check_all_eligibility(coupon, contract)._asdict()
+    
+    def check_all_eligibility(self, coupon: CouponData, contract: ContractData) -> EligibilityResults:
+        """
+        Check all eligibility criteria and return them as a named tuple
+        
+        Same checks as check_all_eligibility_criteria; callers can unpack the
+        fields or read them as attributes instead of looking up dictionary keys.
+        
+        Args:
+            coupon: Coupon data
+            contract: Contract data
+            
+        Returns:
+            EligibilityResults for the coupon and contract
+        """
         try:
             # Check individual eligibility components
             airline_eligible = self.check_airline_eligibility(coupon, contract)
@@ -383,19 +413,19 @@ class EligibilityChecker:
                 payout_eligible = trigger_eligible
             
             # Build results with detailed reasons
-            results = {
-                'airline_eligibility': airline_eligible,
-                'date_eligibility': date_eligible,
-                'geographic_eligibility': geo_eligible,
-                'booking_eligibility': booking_eligible,
-                'technical_eligibility': technical_eligible,
-                'trigger_eligibility': trigger_eligible,
-                'payout_eligibility': payout_eligible,
-                'trigger_eligibility_reason': self._build_eligibility_reason(airline_eligible, date_eligible, geo_eligible, booking_eligible, technical_eligible),
-                'payout_eligibility_reason': self._build_payout_eligibility_reason(payout_eligible, trigger_criteria, payout_criteria)
-            }
-            
-            self.logger.debug(f"Eligibility results: {results}")
+            results = EligibilityResults(
+                airline_eligibility=airline_eligible,
+                date_eligibility=date_eligible,
+                geographic_eligibility=geo_eligible,
+                booking_eligibility=booking_eligible,
+                technical_eligibility=technical_eligible,
+                trigger_eligibility=trigger_eligible,
+                payout_eligibility=payout_eligible,
+                trigger_eligibility_reason=self._build_eligibility_reason(airline_eligible, date_eligible, geo_eligible, booking_eligible, technical_eligible),
+                payout_eligibility_reason=self._build_payout_eligibility_reason(payout_eligible, trigger_criteria, payout_criteria)
+            )
+            
+            self.logger.debug("Eligibility results: {}", results)
             return results
             
         except Exception as e:
@@ -408,15 +438,15 @@ class EligibilityChecker:
         reasons = []
         
         if not airline_eligible:
-            reasons.append("Airline criteria not met")
+            reasons.append(AIRLINE_FAIL)
         if not date_eligible:
-            reasons.append("Date criteria not met")
+            reasons.append(DATE_FAIL)
         if not geo_eligible:
-            reasons.append("Geographic criteria not met")
+            reasons.append(GEO_FAIL)
         if not booking_eligible:
-            reasons.append("Booking criteria not met")
+            reasons.append(BOOKING_FAIL)
         if not technical_eligible:
-            reasons.append("Technical criteria not met")
+            reasons.append(TECHNICAL_FAIL)
         
         if not reasons:
             return "All criteria met"
@@ -565,10 +595,10 @@ class EligibilityChecker:
                 # OUT: ["B", "C"] means these values are NOT acceptable
                 # So if coupon_value is in out_list, it's NOT eligible
                 if coupon_value in out_list:
-                    self.logger.debug(f"{criteria_name} {coupon_value} is in excluded list: {out_list}")
+                    self.logger.debug("{} {} is in excluded list: {}", criteria_name, coupon_value, out_list)
                     return False
                 else:
-                    self.logger.debug(f"{criteria_name} {coupon_value} is not in excluded list: {out_list} - eligible")
+                    self.logger.debug("{} {} is not in excluded list: {} - eligible", criteria_name, coupon_value, out_list)
                     return True
             
             # If only IN criteria is specified (included)
@@ -576,20 +606,20 @@ class EligibilityChecker:
                 # IN: ["B", "C"] means only these values are acceptable
                 # Handle special cases first
                 if "ALL" in in_list or "SILENT" in in_list:
-                    self.logger.debug(f"{criteria_name} has ALL/SILENT in IN list - any value acceptable")
+                    self.logger.debug("{} has ALL/SILENT in IN list - any value acceptable", criteria_name)
                     return True
                 
                 # Check if coupon value is in the included list
                 if coupon_value not in in_list:
-                    self.logger.debug(f"{criteria_name} {coupon_value} not in eligible list: {in_list}")
+                    self.logger.debug("{} {} not in eligible list: {}", criteria_name, coupon_value, in_list)
                     return False
                 else:
-                    self.logger.debug(f"{criteria_name} {coupon_value} is in eligible list: {in_list} - eligible")
+                    self.logger.debug("{} {} is in eligible list: {} - eligible", criteria_name, coupon_value, in_list)
                     return True
             
             # If neither IN nor OUT criteria is specified, any value is acceptable
             if not in_list and not out_list:
-                self.logger.debug(f"{criteria_name} no criteria specified - any value acceptable")
+                self.logger.debug("{} no criteria specified - any value acceptable", criteria_name)
                 return True
             
             return True
@@ -643,10 +673,10 @@ class EligibilityChecker:
                 # OUT: {"Code_Share": true} means only FALSE values are acceptable
                 # So if coupon_value == out_value, it's NOT eligible
                 if coupon_value == out_value:
-                    self.logger.debug(f"{criteria_name} {coupon_value} matches excluded value: {out_value}")
+                    self.logger.debug("{} {} matches excluded value: {}", criteria_name, coupon_value, out_value)
                     return False
                 else:
-                    self.logger.debug(f"{criteria_name} {coupon_value} does not match excluded value: {out_value} - eligible")
+                    self.logger.debug("{} {} does not match excluded value: {} - eligible", criteria_name, coupon_value, out_value)
                     return True
             
             # If only IN criteria is specified (included)
@@ -654,15 +684,15 @@ class EligibilityChecker:
                 # IN: {"Code_Share": true} means only TRUE values are acceptable
                 # So if coupon_value != in_value, it's NOT eligible
                 if coupon_value != in_value:
-                    self.logger.debug(f"{criteria_name} {coupon_value} does not match required value: {in_value}")
+                    self.logger.debug("{} {} does not match required value: {}", criteria_name, coupon_value, in_value)
                     return False
                 else:
-                    self.logger.debug(f"{criteria_name} {coupon_value} matches required value: {in_value} - eligible")
+                    self.logger.debug("{} {} matches required value: {} - eligible", criteria_name, coupon_value, in_value)
                     return True
             
             # If neither IN nor OUT criteria is specified, any value is acceptable
             if in_value is None and out_value is None:
-                self.logger.debug(f"{criteria_name} no criteria specified - any value acceptable")
+                self.logger.debug("{} no criteria specified - any value acceptable", criteria_name)
                 return True
             
             return True
@@ -691,13 +721,13 @@ class EligibilityChecker:
             if start_date:
                 start_dt = datetime.strptime(start_date, '%Y-%m-%d').date()
                 if coupon_date < start_dt:
-                    self.logger.debug(f"{criteria_name} date {coupon_date} before start date: {start_dt}")
+                    self.logger.debug("{} date {} before start date: {}", criteria_name, coupon_date, start_dt)
                     return False
             
             if end_date:
                 end_dt = datetime.strptime(end_date, '%Y-%m-%d').date()
                 if coupon_date > end_dt:
-                    self.logger.debug(f"{criteria_name} date {coupon_date} after end date: {end_dt}")
+                    self.logger.debug("{} date {} after end date: {}", criteria_name, coupon_date, end_dt)
                     return False
             
             return True
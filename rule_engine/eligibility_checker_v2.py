@@ -15,6 +15,7 @@ from loguru import logger
 from .models import CouponData, ContractData
 from .exceptions import EligibilityError
 from .field_mapper import FieldMapper
+from .reasons import DATE_WINDOW_FAIL
 
 
 class EligibilityCheckerV2:
@@ -66,6 +67,35 @@ class EligibilityCheckerV2:
         }
         
         self.sector_criteria_groups = {'geographic', 'booking', 'airline_flight'}
+        
+        # Upper-cased sector airline codes keyed by id() of contract, with the codes they were built from
+        self._sector_airlines_cache: Dict[int, Tuple[ContractData, Tuple[Any, ...], frozenset]] = {}
+
+    def clear_caches(self) -> None:
+        """Drop values cached per contract so replaced contracts can be freed"""
+        self._sector_airlines_cache = {}
+
+    def _get_sector_airlines(self, contract: ContractData, contract_airline_codes: List[Any]) -> frozenset:
+        """
+        Get a contract's sector airline codes, stripped and upper-cased
+        
+        Built once per contract and rebuilt only when its airline_codes change.
+        
+        Args:
+            contract: Contract data
+            contract_airline_codes: The contract's airline_codes
+            
+        Returns:
+            Frozenset of normalized airline codes
+        """
+        raw = tuple(contract_airline_codes)
+        cached = self._sector_airlines_cache.get(id(contract))
+        if cached is not None and cached[0] is contract and cached[1] == raw:
+            return cached[2]
+        
+        airline_codes = frozenset(str(c).strip().upper() for c in raw if c)
+        self._sector_airlines_cache[id(contract)] = (contract, raw, airline_codes)
+        return airline_codes
 
     def check_sector_eligibility(self, coupon: CouponData, contract: ContractData) -> Tuple[bool, List[str]]:
         """
@@ -79,12 +109,12 @@ class EligibilityCheckerV2:
             # 0. SECTOR AIRLINE CODE CHECK (FIRST AND STRICTEST)
             # Use ONLY contract.airline_codes from rule metadata vs coupon.cpn_airline_code
             # Marketing/Ticketing/Operating Airline are for TRIGGER/PAYOUT filters, NOT sector eligibility
-            contract_airline_codes = getattr(contract, 'airline_codes', []) or []
+            contract_airline_codes = contract.airline_codes or []
             
             if contract_airline_codes:
                 # For sector: compare ONLY cpn_airline_code (sector airline) against contract.airline_codes
                 coupon_sector_airline = (coupon.cpn_airline_code or "").strip().upper()
-                contract_airline_codes_upper = {str(c).strip().upper() for c in contract_airline_codes if c}
+                contract_airline_codes_upper = self._get_sector_airlines(contract, contract_airline_codes)
                 
                 # If coupon sector airline doesn't match contract airline codes, sector is INELIGIBLE
                 if coupon_sector_airline not in contract_airline_codes_upper:
@@ -286,12 +316,15 @@ class EligibilityCheckerV2:
         else:  # SALES or other
             coupon_date = coupon.cpn_sales_date
         
-        if coupon_date < contract.start_date or coupon_date > contract.end_date:
-            reason = (f"Date not in contract window: {coupon_date} outside "
-                     f"{contract.start_date} to {contract.end_date}")
-            return False, reason
+        start_date = contract.start_date
+        end_date = contract.end_date
+        # One chained comparison on the common in-window path
+        if start_date <= coupon_date <= end_date:
+            return True, None
         
-        return True, None
+        reason = (f"{DATE_WINDOW_FAIL}: {coupon_date} outside "
+                 f"{start_date} to {end_date}")
+        return False, reason
 
     def _check_criterion_explicit(self, coupon: CouponData, rule_field: str, 
                                  in_values: List[Any], out_values: List[Any],
@@ -302,7 +335,7 @@ class EligibilityCheckerV2:
         if not mapping:
             # If no mapping, we can't check it. 
             # If strict fail? User says "skip_and_allow" if null/unknown usually.
-            self.logger.debug(f"No mapping for {rule_field}, skipping")
+            self.logger.debug("No mapping for {}, skipping", rule_field)
             return True, None
             
         contract_field = rule_field # Just for logging
@@ -321,12 +354,12 @@ class EligibilityCheckerV2:
         
         mapping = self.field_mapper.get_mapping(rule_field)
         if not mapping:
-            self.logger.debug(f"No mapping found for {rule_field}, skipping")
+            self.logger.debug("No mapping found for {}, skipping", rule_field)
             return True, None
             
         # [NEW] Check for ignoreCriteria flag - logic update
         if mapping.get('ignoreCriteria', False):
-            self.logger.debug(f"{rule_field} check ignored by configuration (ignoreCriteria=True)")
+            self.logger.debug("{} check ignored by configuration (ignoreCriteria=True)", rule_field)
             return True, None
             
         # [NEW] Normalize rule values (IN/OUT) to match input format (e.g. truncate IATA to 7 chars)
@@ -108,7 +108,7 @@ class FieldMapper:
         # Handle missing field
         if not collected_values:
             if mapping.get('skipIfMissing', True):
-                self.logger.debug(f"Field {rule_field} not found in coupon data, skipping")
+                self.logger.debug("Field {} not found in coupon data, skipping", rule_field)
                 return None
             return None # Or default?
 
@@ -183,7 +183,7 @@ class FieldMapper:
         try:
             return getattr(coupon, path, None)
         except Exception as e:
-            self.logger.debug(f"Error getting value from path '{path}': {e}")
+            self.logger.debug("Error getting value from path '{}': {}", path, e)
             return None
     
     def _get_composite_value(self, coupon: CouponData, mapping: Dict, override_path: Optional[List[str]] = None) -> Optional[str]:
@@ -384,10 +384,10 @@ class FieldMapper:
         """
         if value is None or value == "" or value == "UNKNOWN":
             if null_handling == "skip_and_allow":
-                self.logger.debug(f"{field_name} is null/empty - skipping (allow)")
+                self.logger.debug("{} is null/empty - skipping (allow)", field_name)
                 return True, "skipped"
             else:  # strict_fail
-                self.logger.debug(f"{field_name} is null/empty - strict fail")
+                self.logger.debug("{} is null/empty - strict fail", field_name)
                 return False, f"{field_name} is null or unknown"
         
         return None, None
@@ -5,13 +5,59 @@ Handles extraction and evaluation of formulas from rule JSON files
 
 import re
 import ast
+import operator
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, NamedTuple, Tuple
 from loguru import logger
 
 from .models import CouponData, ContractData
 
 
+# AST operators the compiled evaluator handles; anything else uses the text path
+_COMPILED_BINOPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+    ast.Mod: operator.mod
+}
+_COMPILED_UNARYOPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg
+}
+
+# Open-ended tier maximum
+_DEC_INF = Decimal('Infinity')
+
+# Opcodes of the compiled formula op stream
+OP_CONST = 0   # push arg
+OP_LOAD = 1    # push values[arg]
+OP_BINARY = 2  # pop right, replace top with arg(top, right)
+OP_UNARY = 3   # replace top with arg(top)
+
+# Where a compiled formula reads each value slot from, resolved at compile time
+SLOT_COUPON = 0    # getattr(coupon, key)
+SLOT_CONTRACT = 1  # getattr(contract, key); missing when None
+SLOT_TIER = 2      # tier percentage for the coupon, else contract payout_percentage
+SLOT_CONST = 3     # key itself
+SLOT_MISSING = 4   # amount_in_slab_on argument with no value; evaluates to 0 with a warning
+
+# Context keys filled from the contract tiers when a tier matches
+_TIER_PARAMETERS = frozenset({'slab_percent', 'tier_percent'})
+
+# Context keys with a fixed default value
+_DEFAULT_PARAMETERS = {'amount_in_slab_on': 0, 'band_percent': 0}
+
+
+class CompiledFormula(NamedTuple):
+    """Formula compiled once into a postfix op stream over placeholder values"""
+    formula: str
+    ops: List[Tuple[int, Any]]
+    # (source, key, context name) per value slot, with source one of the SLOT_* constants
+    slots: List[Tuple[int, Any, str]]
+
+
 class FormulaParser:
     """
     Parses and evaluates formulas from rule JSON files
@@ -151,6 +197,224 @@ class FormulaParser:
                 'error': str(e)
             }
     
+    def compile_formula(self, formula: str) -> Optional[CompiledFormula]:
+        """
+        Compile a formula string once for repeated evaluation
+        
+        Performs the same parameter and function-call substitution as
+        evaluate_formula, but with placeholders instead of values, and parses the
+        result a single time. Each placeholder is resolved to the coupon field,
+        contract field or constant it stands for, so evaluation reads only those.
+        
+        Args:
+            formula: Formula string to compile
+            
+        Returns:
+            CompiledFormula, or None if the formula needs the text evaluation path
+        """
+        try:
+            parsed = self.parse_formula(formula)
+            if not parsed['is_valid']:
+                return None
+            
+            # A parameter that could occur inside a placeholder name would corrupt it
+            if any(set(param) <= set('_ph0123456789') for param in parsed['parameters']):
+                return None
+            
+            expression = parsed['expression']
+            placeholders = {}
+            
+            for func_call in parsed.get('function_calls', []):
+                if func_call == 'amount_in_slab_on':
+                    func_pattern = rf'\b{func_call}\(([^)]+)\)'
+                    for match in re.findall(func_pattern, expression):
+                        placeholder = f'__ph{len(placeholders)}__'
+                        expression = expression.replace(f'{func_call}({match})', placeholder)
+                        source, key = self._resolve_slot(match) or (SLOT_MISSING, None)
+                        placeholders[placeholder] = (source, key, match)
+                else:
+                    func_pattern = rf'\b{func_call}\([^)]+\)'
+                    expression = re.sub(func_pattern, '0', expression)
+            
+            for param in parsed['parameters']:
+                if param in expression:
+                    resolved = self._resolve_slot(param)
+                    if resolved is None:
+                        # Unknown parameters are substituted with 0 and logged by the text path
+                        return None
+                    placeholder = f'__ph{len(placeholders)}__'
+                    expression = expression.replace(param, placeholder)
+                    placeholders[placeholder] = (resolved[0], resolved[1], param)
+            
+            expression = expression.replace('**', '^')
+            tree = ast.parse(expression, mode='eval').body
+            
+            slot_index = {placeholder: i for i, placeholder in enumerate(placeholders)}
+            ops = self.compile_to_ops(tree, slot_index)
+            if ops is None:
+                return None
+            
+            return CompiledFormula(formula=formula, ops=ops, slots=list(placeholders.values()))
+            
+        except Exception as e:
+            self.logger.debug("Formula '{}' not compiled, using text evaluation: {}", formula, e)
+            return None
+    
+    def _resolve_slot(self, name: str) -> Optional[Tuple[int, Any]]:
+        """
+        Resolve an evaluation context key to where its value comes from
+        
+        Args:
+            name: Context key as used in a formula
+            
+        Returns:
+            (source, key) with source one of the SLOT_* constants, or None if the
+            context never defines the name
+        """
+        if name in _DEFAULT_PARAMETERS:
+            return SLOT_CONST, _DEFAULT_PARAMETERS[name]
+        if name in _TIER_PARAMETERS:
+            return SLOT_TIER, None
+        if name in self.coupon_parameter_mapping:
+            return SLOT_COUPON, self.coupon_parameter_mapping[name]
+        if name in self.contract_parameter_mapping:
+            return SLOT_CONTRACT, self.contract_parameter_mapping[name]
+        return None
+    
+    def compile_to_ops(self, tree: ast.AST, slot_index: Dict[str, int]) -> Optional[List[Tuple[int, Any]]]:
+        """
+        Flatten a formula AST into a postfix op stream
+        
+        Args:
+            tree: Expression AST
+            slot_index: Value slot index per placeholder name
+            
+        Returns:
+            List of (opcode, arg) tuples, or None if the AST has unsupported nodes
+        """
+        ops = []
+        pending = [tree]
+        
+        # Reverse post-order: emit node, then push children so the left one is emitted last
+        while pending:
+            node = pending.pop()
+            if isinstance(node, ast.BinOp):
+                func = _COMPILED_BINOPS.get(type(node.op))
+                if func is None:
+                    return None
+                ops.append((OP_BINARY, func))
+                pending.append(node.left)
+                pending.append(node.right)
+            elif isinstance(node, ast.UnaryOp):
+                func = _COMPILED_UNARYOPS.get(type(node.op))
+                if func is None:
+                    return None
+                ops.append((OP_UNARY, func))
+                pending.append(node.operand)
+            elif isinstance(node, ast.Name):
+                if node.id not in slot_index:
+                    return None
+                ops.append((OP_LOAD, slot_index[node.id]))
+            elif isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+                ops.append((OP_CONST, node.value))
+            else:
+                return None
+        
+        ops.reverse()
+        return ops
+    
+    def evaluate_compiled(self, compiled: CompiledFormula, coupon: CouponData, contract: ContractData,
+                          additional_params: Optional[Dict[str, Any]] = None) -> Decimal:
+        """
+        Evaluate a compiled formula using coupon and contract data
+        
+        Args:
+            compiled: Formula from compile_formula
+            coupon: Coupon data
+            contract: Contract data
+            additional_params: Additional parameters for evaluation
+            
+        Returns:
+            Calculated result
+            
+        Raises:
+            KeyError/ValueError/ArithmeticError when the formula needs the text
+            evaluation path for this context (missing parameter, non-numeric value)
+        """
+        values = []
+        tier_percent = None
+        tier_resolved = False
+        
+        for source, key, name in compiled.slots:
+            if additional_params and name in additional_params:
+                value = additional_params[name]
+            elif source == SLOT_COUPON:
+                value = getattr(coupon, key)
+            elif source == SLOT_CONST:
+                value = key
+            elif source == SLOT_TIER:
+                if not tier_resolved:
+                    tier_percent = self._extract_tier_percentage(coupon, contract) if contract.tiers else None
+                    tier_resolved = True
+                value = contract.payout_percentage if tier_percent is None else tier_percent
+                if value is None:
+                    raise KeyError(name)
+            elif source == SLOT_CONTRACT:
+                value = getattr(contract, key, None)
+                if value is None:
+                    raise KeyError(name)
+            else:
+                self.logger.warning(f"Parameter '{name}' not found in context for function amount_in_slab_on")
+                value = 0
+            values.append(self._to_literal(value))
+        
+        result = float(self._run_ops(compiled.ops, values))
+        return Decimal(str(result)).quantize(Decimal('0.0001'), rounding=ROUND_HALF_UP)
+    
+    def _to_literal(self, value: Any) -> Union[int, float]:
+        """
+        Convert a context value to the number its text substitution would parse as
+        
+        Args:
+            value: Context value
+            
+        Returns:
+            int or float literal value
+        """
+        text = str(value)
+        try:
+            return int(text)
+        except ValueError:
+            return float(text)
+    
+    def _run_ops(self, ops: List[Tuple[int, Any]], values: List[Any]):
+        """
+        Execute a compiled formula op stream
+        
+        Args:
+            ops: Op stream from compile_to_ops
+            values: Value per placeholder slot
+            
+        Returns:
+            Evaluation result
+        """
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        
+        for opcode, arg in ops:
+            if opcode == OP_LOAD:
+                push(values[arg])
+            elif opcode == OP_BINARY:
+                right = pop()
+                stack[-1] = arg(stack[-1], right)
+            elif opcode == OP_CONST:
+                push(arg)
+            else:
+                stack[-1] = arg(stack[-1])
+        
+        return stack[0]
+    
     def evaluate_formula(self, formula: str, coupon: CouponData, contract: ContractData, 
                         additional_params: Optional[Dict[str, Any]] = None) -> Decimal:
         """
@@ -215,7 +479,7 @@ class FormulaParser:
             # Evaluate the expression safely
             result = self._safe_evaluate(expression)
             
-            self.logger.debug(f"Formula '{formula}' evaluated to: {result}")
+            self.logger.debug("Formula '{}' evaluated to: {}", formula, result)
             return Decimal(str(result)).quantize(Decimal('0.0001'), rounding=ROUND_HALF_UP)
             
         except Exception as e:
@@ -325,11 +589,12 @@ class FormulaParser:
                         # New format
                         target = row['target']
                         min_value = Decimal(str(target.get('min', 0)))
-                        max_value = Decimal(str(target.get('max', float('inf'))))
+                        max_raw = target.get('max')
                     else:
                         # Old format
                         min_value = Decimal(str(row.get('target_min', 0)))
-                        max_value = Decimal(str(row.get('target_max', float('inf'))))
+                        max_raw = row.get('target_max')
+                    max_value = _DEC_INF if max_raw is None else Decimal(str(max_raw))
                     
                     if min_value <= considered_revenue <= max_value:
                         # Handle both old format (payout_value/payout_unit) and new format (payout.value/payout.unit)
@@ -0,0 +1,50 @@
+"""
+JSON file helpers shared by the configuration and rule/contract loaders
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def read_json(path: Path) -> Any:
+    """
+    Read and parse a JSON file, using orjson when available
+    
+    Args:
+        path: Path to JSON file
+    
+    Returns:
+        Parsed JSON data
+    """
+    if orjson is not None:
+        raw = path.read_bytes()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN/Infinity literals that the stdlib parser accepts
+            return json.loads(raw)
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_json(path: Path, data: Any) -> None:
+    """
+    Write data as indented JSON, using orjson when available
+    
+    Args:
+        path: Path to write
+        data: JSON-serializable data
+    """
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
@@ -0,0 +1,22 @@
+"""
+Logging helpers shared by the Rule Engine components
+"""
+
+from loguru import logger
+
+
+def is_debug_enabled() -> bool:
+    """
+    Check whether any loguru sink accepts DEBUG records
+    
+    loguru has no public API for the lowest level any sink accepts, so this reads
+    its internal minimum; if that is unavailable, debug is reported as enabled so
+    messages are still built and loguru filters them itself.
+    
+    Returns:
+        True if debug messages would be emitted
+    """
+    min_level = getattr(getattr(logger, '_core', None), 'min_level', None)
+    if min_level is None:
+        return True
+    return min_level <= logger.level("DEBUG").no
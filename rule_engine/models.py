@@ -10,6 +10,71 @@ import json
 import pandas as pd
 
 
+def _parse_coupon_date(v):
+    """Parse a coupon sales/flown date; unparseable strings fall back to 2025-01-01"""
+    if isinstance(v, str):
+        # Handle various date formats including airline industry formats
+        date_formats = [
+            # ISO formats
+            '%Y-%m-%d', 
+            '%Y-%m-%dT%H:%M:%S.%fZ', 
+            '%Y-%m-%dT%H:%M:%S.%f%z', 
+            '%Y-%m-%dT%H:%M',
+            # Airline industry formats
+            '%d%b%y',  # 30MAY25
+            '%d%b',    # 28JUN (assumes current year)
+            '%d%B%y',  # 30MAY25 (full month name)
+            '%d%B',    # 28JUN (full month name, current year)
+        ]
+        
+        for fmt in date_formats:
+            try:
+                parsed_date = datetime.strptime(v, fmt).date()
+                # For formats without year (like 28JUN), assume current year
+                if fmt in ['%d%b', '%d%B']:
+                    current_year = datetime.now().year
+                    parsed_date = parsed_date.replace(year=current_year)
+                return parsed_date
+            except ValueError:
+                continue
+        
+        # If all formats fail, try to handle common variations
+        try:
+            # Handle cases like "30MAY25" with different separators or case
+            import re
+            # Extract day, month, year from patterns like "30MAY25", "28JUN"
+            match = re.match(r'(\d{1,2})([A-Za-z]{3,9})(\d{2})?', v.upper())
+            if match:
+                day = int(match.group(1))
+                month_str = match.group(2)
+                year_str = match.group(3)
+                
+                # Map month abbreviations
+                month_map = {
+                    'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
+                    'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12,
+                    'JANUARY': 1, 'FEBRUARY': 2, 'MARCH': 3, 'APRIL': 4, 'MAY': 5, 'JUNE': 6,
+                    'JULY': 7, 'AUGUST': 8, 'SEPTEMBER': 9, 'OCTOBER': 10, 'NOVEMBER': 11, 'DECEMBER': 12
+                }
+                
+                if month_str in month_map:
+                    month = month_map[month_str]
+                    if year_str:
+                        # Convert 2-digit year to 4-digit (assume 20xx for years 00-99)
+                        year = 2000 + int(year_str)
+                    else:
+                        # No year provided, use current year
+                        year = datetime.now().year
+                    
+                    return date(year, month, day)
+        except:
+            pass
+        
+        # If all parsing attempts fail, return default date
+        return date(2025, 1, 1)
+    return v
+
+
 class CouponData(BaseModel):
     """Model for coupon data input"""
     
@@ -144,67 +209,7 @@ class CouponData(BaseModel):
     
     @validator('cpn_sales_date', 'cpn_flown_date', pre=True)
     def parse_dates(cls, v):
-        if isinstance(v, str):
-            # Handle various date formats including airline industry formats
-            date_formats = [
-                # ISO formats
-                '%Y-%m-%d', 
-                '%Y-%m-%dT%H:%M:%S.%fZ', 
-                '%Y-%m-%dT%H:%M:%S.%f%z', 
-                '%Y-%m-%dT%H:%M',
-                # Airline industry formats
-                '%d%b%y',  # 30MAY25
-                '%d%b',    # 28JUN (assumes current year)
-                '%d%B%y',  # 30MAY25 (full month name)
-                '%d%B',    # 28JUN (full month name, current year)
-            ]
-            
-            for fmt in date_formats:
-                try:
-                    parsed_date = datetime.strptime(v, fmt).date()
-                    # For formats without year (like 28JUN), assume current year
-                    if fmt in ['%d%b', '%d%B']:
-                        current_year = datetime.now().year
-                        parsed_date = parsed_date.replace(year=current_year)
-                    return parsed_date
-                except ValueError:
-                    continue
-            
-            # If all formats fail, try to handle common variations
-            try:
-                # Handle cases like "30MAY25" with different separators or case
-                import re
-                # Extract day, month, year from patterns like "30MAY25", "28JUN"
-                match = re.match(r'(\d{1,2})([A-Za-z]{3,9})(\d{2})?', v.upper())
-                if match:
-                    day = int(match.group(1))
-                    month_str = match.group(2)
-                    year_str = match.group(3)
-                    
-                    # Map month abbreviations
-                    month_map = {
-                        'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
-                        'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12,
-                        'JANUARY': 1, 'FEBRUARY': 2, 'MARCH': 3, 'APRIL': 4, 'MAY': 5, 'JUNE': 6,
-                        'JULY': 7, 'AUGUST': 8, 'SEPTEMBER': 9, 'OCTOBER': 10, 'NOVEMBER': 11, 'DECEMBER': 12
-                    }
-                    
-                    if month_str in month_map:
-                        month = month_map[month_str]
-                        if year_str:
-                            # Convert 2-digit year to 4-digit (assume 20xx for years 00-99)
-                            year = 2000 + int(year_str)
-                        else:
-                            # No year provided, use current year
-                            year = datetime.now().year
-                        
-                        return date(year, month, day)
-            except:
-                pass
-            
-            # If all parsing attempts fail, return default date
-            return date(2025, 1, 1)
-        return v
+        return _parse_coupon_date(v)
     
     @validator('cpn_revenue_base', 'cpn_revenue_yq', 'cpn_revenue_yr', 
               'cpn_revenue_xt', 'cpn_total_revenue', pre=True)
@@ -328,6 +333,12 @@ class ContractData(BaseModel):
     payout_percentage: Optional[Decimal] = None
     payout_eligibility_criteria: Dict[str, Any]
     
+    # Capping configuration (disabled unless set on the contract)
+    trigger_capping: bool = False
+    trigger_capping_value: Optional[Decimal] = None
+    payout_capping: bool = False
+    payout_capping_value: Optional[Decimal] = None
+    
     # Tier information
     tiers: List[Dict[str, Any]] = Field(default_factory=list)
     
@@ -351,4 +362,8 @@ class ContractData(BaseModel):
     reset_config: Optional[Dict[str, Any]] = Field(default_factory=dict)  # Full reset configuration from rule
     mtp_period_index: Optional[int] = None  # Period number (1, 2, 3, etc.)
     period_start_date: Optional[date] = None  # Period-specific start date
-    period_end_date: Optional[date] = None  # Period-specific end date
\ No newline at end of file
+    period_end_date: Optional[date] = None  # Period-specific end date
+    
+    class Config:
+        # Loaders pass known fields only; a misspelled field fails loudly instead of being dropped
+        extra = 'forbid'
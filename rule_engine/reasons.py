@@ -0,0 +1,16 @@
+"""
+Eligibility reason fragments shared by the eligibility checkers and the engine
+
+The checkers write these into trigger eligibility reasons and the engine
+matches them to rebuild the per-criterion eligibility_details flags.
+"""
+
+# Trigger reason fragments written by EligibilityChecker
+AIRLINE_FAIL = "Airline criteria not met"
+DATE_FAIL = "Date criteria not met"
+GEO_FAIL = "Geographic criteria not met"
+BOOKING_FAIL = "Booking criteria not met"
+TECHNICAL_FAIL = "Technical criteria not met"
+
+# Prefix of the contract window failure reason written by EligibilityCheckerV2
+DATE_WINDOW_FAIL = "Date not in contract window"
@@ -2,7 +2,6 @@
 Rule loading and discovery functionality for API-based rule files
 """
 
-import json
 import os
 from datetime import datetime, date, timedelta
 from decimal import Decimal
@@ -18,6 +17,8 @@ except ImportError:
 
 from .models import ContractData
 from .exceptions import ContractError
+from .contract_loader import _parse_date_string
+from .json_utils import read_json
 
 
 class RuleLoader:
@@ -161,8 +162,7 @@ class RuleLoader:
             
             for json_file in json_files:
                 try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                    data = read_json(json_file)
                     
                     # Extract folder structure information
                     relative_path = json_file.relative_to(self.rules_dir)
@@ -212,8 +212,7 @@ class RuleLoader:
             List of ContractData objects
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = read_json(file_path)
             
             return self._parse_contract_data(data, file_path.name)
             
@@ -232,8 +231,7 @@ class RuleLoader:
             List of ContractData objects
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = read_json(file_path)
             
             return self._parse_rule_data(data, file_path.name)
             
@@ -701,12 +699,10 @@ class RuleLoader:
             date object
         """
         if isinstance(date_str, str):
-            # Try common date formats
-            for fmt in ['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%S.%f%z']:
-                try:
-                    return datetime.strptime(date_str, fmt).date()
-                except ValueError:
-                    continue
+            # ISO fast path and memoized format loop shared with ContractLoader
+            parsed = _parse_date_string(date_str)
+            if parsed is not None:
+                return parsed
         
         # Default to current date if parsing fails
         return datetime.now().date()
@@ -12,8 +12,15 @@ from datetime import datetime, date, timezone
 from decimal import Decimal
 from typing import Dict, List, Optional, Any, Union
 from dateutil import parser
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from rule_engine import RuleEngine
-from rule_engine.models import CouponData
+from rule_engine.core import _write_json_stream
+from rule_engine.models import CouponData, ProcessingResult
 from rule_engine.rule_loader import RuleLoader
 
 
@@ -78,6 +85,27 @@ def parse_date_with_default_year(date_str: str, default_year: int = 2025) -> dat
     return date(default_year, 1, 1)
 
 
+# Rows per batch passed to process_dataframe; bounds peak memory on large inputs
+CSV_CHUNK_SIZE = 50_000
+
+
+def read_csv_batches(input_file: str, chunk_size: int = CSV_CHUNK_SIZE):
+    """
+    Yield the input CSV as DataFrames of at most chunk_size rows
+    
+    Batches are read with pd.read_csv, so each one is typed exactly as
+    process_dataframe expects from a whole-file read.
+    
+    Args:
+        input_file: Path to the input CSV
+        chunk_size: Maximum rows per batch
+        
+    Yields:
+        DataFrame batches in file order
+    """
+    yield from pd.read_csv(input_file, chunksize=chunk_size)
+
+
 class PLBRuleEngine:
     """
     Integrated PLB Rule Engine for Databricks pipeline integration
@@ -102,6 +130,8 @@ class PLBRuleEngine:
         
         # Cache rules for performance - load once, use many times (Zen principle)
         self._cached_rules = None
+        # contract_id -> cached rule (first occurrence wins, as in the old linear scans)
+        self._cached_rules_by_id = {}
         self._load_rules_cache()
     
     def process_csv_file(self, input_file: str, output_file: str = None, output_format: str = "json") -> Dict[str, Any]:
@@ -139,6 +169,9 @@ class PLBRuleEngine:
         processed_coupons = []
         errors = 0
         
+        # One processing timestamp for the whole batch
+        processing_timestamp = datetime.now(timezone.utc).isoformat()
+        
         for index, row in df.iterrows():
             try:
                 # Convert row to CouponData
@@ -152,7 +185,7 @@ class PLBRuleEngine:
                 
                 if output_format.lower() == "json":
                     # Generate JSON output for this coupon
-                    json_output = self.engine.generate_json_output(result)
+                    json_output = self.engine.generate_json_output(result, processing_timestamp=processing_timestamp)
                     batch_results.append(json_output)
                     print(f"Processed coupon {index + 1}: {coupon.ticket_number}_{coupon.coupon_number}")
                 
@@ -195,8 +228,13 @@ class PLBRuleEngine:
             }
             
             # Save the comprehensive JSON file to the specified path
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(batch_json, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                # Coupons are serialized one at a time rather than as one batch-sized buffer
+                with open(output_path, 'wb') as f:
+                    _write_json_stream(f, batch_json, "coupons")
+            else:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(batch_json, f, indent=2, ensure_ascii=False)
             
             print(f"\n📊 Processing Summary:")
             print(f"   Total coupons in file: {len(df)}")
@@ -680,12 +718,7 @@ class PLBRuleEngine:
                 contract_id = analysis.contract_id
                 
                 # Find the original contract in cached rules
-                original_contract = None
-                if self._cached_rules:
-                    for contract in self._cached_rules:
-                        if contract.contract_id == contract_id:
-                            original_contract = contract
-                            break
+                original_contract = self._cached_rules_by_id.get(contract_id)
                 
                 if original_contract and hasattr(original_contract, 'tiers') and original_contract.tiers:
                     tier_index = 1
@@ -726,14 +759,12 @@ class PLBRuleEngine:
         try:
             # Get the original contract from cached rules
             if hasattr(analysis, 'contract_id') and self._cached_rules:
-                contract_id = analysis.contract_id
-                
-                for contract in self._cached_rules:
-                    if contract.contract_id == contract_id:
-                        # Extract actual formulas from the rule JSON structure
-                        trigger_formula = self._build_trigger_formula(contract)
-                        payout_formula = self._build_payout_formula(contract)
-                        return trigger_formula, payout_formula
+                contract = self._cached_rules_by_id.get(analysis.contract_id)
+                if contract is not None:
+                    # Extract actual formulas from the rule JSON structure
+                    trigger_formula = self._build_trigger_formula(contract)
+                    payout_formula = self._build_payout_formula(contract)
+                    return trigger_formula, payout_formula
             
             # Fallback to analysis formulas if contract not found
             trigger_formula = analysis.trigger_formula if analysis.trigger_formula is not None else "N/A"
@@ -873,6 +904,10 @@ class PLBRuleEngine:
         except Exception as e:
             print(f"Error caching rules: {e}")
             self._cached_rules = []
+        
+        self._cached_rules_by_id = {}
+        for rule in self._cached_rules:
+            self._cached_rules_by_id.setdefault(rule.contract_id, rule)
     
     def _is_airline_eligible_for_any_rule(self, coupon: CouponData) -> bool:
         """
@@ -922,6 +957,7 @@ class PLBRuleEngine:
         Zen: Use cached rules for optimal performance
         """
         from rule_engine.models import ProcessingResult, ContractAnalysis
+        from rule_engine.core import _construct_model
         from datetime import datetime
         
         start_time = datetime.now()
@@ -930,8 +966,9 @@ class PLBRuleEngine:
             # Use cached rules instead of loading them
             all_contracts = self._cached_rules or []
             
-            # Initialize output
-            result = ProcessingResult(
+            # Initialize output; the coupon was validated when it was built, so skip re-validation
+            result = _construct_model(
+                ProcessingResult,
                 coupon_data=coupon,
                 airline_eligibility=False
             )
@@ -1027,6 +1064,24 @@ class PLBRuleEngine:
         }
 
 
+    def _process_coupons_batch(self, coupons: List[Optional[CouponData]]) -> List[Optional[ProcessingResult]]:
+        """
+        Process converted coupons as one engine batch, aligned with the input
+        
+        Args:
+            coupons: Converted coupons, None for rows that could not be converted
+            
+        Returns:
+            ProcessingResult per coupon; all None if the batch failed, so callers
+            fall back to processing and reporting errors coupon by coupon
+        """
+        try:
+            processed = iter(self.engine.process_coupons(coupon for coupon in coupons if coupon is not None))
+        except Exception as e:
+            print(f"Batch processing failed, processing coupons individually: {e}")
+            return [None] * len(coupons)
+        return [next(processed) if coupon is not None else None for coupon in coupons]
+    
     def process_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Process a pandas DataFrame directly and return a processed DataFrame with row explosion
@@ -1058,13 +1113,27 @@ class PLBRuleEngine:
                 ist_now = utc_now + timedelta(hours=5, minutes=30)
                 return ist_now.replace(tzinfo=None).isoformat() + "+05:30"
 
-        for index, row in df.iterrows():
+        # Evaluate the rows as one engine batch so addon rules run column-wise per contract;
+        # rows that fail conversion, or a batch that fails, are processed one at a time below
+        coupons = []
+        for _, row in df.iterrows():
+            try:
+                coupons.append(self._row_to_coupon_data(row))
+            except Exception:
+                coupons.append(None)
+        batch_results = self._process_coupons_batch(coupons)
+
+        for position, (index, row) in enumerate(df.iterrows()):
             try:
                 # Convert row to CouponData
-                coupon = self._row_to_coupon_data(row)
+                coupon = coupons[position]
+                if coupon is None:
+                    coupon = self._row_to_coupon_data(row)
                 
                 # Process coupon
-                result = self.engine.process_single_coupon(coupon)
+                result = batch_results[position]
+                if result is None:
+                    result = self.engine.process_single_coupon(coupon)
                 
                 # Base row data from input
                 # Convert input row to dict to preserve all original columns
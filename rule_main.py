@@ -2,7 +2,7 @@
 import pandas as pd
 import os
 import time
-from rule_engine_integrated import PLBRuleEngine
+from rule_engine_integrated import CSV_CHUNK_SIZE, PLBRuleEngine, read_csv_batches
 
 def main():
     input_file = "csv_matched.csv"
@@ -13,14 +13,7 @@ def main():
         print(f"Error: Input file '{input_file}' not found.")
         return
 
-    print(f"Loading data from {input_file}...")
-    start_time = time.time()
-    try:
-        df = pd.read_csv(input_file)
-        print(f"Loaded {len(df)} rows.")
-    except Exception as e:
-        print(f"Error reading CSV: {e}")
-        return
+    start_time = time.perf_counter()
 
     # Initialize Rule Engine
     print("Initializing Rule Engine...")
@@ -30,27 +23,34 @@ def main():
         print(f"Error initializing engine: {e}")
         return
 
-    # Process DataFrame
-    print("Processing DataFrame...")
+    # Process the input in batches, appending each processed batch to the output
+    print(f"Processing {input_file} in batches of {CSV_CHUNK_SIZE} rows...")
+    total_input_rows = 0
+    total_output_rows = 0
+    processing_time = 0.0
+    first_chunk = True
     try:
-        processing_start = time.time()
-        result_df = engine.process_dataframe(df)
-        processing_time = time.time() - processing_start
-        print(f"Processing complete in {processing_time:.2f} seconds.")
-        print(f"Output contains {len(result_df)} rows.")
+        for chunk_number, chunk in enumerate(read_csv_batches(input_file), start=1):
+            total_input_rows += len(chunk)
+
+            processing_start = time.perf_counter()
+            result_df = engine.process_dataframe(chunk)
+            processing_time += time.perf_counter() - processing_start
+
+            result_df.to_csv(output_file, mode='w' if first_chunk else 'a', header=first_chunk, index=False)
+            first_chunk = False
+            total_output_rows += len(result_df)
+            print(f"Batch {chunk_number}: {len(chunk)} rows in, {len(result_df)} rows out.")
     except Exception as e:
         print(f"Error during processing: {e}")
         return
 
-    # Save Output
-    print(f"Saving output to {output_file}...")
-    try:
-        result_df.to_csv(output_file, index=False)
-        print("Successfully saved output CSV.")
-    except Exception as e:
-        print(f"Error saving output: {e}")
+    print(f"Loaded {total_input_rows} rows.")
+    print(f"Processing complete in {processing_time:.2f} seconds.")
+    print(f"Output contains {total_output_rows} rows.")
+    print(f"Successfully saved output CSV to {output_file}.")
 
-    total_time = time.time() - start_time
+    total_time = time.perf_counter() - start_time
     print(f"Total execution time: {total_time:.2f} seconds.")
 
 if __name__ == "__main__":
@@ -0,0 +1,157 @@
+"""
+Test that the vectorized addon path matches the per-coupon addon path
+"""
+
+from datetime import date
+from itertools import product
+
+import pandas as pd
+
+from rule_engine.addon_processor import AddonRuleProcessor, ADDON_COUPON_FIELDS
+from rule_engine.models import CouponData, ContractData
+
+
+def make_contract(addon_rule_cases):
+    """Build a minimal contract carrying the given addon rules"""
+    return ContractData(
+        document_name="Addon Test.pdf",
+        document_id="DOC_ADDON",
+        contract_name="Addon Test",
+        contract_id="QR-XX-2025-PLB-01",
+        rule_id="RULE_ADDON",
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 12, 31),
+        trigger_type="FLOWN",
+        trigger_components=["BASE"],
+        trigger_eligibility_criteria={"IN": {}, "OUT": {}},
+        payout_type="PERCENTAGE",
+        payout_components=["BASE"],
+        payout_eligibility_criteria={"IN": {}, "OUT": {}},
+        creation_date=date(2025, 1, 1),
+        update_date=date(2025, 1, 1),
+        airline_codes=["QR"],
+        addon_rule_cases=addon_rule_cases
+    )
+
+
+# Raw coupon rows in ADDON_COUPON_FIELDS order, with flown dates as they arrive from CSV
+COUPON_ROWS = [
+    ("101", "QR", "QR", "DOH", "LHR", "2025-03-15", ""),
+    ("QR101", "QR", "BA", "DOH", "CDG", "2025-04-01", ""),
+    ("202", "QR", "QR", "DOH", "LHR", "2025-02-10", "Y"),
+    ("303", "QR", "BA", "DOH", "JFK", "2025-03-20", ""),
+    ("404", "", "", "AMM", "DOH", "2025-06-30", ""),
+    ("505", "QR", "QR", "DOH", "LHR", "15MAR25", ""),
+    ("606", "QR", "BA", "DOH", "LHR", "not a date", ""),
+]
+
+
+def make_coupons():
+    """Coupons covering flight, operating airline, route, codeshare and date cases"""
+    return [
+        CouponData(cpn_airline_code="QR", **dict(zip(ADDON_COUPON_FIELDS, row)))
+        for row in COUPON_ROWS
+    ]
+
+
+ADDON_RULE_SETS = {
+    "empty mapping stops the scan": [
+        {
+            "addon_rule_id": "A1", "name": "Flight rescue",
+            "when_to_apply": "Only for coupons rejected by base filters",
+            "mappings": [{"marketing_flight": "QR101"}, {}, {"route": "DOH-LHR"}]
+        }
+    ],
+    "route, operating airline and dates": [
+        {
+            "addon_rule_id": "B1", "name": "Route rescue",
+            "when_to_apply": "Route/flight constraints",
+            "mappings": [{"route": "DOH-LHR", "effective_from": "2025-03-01", "effective_to": "2025-03-31"}]
+        },
+        {
+            "addon_rule_id": "B2", "name": "Codeshare rescue",
+            "when_to_apply": "Operating carrier differs (codeshare)",
+            "mappings": [{"operating_airline": "BA", "effective_to": "2025-03-31"},
+                         {"marketing_flight": "202", "route": "DOH-LHR"}]
+        }
+    ],
+    "unconstrained non-empty mapping matches all": [
+        {
+            "addon_rule_id": "C1", "name": "Blanket rescue",
+            "when_to_apply": "After base IN/OUT filtering",
+            "mappings": [{"effective_from": "2025-03-01"}, {"notes": "any coupon"}]
+        }
+    ],
+    "open-ended dates outside the nanosecond range": [
+        {
+            "addon_rule_id": "D1", "name": "Open-ended rescue",
+            "when_to_apply": "Route/flight constraints",
+            "mappings": [{"route": "DOH-LHR", "effective_from": "2025-03-01", "effective_to": "9999-12-31"},
+                         {"operating_airline": "BA", "effective_from": "1600-01-01", "effective_to": "2025-03-31"}]
+        }
+    ],
+}
+
+
+def scalar_results(processor, coupons, contract, trigger, payout):
+    """Run process_addon_rules coupon by coupon"""
+    results = []
+    for coupon in coupons:
+        result = processor.process_addon_rules(coupon, contract, trigger, payout)
+        names = [detail['addon_name'] for detail in result['addon_details'] if detail['applied']]
+        results.append((result['trigger_eligible'], result['payout_eligible'], result['addon_applied'], ', '.join(names)))
+    return results
+
+
+def frame_results(processor, frame, contract, trigger, payout):
+    """Run process_addon_rules_df over the whole frame"""
+    df = processor.process_addon_rules_df(frame, contract, trigger, payout)
+    return [
+        (bool(row.trigger_eligible), bool(row.payout_eligible), bool(row.addon_applied), row.addon_names)
+        for row in df.itertuples()
+    ]
+
+
+def test_frame_path_matches_scalar_path():
+    """process_addon_rules_df gives the per-coupon results of process_addon_rules"""
+    processor = AddonRuleProcessor()
+    coupons = make_coupons()
+    frame = AddonRuleProcessor.coupons_to_frame(coupons)
+
+    for label, addon_rules in ADDON_RULE_SETS.items():
+        contract = make_contract(addon_rules)
+        for trigger, payout in product((False, True), repeat=2):
+            expected = scalar_results(processor, coupons, contract, trigger, payout)
+            actual = frame_results(processor, frame, contract, trigger, payout)
+            assert actual == expected, f"{label} ({trigger}, {payout}): {actual} != {expected}"
+        print(f"   [PASS] {label}")
+
+
+def test_raw_date_strings_match_scalar_path():
+    """Flown dates left as CSV text are parsed like CouponData parses them"""
+    processor = AddonRuleProcessor()
+    coupons = make_coupons()
+    frame = pd.DataFrame(COUPON_ROWS, columns=list(ADDON_COUPON_FIELDS))
+
+    for label, addon_rules in ADDON_RULE_SETS.items():
+        contract = make_contract(addon_rules)
+        expected = scalar_results(processor, coupons, contract, False, False)
+        actual = frame_results(processor, frame, contract, False, False)
+        assert actual == expected, f"{label}: {actual} != {expected}"
+        print(f"   [PASS] {label} (raw dates)")
+
+
+def main():
+    """Run all tests"""
+    try:
+        test_frame_path_matches_scalar_path()
+        test_raw_date_strings_match_scalar_path()
+        print("ALL TESTS PASSED!")
+    except AssertionError as e:
+        print(f"[FAIL] TEST FAILED: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,153 @@
+"""
+Test that the batch coupon paths match processing coupons one at a time
+"""
+
+import gc
+import os
+import tempfile
+import weakref
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+from rule_engine.core import RuleEngine
+from rule_engine_integrated import PLBRuleEngine
+
+TEST_DIR = Path(__file__).parent / "test_csv"
+
+# Fields that record when and how long processing took, not what it produced
+TIMING_FIELDS = {'processed_at', 'processing_time_ms'}
+
+# Addon rules attached to the sample EK contracts; the sample's sector-eligible coupons
+# are all trigger eligible, so only route/flight constraint rules apply to them
+ADDON_RULES = [
+    {
+        "addon_rule_id": "R1", "name": "Flight 725 rescue",
+        "when_to_apply": "Route/flight constraints",
+        "mappings": [{"marketing_flight": "725", "effective_to": "2025-02-15"},
+                     {"route": "DEL-DXB", "effective_from": "2025-01-01", "effective_to": "9999-12-31"}]
+    },
+    {
+        "addon_rule_id": "R2", "name": "Rejected coupon rescue",
+        "when_to_apply": "Only for coupons rejected by base filters",
+        "mappings": [{"route": "DXB-DAR"}]
+    },
+]
+
+
+def load_engine_and_coupons(work_dir):
+    """Load the sample rules and the EK_TZ coupons the way rule_main does"""
+    rules_dir = Path(work_dir) / "rules"
+    with zipfile.ZipFile(TEST_DIR / "Rule-FIxed.zip") as archive:
+        archive.extractall(rules_dir)
+
+    plb_engine = PLBRuleEngine(output_dir=str(Path(work_dir) / "output"))
+    df = plb_engine._preprocess_dataframe(pd.read_csv(TEST_DIR / "EK_TZ.csv"))
+    coupons = [plb_engine._row_to_coupon_data(row) for _, row in df.iterrows()]
+
+    engine = RuleEngine(contracts_dir="", rules_dir=str(rules_dir), log_level="ERROR")
+    return engine, coupons
+
+
+def comparable(results):
+    """Strip timing fields so results of separate runs can be compared"""
+    return [result.dict(exclude=TIMING_FIELDS) for result in results]
+
+
+def test_process_coupons_matches_single():
+    """process_coupons gives the results of process_single_coupon per coupon"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        engine, coupons = load_engine_and_coupons(work_dir)
+        expected = comparable(engine.process_single_coupon(coupon) for coupon in coupons)
+
+        assert any(result['eligible_contracts'] for result in expected), "Sample has no eligible contracts"
+        assert comparable(engine.process_coupons(coupons)) == expected, "process_coupons differs"
+        print(f"   [PASS] process_coupons matches process_single_coupon on {len(coupons)} coupons")
+
+
+def test_process_coupons_addon_rules_match_single():
+    """process_coupons applies addon rules as process_single_coupon does"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        engine, coupons = load_engine_and_coupons(work_dir)
+        for contract in engine.get_contracts_for_airline("EK"):
+            contract.addon_rule_cases = ADDON_RULES
+        expected = comparable(engine.process_single_coupon(coupon) for coupon in coupons)
+
+        applied = sum(
+            "Addon rules applied" in analysis['trigger_eligibility_reason']
+            for result in expected for analysis in result['contract_analyses'].values()
+        )
+        assert applied, "Sample addon rules were not applied"
+        assert comparable(engine.process_coupons(coupons)) == expected, "process_coupons differs with addon rules"
+        print(f"   [PASS] process_coupons matches process_single_coupon with {applied} addon overrides")
+
+
+def test_process_dataframe_batch_matches_per_row():
+    """process_dataframe gives the same rows through the batch path as coupon by coupon"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        engine, _ = load_engine_and_coupons(work_dir)
+        for contract in engine.get_contracts_for_airline("EK"):
+            contract.addon_rule_cases = ADDON_RULES
+        plb_engine = PLBRuleEngine(output_dir=str(Path(work_dir) / "output"))
+        plb_engine.engine = engine
+        df = pd.read_csv(TEST_DIR / "EK_TZ.csv")
+
+        actual = plb_engine.process_dataframe(df).drop(columns=['processed_time'])
+        # A failing batch makes process_dataframe process every row on its own
+        with mock.patch.object(RuleEngine, 'process_coupons', side_effect=RuntimeError("batch disabled")):
+            expected = plb_engine.process_dataframe(df).drop(columns=['processed_time'])
+
+        assert actual.equals(expected), "process_dataframe batch output differs"
+        print(f"   [PASS] process_dataframe batch path matches per-row processing on {len(actual)} rows")
+
+
+def test_process_coupons_parallel_matches_serial():
+    """process_coupons_parallel gives the results of process_coupons in input order"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        engine, coupons = load_engine_and_coupons(work_dir)
+        expected = comparable(engine.process_coupons(coupons))
+
+        # Workers are capped at the CPU count; report two so the forked pool runs on any machine
+        with mock.patch.object(os, 'cpu_count', return_value=2):
+            actual = comparable(engine.process_coupons_parallel(coupons, workers=2))
+
+        assert actual == expected, "process_coupons_parallel differs"
+        print(f"   [PASS] process_coupons_parallel matches process_coupons on {len(coupons)} coupons")
+
+
+def test_reload_releases_old_contracts():
+    """Reloading changed rule files frees the contracts the component caches were built from"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        engine, coupons = load_engine_and_coupons(work_dir)
+        engine.process_coupons(coupons)
+        old_contracts = [weakref.ref(contract) for contract in engine._get_all_contracts()]
+
+        for rule_file in (Path(work_dir) / "rules").glob("*.json"):
+            os.utime(rule_file, ns=(1, 1))
+        engine._get_all_contracts(refresh=True)
+        gc.collect()
+
+        alive = sum(ref() is not None for ref in old_contracts)
+        assert alive == 0, f"{alive} of {len(old_contracts)} replaced contracts are still referenced"
+        print(f"   [PASS] reload released all {len(old_contracts)} replaced contracts")
+
+
+def main():
+    """Run all tests"""
+    try:
+        test_process_coupons_matches_single()
+        test_process_coupons_addon_rules_match_single()
+        test_process_dataframe_batch_matches_per_row()
+        test_process_coupons_parallel_matches_serial()
+        test_reload_releases_old_contracts()
+        print("ALL TESTS PASSED!")
+    except AssertionError as e:
+        print(f"[FAIL] TEST FAILED: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
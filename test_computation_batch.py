@@ -0,0 +1,115 @@
+"""
+Test that compute_payout_batch matches compute_payout coupon by coupon
+"""
+
+import random
+from datetime import date
+from decimal import Decimal
+
+from rule_engine.computation_engine import ComputationEngine
+from rule_engine.models import CouponData, ContractData
+
+
+def make_contract(**payout_fields):
+    """Build a minimal contract with the given payout configuration"""
+    fields = dict(
+        document_name="Payout Test.pdf",
+        document_id="DOC_PAYOUT",
+        contract_name="Payout Test",
+        contract_id="QR-XX-2025-PLB-01",
+        rule_id="RULE_PAYOUT",
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 12, 31),
+        trigger_type="FLOWN",
+        trigger_components=["BASE"],
+        trigger_eligibility_criteria={"IN": {}, "OUT": {}},
+        payout_type="PERCENTAGE",
+        payout_components=["BASE"],
+        payout_eligibility_criteria={"IN": {}, "OUT": {}},
+        creation_date=date(2025, 1, 1),
+        update_date=date(2025, 1, 1),
+        airline_codes=["QR"]
+    )
+    fields.update(payout_fields)
+    return ContractData(**fields)
+
+
+def make_coupons():
+    """Coupons with 2-place revenues, many of which put a 3.5% payout on a rounding midpoint"""
+    rng = random.Random(7)
+    coupons = [
+        CouponData(cpn_revenue_base=Decimal(base), cpn_revenue_yq=Decimal(yq), cpn_total_revenue=Decimal(total))
+        for base, yq, total in [("123.45", "10.00", "133.45"), ("0.01", "0", "0.01"), ("-123.45", "0", "-123.45"),
+                                ("1000.00", "0", "1000.00"), ("0", "0", "0")]
+    ]
+    for _ in range(500):
+        base = Decimal(rng.randint(0, 500_000)) / 100
+        yq = Decimal(rng.randint(0, 50_000)) / 100
+        coupons.append(CouponData(cpn_revenue_base=base, cpn_revenue_yq=yq, cpn_total_revenue=base + yq))
+    return coupons
+
+
+TIERS = [{"rows": [
+    {"target": {"min": 0, "max": 1000}, "payout": {"value": 1.5, "unit": "PERCENT"}},
+    {"target": {"min": 1000, "max": 3000}, "payout": {"value": 3.5, "unit": "PERCENT"}},
+    {"target": {"min": 3000, "max": None}, "payout": {"value": 25, "unit": "AMOUNT"}},
+]}]
+
+OVERLAPPING_TIERS = [{"rows": [
+    {"target_min": 0, "target_max": 2000, "payout_value": 2.5, "payout_unit": "PERCENT"},
+    {"target_min": 1500, "target_max": 4000, "payout_value": 3.75, "payout_unit": "PERCENT"},
+]}]
+
+CONTRACTS = {
+    "percentage": dict(payout_percentage=Decimal("0.035")),
+    "percentage of BASE + YQ": dict(payout_percentage=Decimal("0.035"), payout_components=["BASE", "YQ"]),
+    "percentage of total revenue": dict(payout_percentage=Decimal("0.0125"), payout_components=["NONE"]),
+    "no percentage": dict(),
+    "fixed amount": dict(payout_type="AMOUNT"),
+    "ordered tiers": dict(payout_type="TIERED", tiers=TIERS),
+    "overlapping tiers": dict(payout_type="TIERED", tiers=OVERLAPPING_TIERS),
+    "formula": dict(payout_formula="(BASE + YQ) * 0.035"),
+    "capped": dict(payout_percentage=Decimal("0.035"), payout_capping=True, payout_capping_value=Decimal("50.00005")),
+}
+
+
+def test_batch_matches_scalar():
+    """Each batch payout equals float(compute_payout) for the same coupon"""
+    engine = ComputationEngine()
+    coupons = make_coupons()
+
+    for label, payout_fields in CONTRACTS.items():
+        contract = make_contract(**payout_fields)
+        expected = [float(engine.compute_payout(coupon, contract)) for coupon in coupons]
+        actual = engine.compute_payout_batch(coupons, contract).tolist()
+        mismatches = [(i, a, e) for i, (a, e) in enumerate(zip(actual, expected)) if a != e]
+        assert not mismatches, f"{label}: {len(mismatches)} mismatches, first {mismatches[:3]}"
+        print(f"   [PASS] {label}")
+
+
+def test_capping_without_value_is_skipped():
+    """payout_capping with no cap value leaves batch payouts uncapped"""
+    engine = ComputationEngine()
+    coupons = make_coupons()
+    uncapped = make_contract(payout_percentage=Decimal("0.035"))
+    cap_without_value = make_contract(payout_percentage=Decimal("0.035"), payout_capping=True)
+
+    expected = [float(engine.compute_payout(coupon, uncapped)) for coupon in coupons]
+    assert engine.compute_payout_batch(coupons, cap_without_value).tolist() == expected, "Missing cap was applied"
+    print("   [PASS] capping without a value is skipped")
+
+
+def main():
+    """Run all tests"""
+    try:
+        test_batch_matches_scalar()
+        test_capping_without_value_is_skipped()
+        print("ALL TESTS PASSED!")
+    except AssertionError as e:
+        print(f"[FAIL] TEST FAILED: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,89 @@
+"""
+Test configuration loading
+"""
+
+import tempfile
+from dataclasses import fields
+from pathlib import Path
+
+from pydantic import create_model
+
+from rule_engine.config import ConfigManager, RuleEngineConfig
+
+# Settings as they arrive from JSON files and RULE_ENGINE_* environment variables
+VALID_SETTINGS = [
+    {},
+    {"max_workers": "8", "parallel_processing": "true", "log_level": "DEBUG"},
+    {"enable_caching": "no", "api_port": 9000, "api_debug": 1, "strict_validation": "off"},
+    {"cache_ttl": "60", "include_metadata": "Y", "contracts_dir": "rules", "unknown_setting": 5},
+    {"max_workers": 4.0, "memory_limit": " 512 ", "allow_invalid_contracts": False},
+    {"max_workers": " 8 ", "cache_ttl": "60.0", "api_port": True},
+]
+INVALID_SETTINGS = [
+    {"enable_caching": "maybe"},
+    {"enable_caching": 2},
+    {"max_workers": "many"},
+    {"max_workers": 1.5},
+    {"cache_ttl": "2.5"},
+    {"log_level": 5},
+]
+
+
+def baseline_config_model():
+    """The pydantic model RuleEngineConfig replaced, rebuilt from the same fields and defaults"""
+    return create_model(
+        'BaselineRuleEngineConfig',
+        **{config_field.name: (config_field.type, config_field.default) for config_field in fields(RuleEngineConfig)}
+    )
+
+
+def raises_value_error(build):
+    """Whether building a config raises ValueError (pydantic's ValidationError is one)"""
+    try:
+        build()
+    except ValueError:
+        return True
+    return False
+
+
+def test_from_dict_matches_model():
+    """from_dict coerces and rejects values as the pydantic config model did"""
+    baseline = baseline_config_model()
+
+    for settings in VALID_SETTINGS:
+        expected = baseline(**settings).dict()
+        actual = RuleEngineConfig.from_dict(settings).dict()
+        assert actual == expected, f"{settings}: {actual} != {expected}"
+
+    for settings in INVALID_SETTINGS:
+        assert raises_value_error(lambda: baseline(**settings)), f"Model accepted {settings}"
+        assert raises_value_error(lambda: RuleEngineConfig.from_dict(settings)), f"from_dict accepted {settings}"
+    print("   [PASS] from_dict matches the pydantic model")
+
+
+def test_config_file_with_nan_loads():
+    """A config file with NaN literals, which json.load accepts, is not replaced by defaults"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        config_file = Path(work_dir) / "rule_engine_config.json"
+        config_file.write_text('{"max_workers": 2, "log_level": "DEBUG", "sampling_ratio": NaN}')
+
+        config = ConfigManager(str(config_file)).get_config()
+        assert config.max_workers == 2, f"Expected max_workers 2, got {config.max_workers}"
+        assert config.log_level == "DEBUG", f"Expected log_level DEBUG, got {config.log_level}"
+        print("   [PASS] config file with NaN loads")
+
+
+def main():
+    """Run all tests"""
+    try:
+        test_from_dict_matches_model()
+        test_config_file_with_nan_loads()
+        print("ALL TESTS PASSED!")
+    except AssertionError as e:
+        print(f"[FAIL] TEST FAILED: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,125 @@
+"""
+Test that indexed contract queries match scanning every loaded contract
+"""
+
+import json
+import tempfile
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+from rule_engine.contract_loader import ContractLoader
+from rule_engine.core import RuleEngine
+from rule_engine.exceptions import ContractError
+from rule_engine.rule_loader import RuleLoader
+
+# (file name, start, end, trigger type, trigger IN criteria)
+CONTRACT_FILES = [
+    ("QR_H1.json", "2025-01-01", "2025-06-30", "FLOWN", {"Marketing Airline": ["QR"]}),
+    ("QR_EK_H2.json", "2025-07-01", "2025-12-31", "SALES", {"Marketing Airline": ["QR", "EK"], "Operating Airline": ["QR"]}),
+    ("EK_FY.json", "2025-04-01", "2026-03-31", "FLOWN", {"Marketing Airline": "EK"}),
+    ("ET_TKT.json", "2025-01-01", "2025-12-31", "SALES", {"Ticketing Airline": ["ET"]}),
+    ("OPEN.json", "2025-03-01", "2025-09-30", "FLOWN", {}),
+]
+
+AIRLINES = ["QR", "EK", "ET", "LH"]
+DATES = [date(2025, 1, 1), date(2025, 6, 30), date(2025, 7, 1), date(2026, 1, 15), date(2027, 1, 1)]
+
+
+def write_contracts(contracts_dir):
+    """Write the sample contracts in the contract JSON format"""
+    for file_name, start, end, trigger_type, in_criteria in CONTRACT_FILES:
+        data = {
+            "Document_Header": {"Name": file_name, "Start Date": start, "End Date": end},
+            "MTP1": {
+                "MTP_name": file_name.replace(".json", ""),
+                "trigger": {"type": trigger_type, "trigger_eligibility_criteria": {"IN": in_criteria, "OUT": {}}},
+                "payout": {"type": "PERCENTAGE", "payout_eligibility_criteria": {"IN": {}, "OUT": {}}},
+                "Tier": []
+            }
+        }
+        (Path(contracts_dir) / file_name).write_text(json.dumps(data))
+
+
+def applies_to_airline(contract, airline_code):
+    """Airline check of the original per-contract scan"""
+    in_criteria = contract.trigger_eligibility_criteria.get('IN', {})
+    for key in ('Marketing Airline', 'Operating Airline', 'Ticketing Airline'):
+        airlines = in_criteria.get(key, [])
+        if airlines and airline_code not in airlines:
+            return False
+    return True
+
+
+def names(contracts):
+    """Contract names in order, for readable comparisons"""
+    return [contract.contract_name for contract in contracts]
+
+
+def test_filter_by_matches_scan():
+    """filter_by and load_contracts_for_airline return what a scan of all contracts returns"""
+    with tempfile.TemporaryDirectory() as contracts_dir:
+        write_contracts(contracts_dir)
+        loader = ContractLoader(contracts_dir)
+        all_contracts = loader.load_all_contracts()
+        assert len(all_contracts) == len(CONTRACT_FILES), f"Loaded {len(all_contracts)} contracts"
+
+        for airline in AIRLINES:
+            expected = [contract for contract in all_contracts if applies_to_airline(contract, airline)]
+            assert names(loader.filter_by(airline=airline)) == names(expected), f"filter_by airline={airline}"
+            assert names(loader.load_contracts_for_airline(airline)) == names(expected), f"load_contracts_for_airline {airline}"
+
+            for active_on in DATES:
+                expected = [
+                    contract for contract in all_contracts
+                    if applies_to_airline(contract, airline) and contract.start_date <= active_on <= contract.end_date
+                    and contract.trigger_type == "SALES"
+                ]
+                actual = loader.filter_by(airline=airline, active_on=active_on, trigger_type="SALES")
+                assert names(actual) == names(expected), f"filter_by {airline}, {active_on}, SALES"
+
+        assert names(loader.filter_by()) == names(all_contracts), "filter_by without criteria"
+        print(f"   [PASS] filter_by matches a scan of {len(all_contracts)} contracts")
+
+
+def test_filter_by_rejects_unknown_field():
+    """An unknown filter name raises ContractError"""
+    with tempfile.TemporaryDirectory() as contracts_dir:
+        write_contracts(contracts_dir)
+        try:
+            ContractLoader(contracts_dir).filter_by(carrier="QR")
+        except ContractError:
+            print("   [PASS] unknown filter rejected")
+            return
+        raise AssertionError("Unknown filter was accepted")
+
+
+def test_rule_load_failure_falls_back_for_summary_only():
+    """When the rule loader raises, coupons see no contracts but the summary reads the contract files"""
+    with tempfile.TemporaryDirectory() as contracts_dir, tempfile.TemporaryDirectory() as rules_dir:
+        write_contracts(contracts_dir)
+        with mock.patch.object(RuleLoader, 'load_all_rules', side_effect=OSError("unreadable rules")):
+            engine = RuleEngine(contracts_dir=contracts_dir, rules_dir=rules_dir, log_level="ERROR")
+            contracts = engine._get_all_contracts()
+            summary = engine.get_contract_summary()
+
+        assert contracts == [], f"Processing used {len(contracts)} contracts"
+        assert summary['total_contracts'] == len(CONTRACT_FILES), f"Summary counted {summary['total_contracts']}"
+        print("   [PASS] rule load failure falls back for the summary only")
+
+
+def main():
+    """Run all tests"""
+    try:
+        test_filter_by_matches_scan()
+        test_filter_by_rejects_unknown_field()
+        test_rule_load_failure_falls_back_for_summary_only()
+        print("ALL TESTS PASSED!")
+    except AssertionError as e:
+        print(f"[FAIL] TEST FAILED: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
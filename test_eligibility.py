@@ -0,0 +1,87 @@
+"""
+Test that check_all_eligibility matches running each eligibility check in turn
+"""
+
+import tempfile
+
+from rule_engine.eligibility_checker import EligibilityChecker
+from test_batch_processing import load_engine_and_coupons
+
+REASONS = (
+    "Airline criteria not met",
+    "Date criteria not met",
+    "Geographic criteria not met",
+    "Booking criteria not met",
+    "Technical criteria not met",
+)
+
+
+def scalar_eligibility(checker, coupon, contract):
+    """Combine the individual checks the way check_all_eligibility_criteria originally did"""
+    checks = (
+        checker.check_airline_eligibility(coupon, contract),
+        checker.check_date_range_eligibility(coupon, contract),
+        checker.check_geographic_eligibility(coupon, contract),
+        checker.check_booking_eligibility(coupon, contract),
+        checker.check_technical_eligibility(coupon, contract),
+    )
+    trigger_eligible = all(checks)
+    payout_eligible = checker.check_payout_eligibility(coupon, contract)
+
+    identical = contract.trigger_eligibility_criteria == contract.payout_eligibility_criteria
+    if identical:
+        payout_eligible = trigger_eligible
+
+    failed = [reason for passed, reason in zip(checks, REASONS) if not passed]
+    payout_reason = "All payout criteria met" if payout_eligible else "Payout criteria not met"
+    if identical:
+        payout_reason += " (identical to trigger criteria)"
+
+    return {
+        'airline_eligibility': checks[0],
+        'date_eligibility': checks[1],
+        'geographic_eligibility': checks[2],
+        'booking_eligibility': checks[3],
+        'technical_eligibility': checks[4],
+        'trigger_eligibility': trigger_eligible,
+        'payout_eligibility': payout_eligible,
+        'trigger_eligibility_reason': "; ".join(failed) if failed else "All criteria met",
+        'payout_eligibility_reason': payout_reason
+    }
+
+
+def test_check_all_eligibility_matches_checks():
+    """check_all_eligibility and check_all_eligibility_criteria match the individual checks"""
+    checker = EligibilityChecker()
+    with tempfile.TemporaryDirectory() as work_dir:
+        engine, coupons = load_engine_and_coupons(work_dir)
+        contracts = engine._get_all_contracts()
+
+    compared = 0
+    trigger_eligible = 0
+    for contract in contracts:
+        for coupon in coupons:
+            expected = scalar_eligibility(checker, coupon, contract)
+            results = checker.check_all_eligibility(coupon, contract)
+            assert results._asdict() == expected, f"{contract.contract_id}: {results._asdict()} != {expected}"
+            assert checker.check_all_eligibility_criteria(coupon, contract) == expected, "Dictionary form differs"
+            compared += 1
+            trigger_eligible += results.trigger_eligibility
+
+    assert 0 < trigger_eligible < compared, "Sample should include eligible and ineligible pairs"
+    print(f"   [PASS] {compared} coupon/contract pairs match ({trigger_eligible} trigger eligible)")
+
+
+def main():
+    """Run all tests"""
+    try:
+        test_check_all_eligibility_matches_checks()
+        print("ALL TESTS PASSED!")
+    except AssertionError as e:
+        print(f"[FAIL] TEST FAILED: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,131 @@
+"""
+Test that compiled formulas evaluate to the same values as the text formula path
+"""
+
+import random
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from rule_engine.computation_engine import ComputationEngine
+from rule_engine.formula_parser import FormulaParser
+from rule_engine.models import CouponData, ContractData
+
+
+def make_contract(**fields):
+    """Build a minimal contract with the given payout fields"""
+    contract_fields = dict(
+        document_name="Formula Test.pdf",
+        document_id="DOC_FORMULA",
+        contract_name="Formula Test",
+        contract_id="QR-XX-2025-PLB-01",
+        rule_id="RULE_FORMULA",
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 12, 31),
+        trigger_type="FLOWN",
+        trigger_components=["BASE"],
+        trigger_eligibility_criteria={"IN": {}, "OUT": {}},
+        payout_type="PERCENTAGE",
+        payout_components=["BASE", "YQ"],
+        payout_eligibility_criteria={"IN": {}, "OUT": {}},
+        creation_date=date(2025, 1, 1),
+        update_date=date(2025, 1, 1),
+        airline_codes=["QR"]
+    )
+    contract_fields.update(fields)
+    return ContractData(**contract_fields)
+
+
+def make_coupons():
+    """Coupons with revenues below, inside and above the sample tier bands"""
+    rng = random.Random(13)
+    coupons = []
+    for _ in range(40):
+        base = Decimal(rng.randint(0, 800_000)) / 100
+        yq, yr, xt = (Decimal(rng.randint(0, 20_000)) / 100 for _ in range(3))
+        coupons.append(CouponData(
+            cpn_revenue_base=base, cpn_revenue_yq=yq, cpn_revenue_yr=yr, cpn_revenue_xt=xt,
+            cpn_total_revenue=base + yq + yr + xt
+        ))
+    return coupons
+
+
+CONTRACTS = {
+    "percentage": dict(payout_percentage=Decimal("0.035")),
+    "tiers": dict(payout_percentage=Decimal("0.02"), tiers=[{"rows": [
+        {"target": {"min": 0, "max": 2000}, "payout": {"value": 1.5, "unit": "PERCENT"}},
+        {"target": {"min": 2000, "max": None}, "payout": {"value": 3, "unit": "PERCENT"}},
+    ]}]),
+    "old-format tiers without percentage": dict(tiers=[{"rows": [
+        {"target_min": 1000, "target_max": 5000, "payout_value": 2.25, "payout_unit": "PERCENT"},
+    ]}]),
+    "capped, no percentage": dict(payout_capping=True, payout_capping_value=Decimal("150")),
+}
+
+COMPILED_FORMULAS = [
+    "payout_amount = (slab_percent) * (BASE + YQ)",
+    "BASE * 0.035",
+    "(BASE + YQ + YR) * tier_percent - XT / 4",
+    "amount_in_slab_on(BASE) * slab_percent",
+    "amount_in_slab_on(FARE) + TOTAL",
+    "-BASE * 3 % 7 + band_percent",
+    "cap_value - BASE",
+    "YQ + blp_value",
+    "max(BASE, YQ) * slab_percent",
+]
+
+TEXT_ONLY_FORMULAS = [
+    "BASE * commission_rate",
+]
+
+
+def test_compiled_matches_text_path():
+    """_eval_cached, which prefers the compiled path, matches evaluate_formula"""
+    parser = FormulaParser()
+    engine = ComputationEngine()
+    coupons = make_coupons()
+
+    for formula in COMPILED_FORMULAS:
+        assert parser.compile_formula(formula) is not None, f"'{formula}' did not compile"
+    for formula in TEXT_ONLY_FORMULAS:
+        assert parser.compile_formula(formula) is None, f"'{formula}' should use the text path"
+
+    for label, fields in CONTRACTS.items():
+        contract = make_contract(**fields)
+        for formula in COMPILED_FORMULAS + TEXT_ONLY_FORMULAS:
+            for coupon in coupons:
+                expected = parser.evaluate_formula(formula, coupon, contract)
+                actual = engine._eval_cached(formula, coupon, contract)
+                assert actual == expected, f"{label}, '{formula}': {actual} != {expected}"
+        print(f"   [PASS] {label}")
+
+
+def test_compiled_reads_only_its_slots():
+    """evaluate_compiled does not build the full evaluation context"""
+    parser = FormulaParser()
+    coupons = make_coupons()
+    contract = make_contract(**CONTRACTS["tiers"])
+    compiled = parser.compile_formula("payout_amount = (slab_percent) * (BASE + YQ)")
+
+    with mock.patch.object(FormulaParser, '_create_evaluation_context', side_effect=AssertionError("context built")):
+        results = [parser.evaluate_compiled(compiled, coupon, contract) for coupon in coupons]
+
+    expected = [parser.evaluate_formula(compiled.formula, coupon, contract) for coupon in coupons]
+    assert results == expected, "Compiled results differ from the text path"
+    print("   [PASS] compiled evaluation reads only its slots")
+
+
+def main():
+    """Run all tests"""
+    try:
+        test_compiled_matches_text_path()
+        test_compiled_reads_only_its_slots()
+        print("ALL TESTS PASSED!")
+    except AssertionError as e:
+        print(f"[FAIL] TEST FAILED: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())